@@ -0,0 +1,147 @@
+"""
+Seeded synthetic generator of transaction histories for the benchmarks.
+
+The same configuration and seed always produce the same transactions. Every column
+is drawn with NumPy and assembled directly into a `TransactionBatch`, so millions of
+rows are generated in seconds.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from numpy.typing import NDArray
+
+from financialchecker.transactions._transactions import TransactionType
+from financialchecker.transactions.batch import (
+    STRING_COLUMNS,
+    StringColumn,
+    TransactionBatch,
+)
+
+PAYMENT_METHODS: tuple[str, ...] = ("Card", "Cash", "Transfer", "Direct Debit")
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """
+    Data class representing the shape of a synthetic transaction history.
+
+    Attributes:
+        rows (int): Total number of transactions.
+        seed (int): Seed of the random generator.
+        start_date (date): Date of the first day of the history.
+        days (int): Number of days covered by the history.
+        income_share (float): Share of the transactions that are income.
+        categories (int): Number of expense categories.
+        income_categories (int): Number of income categories.
+        firms (int): Number of distinct firms expenses are made at.
+        locations (int): Number of distinct expense locations.
+        advance_payment_share (float): Share of expenses paid in advance.
+    """
+
+    rows: int = 100_000
+    seed: int = 0
+    start_date: date = date(2020, 1, 1)
+    days: int = 4 * 365
+    income_share: float = 0.03
+    categories: int = 20
+    income_categories: int = 4
+    firms: int = 500
+    locations: int = 50
+    advance_payment_share: float = 0.02
+
+
+def generate_batch(config: GeneratorConfig) -> TransactionBatch:
+    """
+    Generate a transaction history.
+
+    Parameters:
+        config (GeneratorConfig): The shape of the history.
+
+    Returns:
+        TransactionBatch: The transactions, sorted by date.
+
+    Note:
+        Expense categories, firms and locations follow Zipf-like popularity, and
+        each category has its own log-normal amount distribution. Income falls on
+        the first day of a month, the first income category (the salary) being the
+        most frequent and largest.
+    """
+
+    generator: np.random.Generator = np.random.default_rng(config.seed)
+    incomes: int = int(round(config.rows * config.income_share))
+    expenses: int = config.rows - incomes
+
+    # Expenses: popularity-weighted categories with per-category amount scales.
+    expense_categories: NDArray = _zipf_choice(generator, config.categories, expenses)
+    category_scales: NDArray = generator.normal(3.0, 0.8, config.categories)
+    expense_amounts: NDArray = np.exp(category_scales[expense_categories]
+                                      + generator.normal(0.0, 0.6, expenses))
+    expense_days: NDArray = generator.integers(0, config.days, expenses)
+
+    # Income: monthly payments on the first of the month.
+    months: int = max(config.days // 30, 1)
+    month_starts: NDArray = (
+        np.datetime64(config.start_date, "M") + np.arange(months)
+    ).astype("datetime64[D]")
+    income_categories: NDArray = _zipf_choice(generator, config.income_categories, incomes, exponent=2.0) # noqa E507
+    income_amounts: NDArray = np.exp(np.where(income_categories == 0, 7.8, 5.5)
+                                     + generator.normal(0.0, 0.3, incomes))
+    income_dates: NDArray = month_starts[generator.integers(0, months, incomes)]
+
+    dates: NDArray = np.concatenate([
+        np.datetime64(config.start_date, "D") + expense_days,
+        income_dates,
+    ])
+    order: NDArray = np.argsort(dates, kind="stable")
+    is_income: NDArray = np.arange(config.rows) >= expenses
+
+    codes: dict[str, NDArray] = {
+        "type": is_income.astype(np.int32),
+        "transaction_method": _zipf_choice(generator, len(PAYMENT_METHODS), config.rows), # noqa E507
+        "description": np.zeros(config.rows, dtype=np.int64),
+        # Income categories are numbered after the expense ones.
+        "category": np.concatenate([expense_categories,
+                                    config.categories + income_categories]),
+        # Code 0 is the empty firm/location of income.
+        "firm": np.concatenate([1 + _zipf_choice(generator, config.firms, expenses),
+                                np.zeros(incomes, dtype=np.int64)]),
+        "location": np.concatenate([1 + _zipf_choice(generator, config.locations, expenses), # noqa E507
+                                    np.zeros(incomes, dtype=np.int64)]),
+    }
+    values: dict[str, list[str]] = {
+        "type": [TransactionType.EXPENSE, TransactionType.INCOME],
+        "transaction_method": list(PAYMENT_METHODS),
+        "description": [""],
+        "category": [f"Category {index:02d}" for index in range(config.categories)]
+        + [f"Income {index:02d}" for index in range(config.income_categories)],
+        "firm": [""] + [f"Firm {index:05d}" for index in range(config.firms)],
+        "location": [""] + [f"Location {index:03d}" for index in range(config.locations)], # noqa E507
+    }
+    assert set(codes) == set(STRING_COLUMNS)
+
+    advance_payments: NDArray = np.concatenate([
+        generator.random(expenses) < config.advance_payment_share,
+        np.zeros(incomes, dtype=np.bool_),
+    ])
+
+    return TransactionBatch(
+        amounts=np.round(np.concatenate([expense_amounts, income_amounts]), 2).clip(0.01)[order], # noqa E507
+        dates=dates[order],
+        advance_payments=advance_payments[order],
+        strings={
+            column: StringColumn(codes[column][order].astype(np.int32),
+                                 np.asarray(values[column], dtype=np.object_))
+            for column in STRING_COLUMNS
+        },
+    )
+
+
+def _zipf_choice(generator: np.random.Generator,
+                 cardinality: int,
+                 size: int,
+                 exponent: float = 1.0) -> NDArray:
+    # Index k is drawn with a probability proportional to 1 / (k + 1) ** exponent.
+    weights: NDArray = 1.0 / np.arange(1, cardinality + 1) ** exponent
+    return generator.choice(cardinality, size=size, p=weights / weights.sum())
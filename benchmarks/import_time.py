@@ -0,0 +1,199 @@
+"""
+Import-time benchmark of the command line entry points.
+
+Measures, in fresh interpreters, the self-reported import time of each entry point
+module and the wall-clock time of a `--help` invocation of it and of each of its
+subcommands, and checks that no heavy dependency is imported and no file (such as a
+log file) is created before a command needs it. Exits with status 1 when a budget
+is exceeded, so it can guard against regressions in CI.
+
+    python benchmarks/import_time.py --repeat 10 --max-import-ms 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SOURCE: Path = Path(__file__).absolute().parent.parent.joinpath("src")
+
+ENTRY_POINTS: tuple[str, ...] = (
+    "financialchecker.analytics.app",
+    "financialchecker.data.loader",
+)
+
+# Subcommands of the entry points, whose help is built by their own parsers.
+SUBCOMMANDS: dict[str, tuple[str, ...]] = {
+    "financialchecker.analytics.app": ("transaction", "report", "duplicates"),
+}
+
+HEAVY_MODULES: tuple[str, ...] = (
+    "bson",
+    "numpy",
+    "omegaconf",
+    "pandas",
+    "plotly",
+    "pydantic_settings",
+    "pymongo",
+    "scipy",
+)
+
+
+def _environment() -> dict[str, str]:
+    environment: dict[str, str] = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, (str(SOURCE), environment.get("PYTHONPATH")))
+    )
+    return environment
+
+
+def import_time(module: str) -> float:
+    """
+    Import a module in a fresh interpreter and return its cumulative import time.
+
+    Parameters:
+        module (str): The module to import.
+
+    Returns:
+        float: The import time of the module and its dependencies, in milliseconds,
+            as reported by `python -X importtime`.
+    """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], # noqa E507
+                            env=_environment(),
+                            capture_output=True,
+                            text=True,
+                            check=True)
+
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|")) # noqa E507
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} was not imported")
+
+
+def help_time(module: str, *arguments: str) -> float:
+    """
+    Run `python -m <module> [arguments] --help` and return its wall-clock time in
+    milliseconds, interpreter start-up included.
+    """
+
+    start: float = time.perf_counter()
+    subprocess.run([sys.executable, "-m", module, *arguments, "--help"],
+                   env=_environment(),
+                   capture_output=True,
+                   check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def created_files(module: str, *arguments: str) -> list[str]:
+    """
+    List the files created in the working directory by
+    `python -m <module> [arguments] --help`.
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        subprocess.run([sys.executable, "-m", module, *arguments, "--help"],
+                       env=_environment(),
+                       cwd=directory,
+                       capture_output=True,
+                       check=True)
+        return sorted(path.name for path in Path(directory).iterdir())
+
+
+def heavy_imports(module: str) -> list[str]:
+    """
+    List the heavy dependencies loaded by importing a module.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-c",
+         f"import sys, {module}; print(' '.join(sorted(sys.modules)))"],
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded: set[str] = set(result.stdout.split())
+    return [heavy for heavy in HEAVY_MODULES if heavy in loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser("Financial Checker import-time benchmark")
+    parser.add_argument("-r",
+                        "--repeat",
+                        type=int,
+                        help="Number of measurements per entry point",
+                        default=5)
+    parser.add_argument("--max-import-ms",
+                        type=float,
+                        help="Budget for the median import time of an entry point",
+                        default=50.0)
+    parser.add_argument("--max-help-ms",
+                        type=float,
+                        help="Budget for the median `--help` wall-clock time",
+                        default=250.0)
+    parser.add_argument("-o",
+                        "--output",
+                        type=str,
+                        help="JSON file the results are written to",
+                        default=None)
+
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    failures: list[str] = []
+
+    for module in ENTRY_POINTS:
+        import_ms: float = statistics.median(import_time(module) for _ in range(args.repeat)) # noqa E507
+        help_ms: float = statistics.median(help_time(module) for _ in range(args.repeat)) # noqa E507
+        heavy: list[str] = heavy_imports(module)
+        files: list[str] = created_files(module)
+        subcommands_help_ms: dict[str, float] = {}
+
+        for subcommand in SUBCOMMANDS.get(module, ()):
+            try:
+                subcommands_help_ms[subcommand] = statistics.median(help_time(module, subcommand) for _ in range(args.repeat)) # noqa E507
+            except subprocess.CalledProcessError:
+                failures.append(f"{module}: {subcommand} --help failed")
+
+        results[module] = {
+            "import_ms": round(import_ms, 2),
+            "help_ms": round(help_ms, 2),
+            "subcommands_help_ms": {
+                subcommand: round(subcommand_ms, 2)
+                for subcommand, subcommand_ms in subcommands_help_ms.items()
+            },
+            "heavy_imports": heavy,
+            "created_files": files,
+        }
+
+        if import_ms > args.max_import_ms:
+            failures.append(f"{module}: import {import_ms:.1f} ms > {args.max_import_ms} ms") # noqa E507
+        if help_ms > args.max_help_ms:
+            failures.append(f"{module}: --help {help_ms:.1f} ms > {args.max_help_ms} ms") # noqa E507
+        for subcommand, subcommand_ms in subcommands_help_ms.items():
+            if subcommand_ms > args.max_help_ms:
+                failures.append(f"{module}: {subcommand} --help {subcommand_ms:.1f} ms > {args.max_help_ms} ms") # noqa E507
+        if heavy:
+            failures.append(f"{module}: imports {', '.join(heavy)} eagerly")
+        if files:
+            failures.append(f"{module}: --help creates {', '.join(files)}")
+
+    report: str = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report)
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
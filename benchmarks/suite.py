@@ -0,0 +1,347 @@
+"""
+Benchmark suite of the data access and analytics layers.
+
+Generates a seeded synthetic history, loads it into a local mongod or an in-process
+mongomock database, times the main read and write paths and writes the results as
+JSON. A previous result file can be given as baseline to fail on regressions.
+
+    python benchmarks/suite.py --backend mongomock --rows 100000 -o results.json
+    python benchmarks/suite.py --backend mongod --rows 1000000 --baseline results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import bson
+import numpy as np
+import pandas as pd
+import pymongo
+
+sys.path.insert(0, str(Path(__file__).absolute().parent))
+sys.path.insert(1, str(Path(__file__).absolute().parent.parent.joinpath("src")))
+# The benchmark databases are given on the command line; the settings only name the
+# collections, so a checkout without config.yaml can run the suite.
+os.environ.setdefault("FINANCIALCHECKER_CONFIG",
+                      str(Path(__file__).absolute().parent.joinpath("config.yaml")))
+
+from generator import GeneratorConfig, generate_batch  # noqa: E402
+
+from financialchecker.data.aggregate import DataAggregate  # noqa: E402
+from financialchecker.data.estimates import Estimator  # noqa: E402
+from financialchecker.database.mongodb.database import MongoDBCrud  # noqa: E402
+from financialchecker.database.mongodb.indexes import ensure_indexes  # noqa: E402
+from financialchecker.transactions._transactions import TransactionType  # noqa: E402
+from financialchecker.utils.settings import get_mongodb_collection  # noqa: E402
+
+
+class BenchmarkInstance:
+    """
+    Stand-in for MongoDBInstance exposing the benchmark database.
+    """
+
+    def __init__(self, database) -> None:
+        self.database = database
+
+
+class RawBatchDatabase:
+    """
+    Wrapper adding `find_raw_batches`, which mongomock does not implement, to the
+    collections of a mongomock database.
+    """
+
+    def __init__(self, database) -> None:
+        self._database = database
+
+    def __getitem__(self, name: str) -> "RawBatchCollection":
+        return RawBatchCollection(self._database[name])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._database, name)
+
+
+class RawBatchCollection:
+    def __init__(self, collection) -> None:
+        self._collection = collection
+
+    def find_raw_batches(self, filter: dict | None = None, batch_size: int = 1000, **kwargs) -> Iterator[bytes]: # noqa E507
+        cursor = self._collection.find(filter, **kwargs)
+
+        while documents := [document for _, document in zip(range(batch_size), cursor)]: # noqa E507
+            yield b"".join(bson.encode(document) for document in documents)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+
+def connect(backend: str, uri: str, database_name: str):
+    match backend:
+        case "mongod":
+            database = pymongo.MongoClient(uri)[database_name]
+            database.drop_collection(get_mongodb_collection().Transaction)
+            database.drop_collection(get_mongodb_collection().Rollup)
+            ensure_indexes(database)
+            return database
+        case "mongomock":
+            import mongomock
+
+            return RawBatchDatabase(mongomock.MongoClient()[database_name])
+        case _:
+            raise ValueError(f"Unknown backend: {backend}")
+
+
+def measure(function: Callable[[], Any], repeat: int, rows: int) -> dict:
+    """
+    Time a function.
+
+    Parameters:
+        function (Callable[[], Any]): The operation to time.
+        repeat (int): Number of timed calls.
+        rows (int): Number of rows processed by one call, for the throughput.
+
+    Returns:
+        dict: The minimum, median and mean durations in seconds and the median
+            throughput in rows per second, or the reason the operation is not
+            supported by the backend.
+    """
+
+    durations: list[float] = []
+
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        try:
+            function()
+        except NotImplementedError as error:
+            return {"skipped": f"not supported by the backend: {error}"}
+        durations.append(time.perf_counter() - start)
+
+    median: float = statistics.median(durations)
+    return {
+        "repeat": repeat,
+        "rows": rows,
+        "min_s": min(durations),
+        "median_s": median,
+        "mean_s": statistics.fmean(durations),
+        "rows_per_s": rows / median if median else None,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    config: GeneratorConfig = GeneratorConfig(rows=args.rows,
+                                              seed=args.seed,
+                                              days=args.days,
+                                              categories=args.categories,
+                                              firms=args.firms,
+                                              locations=args.locations)
+    results: dict[str, dict] = {}
+
+    results["generate"] = measure(lambda: generate_batch(config), 1, config.rows)
+    batch = generate_batch(config)
+
+    crud: MongoDBCrud = MongoDBCrud(
+        mongodb_instance=BenchmarkInstance(connect(args.backend, args.uri, args.database)) # noqa E507
+    )
+    results["add_transactions"] = measure(lambda: crud.add_transactions(batch), 1, config.rows) # noqa E507
+
+    repeat: int = args.repeat
+    rows: int = config.rows
+    start_date, end_date = batch.dates[0].item(), batch.dates[-1].item()
+    expenses: int = int(np.count_nonzero(batch.strings("type").decode() == TransactionType.EXPENSE)) # noqa E507
+
+    results["get_all_transactions"] = measure(crud.get_all_transactions, repeat, rows)
+    results["get_transaction_frames"] = measure(crud.get_transaction_frames, repeat, rows) # noqa E507
+
+    results["DataAggregate"] = measure(lambda: DataAggregate(mongo_instance=crud), repeat, rows) # noqa E507
+    aggregator: DataAggregate = DataAggregate(mongo_instance=crud)
+    results["DataAggregate.get_expense_dataframe"] = measure(aggregator.get_expense_dataframe, repeat, expenses) # noqa E507
+    results["DataAggregate.get_expense_amount_distribution"] = measure(
+        lambda: aggregator.get_expense_amount_distribution(start_date, end_date),
+        repeat,
+        expenses,
+    )
+    results["DataAggregate.sketches"] = measure(lambda: DataAggregate(mongo_instance=crud).sketches(), repeat, rows) # noqa E507
+    results["DataAggregate.distribution"] = measure(
+        lambda: aggregator.distribution(start_date=start_date, end_date=end_date).quantiles([0.5, 0.9, 0.99]), # noqa E507
+        repeat,
+        rows,
+    )
+    results["DataAggregate.get_period_totals"] = measure(
+        lambda: DataAggregate(mongo_instance=crud, preload=False).get_period_totals(group_by="category"), # noqa E507
+        repeat,
+        rows,
+    )
+    results["DataAggregate.refresh"] = measure(aggregator.refresh, repeat, 0)
+
+    results["Estimator"] = measure(lambda: Estimator(mongo_instance=crud), repeat, rows) # noqa E507
+    estimator: Estimator = Estimator(mongo_instance=crud)
+    results["Estimator.income_rate_of_change"] = measure(estimator.income_rate_of_change, repeat, rows) # noqa E507
+    results["Estimator.expense_rate_of_change"] = measure(estimator.expense_rate_of_change, repeat, rows) # noqa E507
+    results["Estimator.expense_rate_of_change.stochastic"] = measure(
+        lambda: estimator.expense_rate_of_change(stochastic=True),
+        repeat,
+        rows,
+    )
+    results["Estimator.rate_table"] = measure(estimator.rate_table, repeat, rows)
+
+    if args.backend == "mongod":
+        # mongomock implements neither $toDate nor $dateFromParts.
+        results["get_period_totals"] = measure(crud.get_period_totals, repeat, rows)
+        results["Estimator.server_side"] = measure(
+            lambda: Estimator(server_side=True, mongo_instance=crud),
+            repeat,
+            rows,
+        )
+
+    # Single inserts run last, as they grow the collection.
+    singles = generate_batch(GeneratorConfig(rows=args.single_inserts,
+                                             seed=args.seed + 1,
+                                             days=args.days))
+    transactions = iter(list(singles))
+    results["add_transaction"] = measure(
+        lambda: [crud.add_transaction(next(transactions)) for _ in range(args.single_inserts // repeat)], # noqa E507
+        repeat,
+        args.single_inserts // repeat,
+    )
+
+    return {
+        "metadata": metadata(args, config),
+        "results": results,
+    }
+
+
+def metadata(args: argparse.Namespace, config: GeneratorConfig) -> dict:
+    try:
+        commit: str | None = subprocess.run(["git", "rev-parse", "HEAD"],
+                                            cwd=Path(__file__).absolute().parent,
+                                            capture_output=True,
+                                            text=True,
+                                            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pymongo": pymongo.version,
+        "generator": {**asdict(config), "start_date": config.start_date.isoformat()},
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare median durations with a baseline run.
+
+    Returns:
+        list[str]: One message per benchmark slower than the baseline by more than
+            `tolerance` (a fraction of the baseline median).
+    """
+
+    messages: list[str] = []
+
+    for name, result in results["results"].items():
+        reference: dict | None = baseline.get("results", {}).get(name)
+        if not reference or "median_s" not in reference or "median_s" not in result:
+            continue
+
+        ratio: float = result["median_s"] / reference["median_s"]
+        if ratio > 1 + tolerance:
+            messages.append(f"{name}: {result['median_s']:.4f} s vs {reference['median_s']:.4f} s ({ratio:.2f}x)") # noqa E507
+
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser("Financial Checker benchmark suite")
+    parser.add_argument("-b",
+                        "--backend",
+                        choices=["mongomock", "mongod"],
+                        default="mongomock")
+    parser.add_argument("--uri",
+                        type=str,
+                        help="mongod connection string",
+                        default="mongodb://localhost:27017")
+    parser.add_argument("--database",
+                        type=str,
+                        help="Database the benchmark collection is (re)created in",
+                        default="financialchecker_benchmark")
+    parser.add_argument("-n",
+                        "--rows",
+                        type=int,
+                        help="Number of generated transactions",
+                        default=100_000)
+    parser.add_argument("-s",
+                        "--seed",
+                        type=int,
+                        default=0)
+    parser.add_argument("--days",
+                        type=int,
+                        help="Number of days covered by the history",
+                        default=4 * 365)
+    parser.add_argument("--categories",
+                        type=int,
+                        help="Number of expense categories",
+                        default=20)
+    parser.add_argument("--firms",
+                        type=int,
+                        help="Number of firms",
+                        default=500)
+    parser.add_argument("--locations",
+                        type=int,
+                        help="Number of locations",
+                        default=50)
+    parser.add_argument("-r",
+                        "--repeat",
+                        type=int,
+                        help="Number of timed calls per benchmark",
+                        default=3)
+    parser.add_argument("--single-inserts",
+                        type=int,
+                        help="Number of transactions inserted one by one",
+                        default=300)
+    parser.add_argument("-o",
+                        "--output",
+                        type=str,
+                        help="JSON file the results are written to",
+                        default=None)
+    parser.add_argument("--baseline",
+                        type=str,
+                        help="Previous results to compare with",
+                        default=None)
+    parser.add_argument("--tolerance",
+                        type=float,
+                        help="Allowed slowdown over the baseline, as a fraction",
+                        default=0.25)
+
+    args = parser.parse_args()
+
+    results: dict = run(args)
+    report: str = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report)
+
+    if args.baseline:
+        messages: list[str] = regressions(results,
+                                          json.loads(Path(args.baseline).read_text()),
+                                          args.tolerance)
+        for message in messages:
+            print(f"Regression: {message}", file=sys.stderr)
+        sys.exit(1 if messages else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,32 @@
 import argparse
 from datetime import date
 
-import plotly.express as px
+from financialchecker.data.periods import Period
+from financialchecker.transactions._transactions import TransactionType
 
-from financialchecker.data.aggregate import DataAggregate
+# The data, database and plotting modules pull in pandas, pymongo and plotly; they are
+# imported by the commands using them so that `--help` and argument errors return
+# immediately.
 
 
 def main():
     parser = argparse.ArgumentParser("Financial Checker Analytics")
+    parser.add_argument("--no-cache",
+                        action="store_true",
+                        help="Load every transaction from the database, ignoring the local cache") # noqa E507
+    parser.add_argument("--clear-cache",
+                        action="store_true",
+                        help="Delete the local cache before loading the transactions") # noqa E507
+    parser.add_argument("--cache-dir",
+                        type=str,
+                        help="Local cache folder",
+                        default=None)
+    parser.add_argument("--profile",
+                        nargs="?",
+                        const="-",
+                        metavar="FILE",
+                        help="Record operation metrics and write them to FILE (JSON for .json, Prometheus text otherwise) or to stderr", # noqa E507
+                        default=None)
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
@@ -15,18 +34,18 @@ def main():
                                                help="Transaction related commands")
     transaction_parser.add_argument("-t",
                                     "--type",
-                                    choices=["all", "expenses", "income"],
+                                    choices=["all", "expense", "expenses", "income"],
                                     default="all")
     transaction_parser.add_argument("-s",
                                     "--start",
                                     type=str,
-                                    help="Starting date format (%Y-%m-%d)",
-                                    default=date.today().strftime("%Y-%m-%d"))
+                                    help="Starting date format (%%Y-%%m-%%d)",
+                                    default=None)
     transaction_parser.add_argument("-e",
                                     "--end",
                                     type=str,
-                                    help="Starting end format (%Y-%m-%d)",
-                                    default=date.today().strftime("%Y-%m-%d"))
+                                    help="Ending date format (%%Y-%%m-%%d)",
+                                    default=None)
     transaction_parser.add_argument("-c",
                                     "--category",
                                     type=str,
@@ -41,28 +60,157 @@ def main():
                                     help="Storing folder",
                                     default="./result.png")
 
+    report_parser = subparsers.add_parser(name="report",
+                                          help="Render a set of charts into a folder")
+    report_parser.add_argument("-t",
+                               "--type",
+                               choices=["all", "expense", "expenses", "income"],
+                               default="all")
+    report_parser.add_argument("-s",
+                               "--start",
+                               type=str,
+                               help="Starting date format (%%Y-%%m-%%d)",
+                               default=None)
+    report_parser.add_argument("-e",
+                               "--end",
+                               type=str,
+                               help="Ending date format (%%Y-%%m-%%d)",
+                               default=None)
+    report_parser.add_argument("-c",
+                               "--category",
+                               type=str,
+                               action="append",
+                               help="Category given its own charts, repeatable (default: all)") # noqa E507
+    report_parser.add_argument("-p",
+                               "--period",
+                               choices=Period.list(),
+                               default=Period.MONTHLY)
+    report_parser.add_argument("-o",
+                               "--output",
+                               type=str,
+                               help="Storing folder",
+                               default="./report")
+    report_parser.add_argument("-fmt",
+                               "--format",
+                               choices=["png", "jpeg", "svg", "pdf"],
+                               default="png")
+    report_parser.add_argument("-w",
+                               "--workers",
+                               type=int,
+                               help="Number of rendering processes (default: CPU count)", # noqa E507
+                               default=None)
+
+    duplicates_parser = subparsers.add_parser(name="duplicates",
+                                              help="List the groups of identical transactions") # noqa E507
+    duplicates_parser.add_argument("-s",
+                                   "--start",
+                                   type=str,
+                                   help="Starting date format (%%Y-%%m-%%d)",
+                                   default=None)
+    duplicates_parser.add_argument("-e",
+                                   "--end",
+                                   type=str,
+                                   help="Ending date format (%%Y-%%m-%%d)",
+                                   default=None)
+    duplicates_parser.add_argument("-o",
+                                   "--output",
+                                   type=str,
+                                   help="CSV file the report is written to",
+                                   default=None)
+
     args = parser.parse_args()
 
+    if args.command is None:
+        parser.print_help()
+        return
+
+    from financialchecker.data.aggregate import DataAggregate
+    from financialchecker.data.cache import TransactionCache
+    from financialchecker.database.mongodb.models import TransactionQuery
+    from financialchecker.utils.metrics import configure_metrics
+    from financialchecker.utils.settings import get_local_cache_settings
+
+    configure_metrics(enabled=args.profile is not None, output=args.profile)
+
+    cache: TransactionCache | None = None
+    if get_local_cache_settings().ENABLED and not args.no_cache:
+        cache = TransactionCache(directory=args.cache_dir)
+        if args.clear_cache:
+            cache.clear()
+
     match args.command:
         case "transaction":
+            from financialchecker.analytics.report import distribution_chart, write_chart # noqa E507
+
             print(f"Transaction Type selected -> {args.type}")
-            print(f"From -> {args.start}")
-            print(f"To -> {args.end}")
+            print(f"From -> {'beginning' if not args.start else args.start}")
+            print(f"To -> {'today' if not args.end else args.end}")
             print(f"Category -> {'all' if not args.category else args.category}")
             print(f"Plot Type -> {args.plot_type}")
             print(f"Storing -> {args.file}")
 
-            aggregator = DataAggregate()
-
-            match args.type:
-                case "income":
-                    fig = px.histogram(aggregator.get_income_amount_distribution())
-                    fig.write_image(args.file)
-                case "expense":
-                    fig = px.histogram(aggregator.get_expense_amount_distribution())
-                    fig.write_image(args.file)
-                case "all":
-                    print("No plot visualization is available")
+            aggregator = DataAggregate(
+                query=TransactionQuery(
+                    start_date=date.fromisoformat(args.start) if args.start else None,
+                    end_date=date.fromisoformat(args.end) if args.end else None,
+                    categories=(args.category,) if args.category else (),
+                ),
+                cache=cache,
+            )
+
+            frames = {
+                TransactionType.EXPENSE: aggregator.get_expense_dataframe(),
+                TransactionType.INCOME: aggregator.get_income_dataframe(),
+            }
+            write_chart(distribution_chart(frames, _transaction_types(args.type)),
+                        args.file)
+        case "report":
+            from financialchecker.analytics.report import build_charts, render_report # noqa E507
+
+            aggregator = DataAggregate(
+                query=TransactionQuery(
+                    start_date=date.fromisoformat(args.start) if args.start else None,
+                    end_date=date.fromisoformat(args.end) if args.end else None,
+                ),
+                cache=cache,
+            )
+
+            charts = build_charts(aggregator,
+                                  transaction_types=_transaction_types(args.type),
+                                  categories=args.category,
+                                  period=args.period)
+            files = render_report(charts,
+                                  directory=args.output,
+                                  image_format=args.format,
+                                  workers=args.workers)
+            print(f"{len(files)} charts stored in {args.output}")
+        case "duplicates":
+            aggregator = DataAggregate(
+                query=TransactionQuery(
+                    start_date=date.fromisoformat(args.start) if args.start else None,
+                    end_date=date.fromisoformat(args.end) if args.end else None,
+                ),
+                cache=cache,
+            )
+
+            report = aggregator.get_duplicates()
+            print(f"{report['group'].nunique()} groups of identical transactions, "
+                  f"{len(report) - report['group'].nunique()} extra copies")
+            if args.output:
+                report.to_csv(args.output, index=False)
+                print(f"Report stored in {args.output}")
+            elif len(report):
+                print(report.to_string(index=False))
+
+
+def _transaction_types(transaction_type: str) -> list[str]:
+    match transaction_type:
+        case "income":
+            return [TransactionType.INCOME]
+        case "expense" | "expenses":
+            return [TransactionType.EXPENSE]
+        case _:
+            return TransactionType.list()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from financialchecker.data.aggregate import DataAggregate
+from financialchecker.data.periods import PERIOD_FREQUENCIES, Period
+from financialchecker.transactions._transactions import TransactionType
+from financialchecker.utils.utils import EnhancedStrEnum
+
+
+class ChartKind(EnhancedStrEnum):
+    DISTRIBUTION: str = "distribution"
+    PERIOD_TOTALS: str = "period_totals"
+    CATEGORY_TOTALS: str = "category_totals"
+
+
+@dataclass(frozen=True)
+class Chart:
+    """
+    Data class representing one chart of a report.
+
+    Attributes:
+        name (str): Name of the chart, used as its file name.
+        title (str): Title displayed on the chart.
+        kind (ChartKind): How the data is plotted.
+        data (pd.DataFrame): The data to plot, reduced to what the chart needs: the
+            amount (and type) column for distributions, the period/category and
+            amount columns for totals.
+    """
+
+    name: str
+    title: str
+    kind: ChartKind
+    data: pd.DataFrame
+
+
+def build_charts(aggregator: DataAggregate,
+                 transaction_types: list[str] | None = None,
+                 categories: list[str] | None = None,
+                 period: Period | str = Period.MONTHLY) -> list[Chart]:
+    """
+    Prepare the charts of a report from already loaded transactions.
+
+    Parameters:
+        aggregator (DataAggregate): The loaded transactions.
+        transaction_types (list[str] | None, optional): Transaction types to report
+            on. Defaults to every type.
+        categories (list[str] | None, optional): Categories given their own charts.
+            Defaults to every category present.
+        period (Period | str, optional): Period of the totals charts. Defaults to
+            monthly.
+
+    Returns:
+        list[Chart]: For each type, its amount distribution, totals per period and
+            totals per category, then the distribution and totals per period of
+            each category; plus one distribution comparing the types when there are
+            several.
+    """
+
+    transaction_types = transaction_types or TransactionType.list()
+    frames: dict[str, pd.DataFrame] = {
+        TransactionType.EXPENSE: aggregator.get_expense_dataframe(),
+        TransactionType.INCOME: aggregator.get_income_dataframe(),
+    }
+    charts: list[Chart] = []
+
+    if len(transaction_types) > 1:
+        charts.append(distribution_chart(frames, transaction_types))
+
+    for transaction_type in transaction_types:
+        frame: pd.DataFrame = frames[transaction_type]
+        if not len(frame):
+            continue
+
+        label: str = transaction_type.lower()
+        charts.extend([
+            Chart(name=f"{label}_distribution",
+                  title=f"{label.capitalize()} amounts",
+                  kind=ChartKind.DISTRIBUTION,
+                  data=frame[["amount"]]),
+            Chart(name=f"{label}_{period}_totals",
+                  title=f"{label.capitalize()} {period} totals",
+                  kind=ChartKind.PERIOD_TOTALS,
+                  data=_period_totals(frame, period)),
+            Chart(name=f"{label}_category_totals",
+                  title=f"{label.capitalize()} totals per category",
+                  kind=ChartKind.CATEGORY_TOTALS,
+                  data=frame.groupby("category", observed=True)["amount"].sum().reset_index()), # noqa E507
+        ])
+
+        for category, category_frame in frame.groupby("category", observed=True):
+            if categories and category not in categories:
+                continue
+
+            charts.extend([
+                Chart(name=f"{label}_{category}_distribution",
+                      title=f"{label.capitalize()} amounts - {category}",
+                      kind=ChartKind.DISTRIBUTION,
+                      data=category_frame[["amount"]]),
+                Chart(name=f"{label}_{category}_{period}_totals",
+                      title=f"{label.capitalize()} {period} totals - {category}",
+                      kind=ChartKind.PERIOD_TOTALS,
+                      data=_period_totals(category_frame, period)),
+            ])
+
+    return charts
+
+
+def distribution_chart(frames: dict[str, pd.DataFrame],
+                       transaction_types: list[str]) -> Chart:
+    amounts: list[pd.DataFrame] = [
+        frames[transaction_type][["amount"]].assign(type=transaction_type.lower())
+        for transaction_type in transaction_types
+        if len(frames[transaction_type])
+    ]
+    data: pd.DataFrame = pd.concat(amounts, ignore_index=True) if amounts else pd.DataFrame(columns=["amount", "type"]) # noqa E507
+
+    return Chart(name="distribution",
+                 title="Transaction amounts",
+                 kind=ChartKind.DISTRIBUTION,
+                 data=data)
+
+
+def figure(chart: Chart) -> go.Figure:
+    match chart.kind:
+        case ChartKind.DISTRIBUTION:
+            return px.histogram(chart.data,
+                                x="amount",
+                                color="type" if "type" in chart.data else None,
+                                barmode="overlay",
+                                title=chart.title)
+        case ChartKind.PERIOD_TOTALS:
+            return px.bar(chart.data, x="period", y="amount", title=chart.title)
+        case ChartKind.CATEGORY_TOTALS:
+            return px.bar(chart.data, x="category", y="amount", title=chart.title)
+        case _:
+            raise ValueError(f"Unknown chart kind: {chart.kind}")
+
+
+def write_chart(chart: Chart, path: str | Path) -> Path:
+    figure(chart).write_image(path)
+    return Path(path)
+
+
+def render_chart(chart: Chart,
+                 directory: str | Path,
+                 image_format: str = "png") -> Path:
+    return write_chart(chart,
+                       Path(directory).joinpath(f"{_file_name(chart.name)}.{image_format}")) # noqa E507
+
+
+def render_report(charts: list[Chart],
+                  directory: str | Path,
+                  image_format: str = "png",
+                  workers: int | None = None) -> list[Path]:
+    """
+    Render charts into a directory, in parallel.
+
+    Parameters:
+        charts (list[Chart]): The charts to render.
+        directory (str | Path): The output directory, created if needed.
+        image_format (str, optional): Image format written by kaleido. Defaults to
+            "png".
+        workers (int | None, optional): Number of rendering processes; 1 renders
+            in-process. Defaults to the CPU count.
+
+    Returns:
+        list[Path]: The written files, in the order of the charts.
+
+    Note:
+        Kaleido starts its rendering engine once per process and reuses it for
+        every following image, so each worker pays the start-up once whatever the
+        number of charts. Workers only receive the reduced chart data.
+    """
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, max(len(charts), 1))
+
+    if workers == 1:
+        return [render_chart(chart, directory, image_format) for chart in charts]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_chart,
+                                 charts,
+                                 repeat(directory),
+                                 repeat(image_format)))
+
+
+def _period_totals(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+    return (
+        frame.groupby(pd.Grouper(key="date",
+                                 freq=PERIOD_FREQUENCIES[period],
+                                 label="left",
+                                 closed="left"))["amount"]
+        .sum()
+        .rename_axis("period")
+        .reset_index()
+    )
+
+
+def _file_name(name: str) -> str:
+    file_name: str = re.sub(r"[^\w.-]+", "_", name).strip("_")
+    if file_name == name:
+        return file_name
+
+    # Different names can sanitize to the same file name ("Food/Drinks" and
+    # "Food Drinks"), so the rewritten ones are told apart by a hash of the name.
+    return f"{file_name}_{hashlib.sha1(name.encode()).hexdigest()[:8]}".lstrip("_")
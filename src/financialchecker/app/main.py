@@ -7,15 +7,54 @@ from financialchecker.transactions.expense import Expense
 from financialchecker.transactions.income import Income
 
 
+TYPEAHEAD_LIMIT: int = 20
+
+
+@st.cache_resource
+def get_mongodb_instance() -> MongoDBCrud:
+    return MongoDBCrud()
+
+
+def utility_typeahead(mongodb_instance: MongoDBCrud,
+                      utility_type: str,
+                      label: str) -> str:
+    """
+    Select a utility value through a search box, so that only the values matching
+    the typed prefix are sent to the browser.
+
+    Parameters:
+        mongodb_instance (MongoDBCrud): The CRUD operations serving the lookups.
+        utility_type (str): The utility type, e.g. "Firm".
+        label (str): Label of the select box.
+
+    Returns:
+        str: The selected value.
+
+    Note:
+        Widgets inside a form only rerun the script on submission, so the search
+        box must be placed outside of any form.
+    """
+
+    prefix: str = st.text_input(f"Search {label.lower()}", key=f"{utility_type}_prefix") # noqa E507
+    options: list[str] = mongodb_instance.search_utilities(utility_type,
+                                                           prefix,
+                                                           limit=TYPEAHEAD_LIMIT) or [""] # noqa E507
+    return st.selectbox(label, options=options, key=f"{utility_type}_value")
+
+
 def main():
     st.set_page_config(page_title="FinancialChecker")
 
-    mongodb_instance: MongoDBCrud = MongoDBCrud()
+    mongodb_instance: MongoDBCrud = get_mongodb_instance()
     list_categories: list[str] = mongodb_instance.get_categories()
     list_payment_methods: list[str] = mongodb_instance.get_payment_methods()
     st.title("Add Transaction")
-    list_firms: list[str] = mongodb_instance.get_firms()
-    list_locations: list[str] = mongodb_instance.get_locations()
+
+    firm_column, location_column = st.columns(2)
+    with firm_column:
+        transaction_firm = utility_typeahead(mongodb_instance, "Firm", "Firm")
+    with location_column:
+        transaction_location = utility_typeahead(mongodb_instance, "Location", "Location") # noqa E507
 
     with st.form("transaction_form"):
         transaction_date = st.date_input("Date", value=date.today())
@@ -23,14 +62,14 @@ def main():
         transaction_category = st.selectbox("Category", list_categories)
         transaction_amount = st.number_input("Amount", min_value=0.01, format="%.2f")
         transaction_method = st.radio("Payment Method", list_payment_methods)
-        transaction_firm = st.selectbox("Firm", options=list_firms)
-        transaction_location = st.selectbox("Location", options=list_locations)
         transaction_advance_payment = st.checkbox("Advance Payment? \
             (If so, add details in the description)")
 
         transaction_description = st.text_area("Description",
                                                placeholder="Enter transaction details here...") # noqa E507
 
+        store_duplicate = st.checkbox("Store even if an identical transaction is already stored") # noqa E507
+
         submitted = st.form_submit_button("Add Transaction", use_container_width=True) # noqa E507
 
         match transaction_type:
@@ -57,8 +96,16 @@ def main():
                 st.error("Unable to recognize the following transaction type", icon="🚨")
 
         if submitted:
-            mongodb_instance.add_transaction(transaction=transaction)
-            st.success('Transaction correctly submitted!', icon="✅")
+            # A second identical purchase on the same day is legitimate when typed
+            # by hand, so the user confirms it rather than having it skipped.
+            duplicate = mongodb_instance.find_duplicate_transaction(transaction)
+            if duplicate is not None and not store_duplicate:
+                st.warning("An identical transaction is already stored. Tick the box"
+                           " above and submit again to store it anyway.", icon="⚠️")
+            else:
+                mongodb_instance.add_transaction(transaction=transaction,
+                                                 deduplicate=duplicate is None)
+                st.success('Transaction correctly submitted!', icon="✅")
 
 
 if __name__ == "__main__":
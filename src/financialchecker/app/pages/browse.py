@@ -0,0 +1,125 @@
+import pandas as pd
+import streamlit as st
+
+from financialchecker.app.main import TYPEAHEAD_LIMIT, get_mongodb_instance
+from financialchecker.database.mongodb.database import MongoDBCrud
+from financialchecker.database.mongodb.models import TransactionPage, TransactionQuery
+from financialchecker.transactions._transactions import TransactionType
+
+PAGE_SIZES: tuple[int, ...] = (25, 50, 100)
+
+COLUMNS: list[str] = [
+    "date",
+    "type",
+    "amount",
+    "category",
+    "transaction_method",
+    "firm",
+    "location",
+    "description",
+]
+
+TRANSACTION_TYPES: dict[str, str | None] = {
+    "All": None,
+    "Expense": TransactionType.EXPENSE,
+    "Income": TransactionType.INCOME,
+}
+
+
+def utility_multiselect(mongodb_instance: MongoDBCrud,
+                        utility_type: str,
+                        label: str) -> list[str]:
+    # Only the values matching the typed prefix, and those already selected, are
+    # offered, rather than the whole utility list.
+    prefix: str = st.text_input(f"Search {label.lower()}", key=f"browse_{utility_type}_prefix") # noqa E507
+    selected: list[str] = st.session_state.get(f"browse_{utility_type}_values", [])
+    options: list[str] = list(dict.fromkeys([
+        *selected,
+        *mongodb_instance.search_utilities(utility_type, prefix, limit=TYPEAHEAD_LIMIT), # noqa E507
+    ]))
+    return st.multiselect(label, options, key=f"browse_{utility_type}_values")
+
+
+def main():
+    st.set_page_config(page_title="FinancialChecker")
+
+    mongodb_instance: MongoDBCrud = get_mongodb_instance()
+    st.title("Browse Transactions")
+
+    text: str = st.text_input("Search descriptions, firms and locations")
+
+    with st.expander("Filters", expanded=True):
+        type_column, order_column = st.columns(2)
+        transaction_type = type_column.selectbox("Transaction Type", list(TRANSACTION_TYPES)) # noqa E507
+        order = order_column.radio("Order", ["Newest first", "Oldest first"], horizontal=True) # noqa E507
+        start_date = type_column.date_input("From", value=None)
+        end_date = order_column.date_input("To", value=None)
+        categories = st.multiselect("Categories",
+                                    mongodb_instance.get_categories()
+                                    + mongodb_instance.get_income_categories())
+        transaction_methods = st.multiselect("Payment Methods",
+                                             mongodb_instance.get_payment_methods())
+        with type_column:
+            firms = utility_multiselect(mongodb_instance, "Firm", "Firms")
+        with order_column:
+            locations = utility_multiselect(mongodb_instance, "Location", "Locations")
+        page_size = st.selectbox("Transactions per page", PAGE_SIZES, index=1)
+
+    query: TransactionQuery = TransactionQuery(start_date=start_date,
+                                               end_date=end_date,
+                                               categories=tuple(categories),
+                                               transaction_methods=tuple(transaction_methods), # noqa E507
+                                               firms=tuple(firms),
+                                               locations=tuple(locations))
+
+    if text.strip():
+        transactions: list[dict] = mongodb_instance.search_transactions(
+            text,
+            transaction_type=TRANSACTION_TYPES[transaction_type],
+            query=query,
+            limit=page_size,
+        )
+        if not transactions:
+            st.info("No transactions match the search", icon="ℹ️")
+        else:
+            st.caption(f"{len(transactions)} most relevant transactions")
+            st.dataframe(pd.DataFrame(transactions, columns=COLUMNS),
+                         hide_index=True,
+                         use_container_width=True)
+        return
+
+    # The cursor of every visited page is kept so "Previous" can go back; changing
+    # a filter starts again from the first page.
+    filters: tuple = (transaction_type, order, query, page_size)
+    if st.session_state.get("browse_filters") != filters:
+        st.session_state.browse_filters = filters
+        st.session_state.browse_cursors = [None]
+    cursors: list[str | None] = st.session_state.browse_cursors
+
+    page: TransactionPage = mongodb_instance.get_transaction_page(
+        transaction_type=TRANSACTION_TYPES[transaction_type],
+        query=query,
+        cursor=cursors[-1],
+        page_size=page_size,
+        descending=order == "Newest first",
+    )
+
+    if not page.transactions:
+        st.info("No transactions match the filters", icon="ℹ️")
+    else:
+        st.dataframe(pd.DataFrame(page.transactions, columns=COLUMNS),
+                     hide_index=True,
+                     use_container_width=True)
+
+    previous_column, position_column, next_column = st.columns([1, 2, 1])
+    if previous_column.button("Previous", disabled=len(cursors) == 1, use_container_width=True): # noqa E507
+        cursors.pop()
+        st.rerun()
+    position_column.caption(f"Page {len(cursors)}")
+    if next_column.button("Next", disabled=page.next_cursor is None, use_container_width=True): # noqa E507
+        cursors.append(page.next_cursor)
+        st.rerun()
+
+
+if __name__ == "__main__":
+    main()
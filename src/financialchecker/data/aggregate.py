@@ -1,68 +1,385 @@
 from datetime import date
+from functools import lru_cache
 
 import pandas as pd
 from numpy.typing import NDArray
+from pymongo.errors import PyMongoError
 
+from financialchecker.data.cache import TransactionCache, filter_frame
+from financialchecker.data.duplicates import duplicate_report
+from financialchecker.data.periods import PERIOD_FREQUENCIES, Period
+from financialchecker.data.sketches import AmountSketch, DistributionSketches
+from financialchecker.data.snapshot import TransactionSnapshot
+from financialchecker.database.mongodb.columnar import concat_frames
 from financialchecker.database.mongodb.database import MongoDBCrud
+from financialchecker.database.mongodb.models import TransactionQuery
+from financialchecker.database.mongodb.rollups import ROLLUP_FIELDS
+from financialchecker.log.log import Logger
 from financialchecker.transactions._transactions import TransactionType
+from financialchecker.utils.exceptions import MongoDBConnectionError
+from financialchecker.utils.metrics import instrumented
+
+
+@lru_cache
+def get_logger() -> Logger:
+    # Created on first use: the logger opens its log file.
+    return Logger(module_name="DataAggregate", package_name="data", database=False)
 
 
 class DataAggregate:
-    def __init__(self) -> None:
-        self._mongo_instance: MongoDBCrud = MongoDBCrud()
-        self.update_transactions()
+    def __init__(self,
+                 incremental: bool = True,
+                 query: TransactionQuery | None = None,
+                 snapshot: TransactionSnapshot | None = None,
+                 cache: TransactionCache | None = None,
+                 mongo_instance: MongoDBCrud | None = None,
+                 preload: bool = True) -> None:
+        """
+        Aggregate the stored transactions into per-type DataFrames.
+
+        Parameters:
+            incremental (bool, optional): When True the transactions are kept in
+                memory and the database is only queried again through `refresh`,
+                which fetches the documents inserted after the last synchronisation.
+                When False every getter reloads the whole collection. Defaults to
+                True.
+            query (TransactionQuery | None, optional): Filters pushed down to the
+                database on every fetch. Defaults to None, loading all transactions.
+            snapshot (TransactionSnapshot | None, optional): Already loaded
+                transactions to aggregate; the database is then never queried.
+                Defaults to None.
+            cache (TransactionCache | None, optional): Local copy of the collection
+                loaded before querying the database, which then only returns the
+                transactions inserted since; `query` is applied in memory. When the
+                database is unreachable the cached transactions are used alone.
+                Defaults to None.
+            mongo_instance (MongoDBCrud | None, optional): The CRUD operations to
+                read the transactions with. Defaults to a new MongoDBCrud on the
+                shared MongoDB instance.
+            preload (bool, optional): Load the transactions immediately. When
+                False they are loaded by the first getter needing them, so an
+                aggregator only reading `get_period_totals` never loads them.
+                Defaults to True.
+        """
+
+        self._incremental: bool = incremental
+        self._query: TransactionQuery | None = query
+        self._cache: TransactionCache | None = cache
+        self._last_id: str | None = None
+        self._generation: int = 0
+        self._sketches: DistributionSketches | None = None
+        self._loaded: bool = True
 
+        if snapshot is not None:
+            self._mongo_instance: MongoDBCrud | None = None
+            self._expense_dataframe: pd.DataFrame = snapshot.expense
+            self._income_dataframe: pd.DataFrame = snapshot.income
+        else:
+            self._mongo_instance: MongoDBCrud | None = mongo_instance or MongoDBCrud()
+            self._expense_dataframe: pd.DataFrame = pd.DataFrame()
+            self._income_dataframe: pd.DataFrame = pd.DataFrame()
+            self._loaded = False
+            if preload:
+                self.update_transactions()
+
+    @instrumented("DataAggregate.update_transactions")
     def update_transactions(self) -> None:
-        self._all_transaction: list[dict] = self._mongo_instance.get_all_transactions()
-        self._expense_dataframe: pd.DataFrame = pd.DataFrame(_dict for _dict in self._all_transaction if _dict.get("type", "") == TransactionType.EXPENSE) # noqa E507
-        self._expense_dataframe["date"] = pd.to_datetime(
-            self._expense_dataframe["date"]
-        )
+        if self._mongo_instance is None:
+            return
 
-        self._income_dataframe: pd.DataFrame = pd.DataFrame(_dict for _dict in self._all_transaction if _dict.get("type", "") == TransactionType.INCOME) # noqa E507
+        self._loaded = True
+        self._last_id = None
+        self._sketches = None
+        self._expense_dataframe = pd.DataFrame()
+        self._income_dataframe = pd.DataFrame()
 
-    def get_expense_dataframe(self) -> pd.DataFrame:
-        self.update_transactions()
+        if self._cache is not None:
+            if self._cache_is_stale():
+                self._cache.clear()
+            if (cached := self._cache.load()) is not None:
+                frames, self._last_id = cached
+                self._expense_dataframe = filter_frame(frames[TransactionType.EXPENSE], self._query) # noqa E507
+                self._income_dataframe = filter_frame(frames[TransactionType.INCOME], self._query) # noqa E507
+
+        self._fetch_new_transactions()
+
+    @instrumented("DataAggregate.refresh", documents=lambda new_transactions: new_transactions) # noqa E507
+    def refresh(self) -> int:
+        """
+        Fetch the transactions inserted after the high-water mark and append them to
+        the in-memory DataFrames.
+
+        Returns:
+            int: The number of new transactions, or of all the transactions when a
+                stale cache had to be rebuilt.
+
+        Note:
+            With a cache, stored transactions changed in place (a migration advanced
+            the collection generation) or deleted (fewer are stored up to the
+            high-water mark than are cached) are not new; the cache is then rebuilt
+            from the whole collection.
+        """
+
+        if self._mongo_instance is None:
+            return 0
+
+        if self._cache is not None and self._cache_is_stale():
+            self._cache.clear()
+            self.update_transactions()
+            return len(self._expense_dataframe) + len(self._income_dataframe)
 
-        if len(self._expense_dataframe):
-            self._expense_dataframe["date"] = pd.to_datetime(
-                self._expense_dataframe["date"],
-                format="%Y-%m-%d"
+        return self._fetch_new_transactions()
+
+    def _cache_is_stale(self) -> bool:
+        # Compares the cache with the collection; an unreachable database leaves the
+        # cache in use.
+        state: dict | None = self._cache.state()
+        try:
+            self._generation = self._mongo_instance.get_transactions_generation()
+            if state is None or state["last_id"] is None:
+                return False
+            stored: int = self._mongo_instance.count_transactions(until_id=state["last_id"]) # noqa E507
+        except (MongoDBConnectionError, PyMongoError):
+            return False
+
+        if state["generation"] == self._generation and state["rows"] == stored:
+            return False
+
+        get_logger().info(
+            message=(
+                f"Rebuilding the transaction cache: {state['rows']} cached and"
+                f" {stored} stored transactions, generation {state['generation']}"
+                f" cached and {self._generation} stored"
             )
+        )
+        return True
+
+    def _fetch_new_transactions(self) -> int:
+        try:
+            frames: dict[str, pd.DataFrame] = self._mongo_instance.get_transaction_frames( # noqa E507
+                after_id=self._last_id,
+                query=self._query if self._cache is None else None,
+            )
+        except (MongoDBConnectionError, PyMongoError) as error:
+            if self._cache is None or self._last_id is None:
+                raise
+            get_logger().warn(message=f"MongoDB is unreachable, using the cached transactions: {error}") # noqa E507
+            return 0
+
+        new_transactions: int = sum(len(frame) for frame in frames.values())
+
+        if not new_transactions:
+            return 0
+
+        self._last_id = max(frame["id"].max() for frame in frames.values() if len(frame)) # noqa E507
+        if self._cache is not None:
+            self._cache.append(frames, self._last_id, generation=self._generation)
+            frames = {
+                transaction_type: filter_frame(frame, self._query)
+                for transaction_type, frame in frames.items()
+            }
+        if self._sketches is not None:
+            self._sketches.update(frames)
+
+        self._expense_dataframe = concat_frames([self._expense_dataframe, frames[TransactionType.EXPENSE]]) # noqa E507
+        self._income_dataframe = concat_frames([self._income_dataframe, frames[TransactionType.INCOME]]) # noqa E507
+
+        return new_transactions
+
+    def snapshot(self) -> TransactionSnapshot:
+        return TransactionSnapshot.from_frames(income=self._income_dataframe,
+                                               expense=self._expense_dataframe)
+
+    def _synchronize(self) -> None:
+        if not self._incremental or not self._loaded:
+            self.update_transactions()
+
+    @staticmethod
+    def _amounts_between(dataframe: pd.DataFrame,
+                         start_date: date | None = None,
+                         end_date: date | None = None) -> NDArray:
+        if not len(dataframe):
+            return pd.Series(dtype="float64", name="amount")
+
+        mask = pd.Series(True, index=dataframe.index)
+        if start_date is not None:
+            mask &= dataframe["date"] >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= dataframe["date"] <= pd.Timestamp(end_date)
+        return dataframe.loc[mask, "amount"]
+
+    def get_expense_dataframe(self) -> pd.DataFrame:
+        self._synchronize()
         return self._expense_dataframe
 
     def get_income_dataframe(self) -> pd.DataFrame:
-        self.update_transactions()
-        if len(self._income_dataframe):
-            self._income_dataframe["date"] = pd.to_datetime(self._income_dataframe["date"], # noqa E507
-                                                            format="%Y-%m-%d")
+        self._synchronize()
         return self._income_dataframe
 
     def get_income_amount_distribution(self,
                                        start_date: date | None = None,
                                        end_date: date | None = None) -> NDArray:
-        self.update_transactions()
-        if start_date is None and end_date is None:
-            return self._income_dataframe["amount"]
-        elif start_date is not None:
-            return self._income_dataframe[self._income_dataframe["date"] >= start_date]["amount"] # noqa E507
-        elif end_date is not None:
-            return self._income_dataframe[self._income_dataframe["date"] <= end_date]["amount"] # noqa E507
-        else:
-            return self._income_dataframe[(self._income_dataframe["date"] >= start_date) & (self._income_dataframe["date"] <= end_date)]["amount"] # noqa E507
+        self._synchronize()
+        return self._amounts_between(self._income_dataframe, start_date, end_date)
 
     def get_expense_amount_distribution(self,
                                         start_date: date | None = None,
                                         end_date: date | None = None) -> NDArray:
-        self.update_transactions()
-        if start_date is None and end_date is None:
-            return self._expense_dataframe["amount"]
-        elif start_date is not None:
-            return self._expense_dataframe[self._expense_dataframe["date"] >= start_date]["amount"] # noqa E507
-        elif end_date is not None:
-            return self._expense_dataframe[self._expense_dataframe["date"] <= end_date]["amount"] # noqa E507
-        else:
-            return self._expense_dataframe[(self._expense_dataframe["date"] >= start_date) & (self._expense_dataframe["date"] <= end_date)]["amount"] # noqa E507
+        self._synchronize()
+        return self._amounts_between(self._expense_dataframe, start_date, end_date)
+
+    @instrumented("DataAggregate.get_duplicates", documents=len)
+    def get_duplicates(self) -> pd.DataFrame:
+        """
+        List the groups of identical transactions among the loaded ones.
+
+        Returns:
+            pd.DataFrame: The report of `duplicate_report`.
+        """
+
+        self._synchronize()
+        return duplicate_report({
+            TransactionType.EXPENSE: self._expense_dataframe,
+            TransactionType.INCOME: self._income_dataframe,
+        })
+
+    def sketches(self) -> DistributionSketches:
+        """
+        Get the amount sketches per type, category and month.
+
+        Returns:
+            DistributionSketches: The sketches, built from the loaded transactions
+                on the first call and then updated by every `refresh`.
+        """
+
+        self._synchronize()
+        if self._sketches is None:
+            self._sketches = DistributionSketches()
+            self._sketches.update({
+                TransactionType.EXPENSE: self._expense_dataframe,
+                TransactionType.INCOME: self._income_dataframe,
+            })
+        return self._sketches
+
+    @instrumented("DataAggregate.distribution")
+    def distribution(self,
+                     transaction_types: list[TransactionType | str] | None = None,
+                     categories: list[str] | None = None,
+                     start_date: date | None = None,
+                     end_date: date | None = None) -> AmountSketch:
+        """
+        Summarise the distribution of the amounts.
+
+        Parameters:
+            transaction_types (list[TransactionType | str] | None, optional): Types
+                to include. Defaults to every type.
+            categories (list[str] | None, optional): Categories to include. Defaults
+                to every category.
+            start_date (date | None, optional): First month to include, given by any
+                of its dates. Defaults to None.
+            end_date (date | None, optional): Last month to include, given by any of
+                its dates. Defaults to None.
+
+        Returns:
+            AmountSketch: The merged sketch, answering quantile, histogram, mean and
+                variance queries without reading the amounts again.
+
+        Note:
+            Quantiles are within 1% of the exact ones and dates are rounded to whole
+            months; `get_*_amount_distribution` return the exact amounts.
+        """
+
+        return self.sketches().query(transaction_types=transaction_types,
+                                     categories=categories,
+                                     start_date=start_date,
+                                     end_date=end_date)
+
+    @instrumented("DataAggregate.get_period_totals", documents=len)
+    def get_period_totals(self,
+                          transaction_type: TransactionType | str | None = None,
+                          period: Period | str = Period.MONTHLY,
+                          group_by: str | None = None) -> pd.DataFrame:
+        """
+        Sum the transaction amounts per period.
+
+        Parameters:
+            transaction_type (TransactionType | str | None, optional): Type of the
+                transactions. Defaults to every type.
+            period (Period | str, optional): Length of the periods. Defaults to
+                monthly.
+            group_by (str | None, optional): Split each period by "category" or
+                "transaction_method" too. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The columns `period` (start of the period), `type`, the
+                `group_by` column if any, `amount` and `count`, sorted by period.
+
+        Raises:
+            ValueError: If the period or the grouping column is not supported.
+
+        Note:
+            The totals are read from the daily rollups maintained by MongoDBCrud,
+            so their cost grows with the number of days rather than the number of
+            transactions. The loaded transactions are summed instead for a
+            snapshot, a query on firms or locations, rollups not covering every
+            transaction yet (before the rollups migration is run on an existing
+            database), or, with a cache, when MongoDB is unreachable.
+        """
+
+        if period not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Unsupported period: {period}")
+        if group_by is not None and group_by not in ROLLUP_FIELDS[1:]:
+            raise ValueError(f"Unsupported grouping column: {group_by}")
+
+        daily: pd.DataFrame | None = None
+        if self._mongo_instance is not None and not (
+            self._query is not None and (self._query.firms or self._query.locations)
+        ):
+            try:
+                if self._mongo_instance.rollups_complete():
+                    daily = pd.DataFrame(
+                        self._mongo_instance.get_rollups(transaction_type=transaction_type, # noqa E507
+                                                         query=self._query),
+                        columns=["day", *ROLLUP_FIELDS, "amount", "count"],
+                    ).rename(columns={"day": "date"})
+                else:
+                    get_logger().warn(message="The rollups do not cover every transaction yet, summing the loaded transactions; run the rollups migration") # noqa E507
+            except (MongoDBConnectionError, PyMongoError) as error:
+                if self._cache is None:
+                    raise
+                get_logger().warn(message=f"MongoDB is unreachable, summing the cached transactions: {error}") # noqa E507
+
+        if daily is None:
+            daily = self._daily_transactions(transaction_type)
+
+        keys: list = [
+            pd.Grouper(key="date",
+                       freq=PERIOD_FREQUENCIES[period],
+                       label="left",
+                       closed="left"),
+            "type",
+            *([group_by] if group_by is not None else []),
+        ]
+        daily["date"] = pd.to_datetime(daily["date"])
+
+        return (
+            daily.groupby(keys, observed=True)[["amount", "count"]]
+            .sum()
+            .reset_index()
+            .rename(columns={"date": "period"})
+            .sort_values("period", kind="stable", ignore_index=True)
+        )
+
+    def _daily_transactions(self,
+                            transaction_type: TransactionType | str | None) -> pd.DataFrame: # noqa E507
+        self._synchronize()
+        frames: list[pd.DataFrame] = [
+            frame[["date", *ROLLUP_FIELDS[1:], "amount"]].assign(type=str(frame_type), count=1) # noqa E507
+            for frame_type, frame in ((TransactionType.EXPENSE, self._expense_dataframe), # noqa E507
+                                      (TransactionType.INCOME, self._income_dataframe))
+            if len(frame) and transaction_type in (None, frame_type)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=["date", *ROLLUP_FIELDS, "amount", "count"])
 
-    def distribution(self) -> None:
-        ...
+        return pd.concat(frames, ignore_index=True)
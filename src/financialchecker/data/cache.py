@@ -0,0 +1,282 @@
+import json
+import os
+import re
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from financialchecker.database.mongodb.columnar import (
+    CATEGORICAL_COLUMNS,
+    concat_frames,
+)
+from financialchecker.database.mongodb.models import TransactionQuery
+from financialchecker.log.log import Logger
+from financialchecker.transactions._transactions import TransactionType
+from financialchecker.utils.metrics import instrumented
+from financialchecker.utils.settings import (
+    get_local_cache_settings,
+    get_mongodb_collection,
+    get_mongodb_settings,
+)
+
+
+@lru_cache
+def get_logger() -> Logger:
+    # Created on first use: the logger opens its log file.
+    return Logger(module_name="TransactionCache", package_name="data", database=False)
+
+
+CACHE_SCHEMA_VERSION: int = 2
+MANIFEST: str = "manifest.json"
+SEGMENT_METADATA: str = "segment.json"
+
+
+class TransactionCache:
+    """
+    Local columnar copy of the transaction collection, stored as NumPy column files.
+
+    Note:
+        The cache lives in a directory keyed by server, database, collection and
+        schema version, so changing any of them never reads files of another
+        server or layout. It is made
+        of segments, one per synchronisation, each holding one `.npy` file per column
+        and transaction type: categorical columns are stored as integer codes with
+        their categories in the segment metadata, strings as fixed-width unicode.
+        Files are memory-mapped on load. A JSON manifest lists the segments, the
+        last synchronised id, the number of cached transactions and the generation
+        of the collection they were read at; it is replaced atomically, so an
+        interrupted write leaves the previous state readable. Segments are merged
+        once there are more than `MAX_SEGMENTS`.
+    """
+
+    def __init__(self,
+                 directory: str | Path | None = None,
+                 max_segments: int | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+            directory (str | Path | None, optional): Root directory of the caches.
+                Defaults to the `LocalCache.DIRECTORY` setting.
+            max_segments (int | None, optional): Number of segments above which they
+                are merged. Defaults to the `LocalCache.MAX_SEGMENTS` setting.
+        """
+
+        settings = get_local_cache_settings()
+        mongodb_settings = get_mongodb_settings()
+
+        self.max_segments: int = max_segments or settings.MAX_SEGMENTS
+        key: str = (
+            f"{mongodb_settings.HOSTNAME}_{mongodb_settings.PORT}"
+            f".{mongodb_settings.DATABASE}.{get_mongodb_collection().Transaction}"
+            f".v{CACHE_SCHEMA_VERSION}"
+        )
+        self.path: Path = Path(directory or settings.DIRECTORY).expanduser().joinpath(
+            re.sub(r"[^\w.-]", "_", key)
+        )
+
+    def state(self) -> dict | None:
+        """
+        Describe what the cache holds.
+
+        Returns:
+            dict | None: The `last_id` synchronised, the number of cached `rows`
+                and the `generation` of the collection they were read at, or None
+                when there is no usable cache.
+        """
+
+        manifest: dict | None = self._read_manifest()
+        if manifest is None:
+            return None
+        return {key: manifest[key] for key in ("last_id", "rows", "generation")}
+
+    @instrumented("TransactionCache.load")
+    def load(self) -> tuple[dict[str, pd.DataFrame], str | None] | None:
+        """
+        Load the cached transactions.
+
+        Returns:
+            tuple[dict[str, pd.DataFrame], str | None] | None: The DataFrames keyed by
+                transaction type and the last synchronised id, or None when there is
+                no usable cache.
+        """
+
+        manifest: dict | None = self._read_manifest()
+        if manifest is None:
+            return None
+
+        try:
+            segments: list[dict[str, pd.DataFrame]] = [
+                self._read_segment(self.path.joinpath(segment))
+                for segment in manifest["segments"]
+            ]
+        except (OSError, ValueError, KeyError) as error:
+            get_logger().warn(message=f"Ignoring unreadable transaction cache {self.path}: {error}") # noqa E507
+            return None
+
+        return {
+            transaction_type: concat_frames([segment[transaction_type] for segment in segments]) # noqa E507
+            for transaction_type in TransactionType.list()
+        }, manifest["last_id"]
+
+    @instrumented("TransactionCache.append")
+    def append(self,
+               frames: dict[str, pd.DataFrame],
+               last_id: str | None,
+               generation: int = 0) -> None:
+        """
+        Store newly synchronised transactions.
+
+        Parameters:
+            frames (dict[str, pd.DataFrame]): The new transactions keyed by type.
+            last_id (str | None): The highest id synchronised so far.
+            generation (int, optional): Generation of the collection the cached
+                transactions were read at. Defaults to 0.
+        """
+
+        manifest: dict = self._read_manifest() or {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "segments": [],
+            "last_id": None,
+            "rows": 0,
+        }
+
+        rows: int = sum(len(frame) for frame in frames.values())
+        if rows:
+            segment: str = uuid.uuid4().hex
+            self._write_segment(self.path.joinpath(segment), frames)
+            manifest["segments"].append(segment)
+        manifest["last_id"] = last_id
+        manifest["rows"] += rows
+        manifest["generation"] = generation
+
+        self._write_manifest(manifest)
+
+        if len(manifest["segments"]) > self.max_segments:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Merge every segment into a single one.
+        """
+
+        loaded = self.load()
+        manifest: dict | None = self._read_manifest()
+        if loaded is None or manifest is None:
+            return
+
+        segment: str = uuid.uuid4().hex
+        self._write_segment(self.path.joinpath(segment), loaded[0])
+        self._write_manifest({**manifest, "segments": [segment]})
+
+        for old_segment in manifest["segments"]:
+            shutil.rmtree(self.path.joinpath(old_segment), ignore_errors=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _read_manifest(self) -> dict | None:
+        try:
+            manifest: dict = json.loads(self.path.joinpath(MANIFEST).read_text())
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get("schema_version") != CACHE_SCHEMA_VERSION:
+            return None
+        return manifest
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temporary: Path = self.path.joinpath(f"{MANIFEST}.{uuid.uuid4().hex}")
+        temporary.write_text(json.dumps(manifest))
+        os.replace(temporary, self.path.joinpath(MANIFEST))
+
+    @staticmethod
+    def _write_segment(path: Path, frames: dict[str, pd.DataFrame]) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        metadata: dict[str, dict] = {}
+
+        for transaction_type, frame in frames.items():
+            columns: dict[str, dict] = {}
+
+            for column in frame.columns:
+                values: pd.Series = frame[column]
+                if column in CATEGORICAL_COLUMNS:
+                    values = values.astype("category")
+                    array: np.ndarray = values.cat.codes.to_numpy()
+                    columns[column] = {
+                        "kind": "categorical",
+                        "categories": [str(category) for category in values.cat.categories], # noqa E507
+                    }
+                elif values.dtype == object:
+                    array: np.ndarray = values.fillna("").astype(str).to_numpy(dtype=str) # noqa E507
+                    columns[column] = {"kind": "string"}
+                else:
+                    array: np.ndarray = values.to_numpy()
+                    columns[column] = {"kind": "array"}
+
+                np.save(path.joinpath(f"{transaction_type}.{column}.npy"), array, allow_pickle=False) # noqa E507
+
+            metadata[transaction_type] = {"rows": len(frame), "columns": columns}
+
+        path.joinpath(SEGMENT_METADATA).write_text(json.dumps(metadata))
+
+    @staticmethod
+    def _read_segment(path: Path) -> dict[str, pd.DataFrame]:
+        metadata: dict[str, dict] = json.loads(path.joinpath(SEGMENT_METADATA).read_text()) # noqa E507
+        frames: dict[str, pd.DataFrame] = {}
+
+        for transaction_type in TransactionType.list():
+            data: dict = {}
+
+            for column, description in metadata.get(transaction_type, {"columns": {}})["columns"].items(): # noqa E507
+                array: np.ndarray = np.load(path.joinpath(f"{transaction_type}.{column}.npy"), # noqa E507
+                                            mmap_mode="r",
+                                            allow_pickle=False)
+                match description["kind"]:
+                    case "categorical":
+                        data[column] = pd.Categorical.from_codes(array, description["categories"]) # noqa E507
+                    case "string":
+                        data[column] = array.astype(object)
+                    case _:
+                        data[column] = array
+
+            frames[transaction_type] = pd.DataFrame(data, copy=False) if data else pd.DataFrame() # noqa E507
+
+        return frames
+
+
+def filter_frame(frame: pd.DataFrame,
+                 query: TransactionQuery | None) -> pd.DataFrame:
+    """
+    Apply a TransactionQuery to a transaction DataFrame in memory.
+
+    Parameters:
+        frame (pd.DataFrame): The transactions.
+        query (TransactionQuery | None): The filters; None keeps every row.
+
+    Returns:
+        pd.DataFrame: The matching transactions.
+    """
+
+    if query is None or not len(frame):
+        return frame
+
+    mask: pd.Series = pd.Series(True, index=frame.index)
+    if query.start_date is not None:
+        mask &= frame["date"] >= pd.Timestamp(query.start_date)
+    if query.end_date is not None:
+        mask &= frame["date"] <= pd.Timestamp(query.end_date)
+
+    for column, values in (("category", query.categories),
+                           ("transaction_method", query.transaction_methods),
+                           ("firm", query.firms),
+                           ("location", query.locations)):
+        if len(values):
+            mask &= frame[column].isin(values) if column in frame else False
+
+    return frame if mask.all() else frame.loc[mask].reset_index(drop=True)
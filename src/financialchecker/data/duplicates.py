@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from financialchecker.database.mongodb.fingerprints import FINGERPRINT_FIELDS
+
+REPORT_COLUMNS: list[str] = [
+    "group",
+    "copies",
+    "id",
+    "type",
+    "date",
+    "amount",
+    "transaction_method",
+    "category",
+    "firm",
+    "location",
+    "description",
+]
+
+
+def duplicate_report(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Find the groups of identical transactions among loaded transactions.
+
+    Parameters:
+        frames (dict[str, pd.DataFrame]): Per transaction type, the transactions as
+            returned by `MongoDBCrud.get_transaction_frames`.
+
+    Returns:
+        pd.DataFrame: One row per transaction having at least one identical copy,
+            with the `group` of identical transactions it belongs to and the number
+            of `copies` in the group. Groups are numbered in the order of their
+            oldest transaction, which comes first.
+
+    Note:
+        Transactions are identical when their fingerprint fields are: the type, the
+        day, the amount in cents, the payment method and the case- and
+        space-normalized firm and description, as for `transaction_fingerprint`.
+        The key columns are normalized and grouped with vectorized pandas
+        operations, without hashing each transaction in Python.
+    """
+
+    transactions: list[pd.DataFrame] = [frame for frame in frames.values() if len(frame)] # noqa E507
+    if not transactions:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    frame: pd.DataFrame = pd.concat(transactions, ignore_index=True)
+    for column in REPORT_COLUMNS[2:]:
+        if column not in frame:
+            frame[column] = ""
+
+    keys: pd.DataFrame = pd.DataFrame({
+        "type": frame["type"].astype("object"),
+        "date": frame["date"].dt.normalize(),
+        "amount": np.round(frame["amount"].to_numpy() * 100).astype(np.int64),
+        "transaction_method": frame["transaction_method"].astype("object"),
+        "firm": _normalize(frame["firm"]),
+        "description": _normalize(frame["description"]),
+    })
+    assert tuple(keys.columns) == FINGERPRINT_FIELDS
+
+    groups: pd.Series = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup() # noqa E507
+    copies: pd.Series = groups.map(groups.value_counts())
+    duplicated: pd.Series = copies > 1
+
+    report: pd.DataFrame = frame.loc[duplicated, REPORT_COLUMNS[2:]].assign(
+        group=groups[duplicated],
+        copies=copies[duplicated],
+    )
+    # Number the groups in the order of their oldest transaction.
+    report = report.assign(
+        first_id=report.groupby("group")["id"].transform("min"),
+    ).sort_values(["first_id", "id"], ignore_index=True)
+    report["group"] = pd.factorize(report["group"])[0]
+
+    return report[REPORT_COLUMNS]
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    # Same normalization as `normalize_text`, applied to the whole column.
+    return (
+        values.astype("object").fillna("").astype("string")
+        .str.casefold()
+        .str.split()
+        .str.join(" ")
+    )
@@ -1,49 +1,102 @@
 from datetime import date
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 from financialchecker.data.aggregate import DataAggregate
-from financialchecker.utils.utils import EnhancedStrEnum
+from financialchecker.data.periods import PERIOD_FREQUENCIES, Period
+from financialchecker.data.snapshot import TransactionSnapshot
+from financialchecker.database.mongodb.database import MongoDBCrud
+from financialchecker.database.mongodb.models import TransactionQuery
+from financialchecker.database.mongodb.pipelines import GROUPING_FIELDS
+from financialchecker.transactions._transactions import TransactionType
+from financialchecker.utils.metrics import instrumented
 
 
-class Period(EnhancedStrEnum):
-    DAILY: str = "daily"
-    WEEKLY: str = "weekly"
-    MONTHLY: str = "monthly"
-    YEARLY: str = "yearly"
+RATE_TABLE_COLUMNS: list[str] = ["type", "period", "dimension", "value", "rate"]
 
 
 class Estimator:
+    @instrumented("Estimator.__init__")
     def __init__(self,
                  start_date: date | None = None,
-                 end_date: date | None = None) -> None:
+                 end_date: date | None = None,
+                 server_side: bool = False,
+                 snapshot: TransactionSnapshot | None = None,
+                 seed: int | None = None,
+                 mongo_instance: MongoDBCrud | None = None) -> None:
+        """
+        Estimate income and expense rates over a date window.
+
+        Parameters:
+            start_date (date | None, optional): Beginning of the window. Defaults to
+                the first expense.
+            end_date (date | None, optional): End of the window. Defaults to the last
+                expense.
+            server_side (bool, optional): When True expenses are summed per day by
+                MongoDB and only the daily buckets are transferred, instead of
+                loading every expense into pandas. Defaults to False.
+            snapshot (TransactionSnapshot | None, optional): Already loaded
+                transactions to estimate from, restricted to the date window without
+                copying; the database is then never queried. Defaults to None.
+            seed (int | None, optional): Seed of the resampling done by the
+                stochastic rates. Defaults to None.
+            mongo_instance (MongoDBCrud | None, optional): The CRUD operations to
+                read the transactions with. Defaults to a new MongoDBCrud on the
+                shared MongoDB instance.
+        """
+
         assert isinstance(start_date, date | None)
         assert isinstance(end_date, date | None)
-        self.aggregator: DataAggregate = DataAggregate()
-
-        self._income_df: pd.DataFrame = self.aggregator.get_income_dataframe()
-        self._expense_df: pd.DataFrame = self.aggregator.get_expense_dataframe()
-
-        if start_date is not None:
-            if len(self._income_df):
-                self._income_df = self._income_df[self._income_df["date"] >= start_date.strftime("%Y-%m-%d")] # noqa E507
-            if len(self._expense_df):
-                self._expense_df = self._expense_df[self._expense_df["date"] >= start_date.strftime("%Y-%m-%d")] # noqa E507
-        elif end_date is not None:
-            if len(self._income_df):
-                self._income_df = self._income_df[self._income_df["date"] <= end_date.strftime("%Y-%m-%d")] # noqa E507
-            if len(self._expense_df):
-                self._expense_df = self._expense_df[self._expense_df["date"] <= end_date.strftime("%Y-%m-%d")] # noqa E507
+        assert not (server_side and snapshot is not None)
+        query: TransactionQuery = TransactionQuery(start_date=start_date,
+                                                   end_date=end_date)
+        self._server_side: bool = server_side
+        self._query: TransactionQuery = query
+        self._generator: np.random.Generator = np.random.default_rng(seed)
+
+        if server_side:
+            self.aggregator: DataAggregate | None = None
+            self._mongo_instance: MongoDBCrud = mongo_instance or MongoDBCrud()
+
+            self._income_df: pd.DataFrame = self._mongo_instance.get_transaction_frames( # noqa E507
+                transaction_type=TransactionType.INCOME,
+                query=query,
+            )[TransactionType.INCOME]
+            self._expense_df: pd.DataFrame | None = None
+            self._daily_expense_totals: pd.DataFrame = pd.DataFrame(
+                self._mongo_instance.get_period_totals(
+                    transaction_type=TransactionType.EXPENSE,
+                    period=Period.DAILY,
+                    query=query,
+                ),
+                columns=["period", "amount", "count"],
+            )
+            expense_dates: pd.Series = self._daily_expense_totals["period"]
+        else:
+            if snapshot is not None:
+                self.aggregator: DataAggregate | None = DataAggregate(
+                    snapshot=snapshot.window(start_date=start_date, end_date=end_date)
+                )
+            else:
+                self.aggregator: DataAggregate | None = DataAggregate(query=query,
+                                                                      mongo_instance=mongo_instance) # noqa E507
+
+            self._income_df: pd.DataFrame = self.aggregator.get_income_dataframe()
+            self._expense_df: pd.DataFrame | None = self.aggregator.get_expense_dataframe() # noqa E507
+            expense_dates: pd.Series = self._expense_df["date"]
 
         if isinstance(start_date, date):
             self._start_date_expense: date = start_date
         else:
-            self._start_date_expense: date = self._expense_df["date"].min()
+            self._start_date_expense: date = expense_dates.min()
 
         if isinstance(end_date, date):
             self._end_date_expense: date = end_date
         else:
-            self._end_date_expense: date = self._expense_df["date"].max()
+            self._end_date_expense: date = expense_dates.max()
 
     def get_start_date_expense(self) -> date:
         return self._start_date_expense
@@ -51,13 +104,61 @@ class Estimator:
     def get_end_date_expense(self) -> date:
         return self._end_date_expense
 
+    @instrumented("Estimator.daily_flows")
+    def daily_flows(self) -> pd.DataFrame:
+        """
+        Get the income and expense totals of every calendar day of the window.
+
+        Returns:
+            pd.DataFrame: One row per day, indexed by date, with one column per
+                transaction type; days without transactions are zero.
+        """
+
+        days: pd.DatetimeIndex = self._window_days()
+        flows: pd.DataFrame = pd.DataFrame(0.0, index=days, columns=TransactionType.list()) # noqa E507
+
+        for transaction_type in TransactionType.list():
+            daily: pd.DataFrame | None = self._daily_totals(transaction_type, None)
+            if daily is not None:
+                flows[transaction_type] = daily[""].reindex(days, fill_value=0.0)
+
+        return flows
+
+    def _window_days(self) -> pd.DatetimeIndex:
+        if pd.isna(self._start_date_expense) or pd.isna(self._end_date_expense):
+            return pd.DatetimeIndex([], name="date")
+        return pd.date_range(pd.Timestamp(self._start_date_expense),
+                             pd.Timestamp(self._end_date_expense),
+                             freq="D",
+                             name="date")
+
+    def _daily_change(self, transaction_type: str, stochastic: bool) -> float:
+        # The income rate sums the changes between consecutive incomes over the
+        # window, the expense rate averages the totals of the days with expenses.
+        # The stochastic rate computes the same statistic on one resample, with
+        # replacement, of those changes or totals.
+        if transaction_type == TransactionType.INCOME:
+            samples: pd.Series = self._income_df["amount"].diff().dropna()
+        elif self._server_side:
+            samples: pd.Series = self._daily_expense_totals["amount"]
+        else:
+            samples: pd.Series = self._expense_df.groupby(by="date")["amount"].sum()
+
+        if stochastic:
+            samples = samples.sample(frac=1.0, replace=True, random_state=self._generator) # noqa E507
+
+        if transaction_type == TransactionType.INCOME:
+            return samples.sum() / self._days_difference_expense()
+        return samples.mean()
+
     def _days_difference_expense(self,):
-        return (self._end_date_expense - self._start_date_expense).days
+        return (pd.Timestamp(self._end_date_expense) - pd.Timestamp(self._start_date_expense)).days # noqa E507
 
+    @instrumented("Estimator.income_rate_of_change")
     def income_rate_of_change(self,
                               stochastic: bool = False,
                               period: str = "daily") -> float:
-        daily_change: float = self._income_df["amount"].diff().sum() / self._days_difference_expense() # noqa E507
+        daily_change: float = self._daily_change(TransactionType.INCOME, stochastic)
         match period:
             case Period.DAILY:
                 return daily_change
@@ -70,11 +171,12 @@ class Estimator:
             case _:
                 return 0.0
 
+    @instrumented("Estimator.expense_rate_of_change")
     def expense_rate_of_change(self,
                                stochastic: bool = False,
                                period: str = "daily") -> float:
 
-        daily_change: float = self._expense_df[["date", "amount"]].groupby(by=["date"]).sum().mean() # noqa E507
+        daily_change: float = self._daily_change(TransactionType.EXPENSE, stochastic)
         match period:
             case Period.DAILY:
                 return daily_change
@@ -86,3 +188,131 @@ class Estimator:
                 return daily_change * 360
             case _:
                 return 0.0
+
+    @instrumented("Estimator.rate_table")
+    def rate_table(self,
+                   group_by: Iterable[str] = ("category", "transaction_method"),
+                   periods: Iterable[Period | str] | None = None,
+                   rolling: int | None = None) -> pd.DataFrame:
+        """
+        Compute the income and expense rates of every period and group at once.
+
+        Parameters:
+            group_by (Iterable[str], optional): Columns to split the rates by, among
+                `GROUPING_FIELDS`. The overall rates are always included, with
+                dimension "all". Defaults to ("category", "transaction_method").
+            periods (Iterable[Period | str] | None, optional): Periods to compute.
+                Defaults to every `Period`.
+            rolling (int | None, optional): When given, the rate of every calendar
+                period in the window is reported as the mean of the last `rolling`
+                periods instead of a single mean over the window. Defaults to None.
+
+        Returns:
+            pd.DataFrame: One row per type, period, dimension and value, with the
+                columns type, period, dimension, value and rate, plus date (the
+                start of the period) when `rolling` is given.
+
+        Note:
+            Rates are the mean total per calendar period (weeks starting on Monday,
+            calendar months and years), periods without transactions counting as
+            zero. Periods only partly inside the window are weighted by the share
+            of their days it covers, so a window starting mid-week does not
+            understate the weekly rate. Each dimension is grouped once into a
+            day-by-value matrix, which is then resampled for every period, so no
+            group is filtered on its own.
+        """
+
+        group_by = tuple(group_by)
+        periods = tuple(Period.list() if periods is None else periods)
+        assert all(dimension in GROUPING_FIELDS for dimension in group_by)
+        assert all(Period.has(period) for period in periods)
+        assert rolling is None or rolling > 0
+
+        columns: list[str] = RATE_TABLE_COLUMNS + (["date"] if rolling else [])
+        if pd.isna(self._start_date_expense) or pd.isna(self._end_date_expense):
+            return pd.DataFrame(columns=columns)
+
+        days: pd.DatetimeIndex = self._window_days()
+        tables: list[pd.DataFrame] = []
+
+        for transaction_type in TransactionType.list():
+            for dimension in (None, *group_by):
+                daily: pd.DataFrame | None = self._daily_totals(transaction_type, dimension) # noqa E507
+                if daily is None:
+                    continue
+
+                daily = daily.reindex(days, fill_value=0.0)
+                for period in periods:
+                    table: pd.DataFrame = self._period_rates(daily, period, rolling)
+                    table.insert(0, "type", str(transaction_type))
+                    table.insert(1, "period", str(period))
+                    table.insert(2, "dimension", dimension or "all")
+                    tables.append(table)
+
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(tables, ignore_index=True)[columns]
+
+    def _daily_totals(self,
+                      transaction_type: str,
+                      dimension: str | None) -> pd.DataFrame | None:
+        # Day-by-value matrix of the summed amounts, a single "" column when the
+        # totals are not split.
+        if self._server_side and transaction_type == TransactionType.EXPENSE:
+            if dimension is None:
+                totals: pd.DataFrame = self._daily_expense_totals.assign(group="")
+            else:
+                totals: pd.DataFrame = pd.DataFrame(
+                    self._mongo_instance.get_period_totals(
+                        transaction_type=TransactionType.EXPENSE,
+                        period=Period.DAILY,
+                        group_by=dimension,
+                        query=self._query,
+                    ),
+                    columns=["period", dimension, "amount", "count"],
+                ).rename(columns={dimension: "group"})
+            if not len(totals):
+                return None
+            daily: pd.DataFrame = totals.pivot_table(index="period",
+                                                     columns="group",
+                                                     values="amount",
+                                                     aggfunc="sum",
+                                                     fill_value=0.0)
+            daily.columns = daily.columns.astype(str)
+            return daily
+
+        frame: pd.DataFrame = self._expense_df if transaction_type == TransactionType.EXPENSE else self._income_df # noqa E507
+        if not len(frame) or (dimension is not None and dimension not in frame):
+            return None
+
+        if dimension is None:
+            return frame.groupby("date")["amount"].sum().to_frame("")
+
+        daily: pd.DataFrame = frame.groupby([dimension, "date"], observed=True)["amount"].sum().unstack(dimension, fill_value=0.0) # noqa E507
+        daily.columns = daily.columns.astype(str)
+        return daily
+
+    @staticmethod
+    def _period_rates(daily: pd.DataFrame,
+                      period: str,
+                      rolling: int | None) -> pd.DataFrame:
+        # `daily` has a row for every day of the window, so the rows of a bucket
+        # are the days of the calendar period that the window covers.
+        frequency: str = PERIOD_FREQUENCIES[period]
+        resampler = daily.resample(frequency, label="left", closed="left")
+        buckets: pd.DataFrame = resampler.sum()
+        period_days: np.ndarray = ((buckets.index + to_offset(frequency)) - buckets.index).days.to_numpy() # noqa E507
+        coverage: pd.Series = pd.Series(resampler.size().to_numpy() / period_days,
+                                        index=buckets.index)
+
+        if rolling is None:
+            rates: pd.Series = buckets.sum() / coverage.sum()
+            return pd.DataFrame({"value": rates.index.astype(str),
+                                 "rate": rates.to_numpy()})
+
+        rates: pd.DataFrame = buckets.rolling(rolling, min_periods=1).sum().div(
+            coverage.rolling(rolling, min_periods=1).sum(), axis=0
+        )
+        rates.index.name = "date"
+        rates.columns.name = "value"
+        return rates.stack().rename("rate").reset_index()
@@ -1,6 +1,195 @@
-from financialchecker.database.mongodb.database import MongoDBCrud
+import argparse
+import csv
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from financialchecker.database.mongodb.models import BatchInsertResult
+from financialchecker.log.log import Logger
+from financialchecker.transactions._transactions import Transaction, TransactionType
+from financialchecker.transactions.expense import Expense
+from financialchecker.transactions.income import Income
+from financialchecker.utils.metrics import configure_metrics
+
+
+@lru_cache
+def get_logger() -> Logger:
+    # Created on first use: the logger opens its log file.
+    return Logger(module_name="DataLoader", package_name="data", database=False)
+
+
+STATEMENT_COLUMNS: tuple[str, ...] = (
+    "type",
+    "date",
+    "amount",
+    "transaction_method",
+    "category",
+    "description",
+    "advance_payment",
+    "firm",
+    "location",
+)
+
+
+def read_statement(path: str | Path,
+                   columns: dict[str, str] | None = None,
+                   date_format: str = "%Y-%m-%d",
+                   delimiter: str = ",",
+                   default_method: str = "",
+                   default_category: str = "") -> Iterator[Transaction]:
+    """
+    Stream the rows of a CSV bank statement as `Expense` and `Income` objects.
+
+    Parameters:
+        path (str | Path): The CSV file, with a header row.
+        columns (dict[str, str] | None, optional): Header of the CSV column holding
+            each field of `STATEMENT_COLUMNS`; unmapped fields are read from the
+            column named after the field. Defaults to None.
+        date_format (str, optional): Format of the dates. Defaults to "%Y-%m-%d".
+        delimiter (str, optional): The CSV delimiter. Defaults to ",".
+        default_method (str, optional): Payment method used when the statement has
+            none. Defaults to "".
+        default_category (str, optional): Category used when the statement has none.
+            Defaults to "".
+
+    Returns:
+        Iterator[Transaction]: The parsed transactions. Rows without a `type` are
+            expenses when their amount is negative and incomes otherwise; rows that
+            cannot be parsed are logged and skipped.
+
+    Note:
+        The file is read one row at a time, so memory does not grow with the size of
+        the statement.
+    """
+
+    headers: dict[str, str] = {field: field for field in STATEMENT_COLUMNS}
+    headers.update(columns or {})
+
+    with open(path, newline="", encoding="utf-8") as statement:
+        for line, row in enumerate(csv.DictReader(statement, delimiter=delimiter), start=2): # noqa E507
+            fields: dict[str, str] = {
+                field: (row.get(header) or "").strip() for field, header in headers.items() # noqa E507
+            }
+
+            try:
+                amount: float = float(fields["amount"])
+                transaction_type: str = fields["type"].upper() or (
+                    TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+                )
+                transaction_date = datetime.strptime(fields["date"], date_format).date() # noqa E507
+
+                match transaction_type:
+                    case TransactionType.EXPENSE:
+                        yield Expense(
+                            transaction_category=fields["category"] or default_category,
+                            transaction_amount=abs(amount),
+                            transaction_method=fields["transaction_method"] or default_method, # noqa E507
+                            transaction_date=transaction_date,
+                            transaction_advance_payment=fields["advance_payment"].lower() in ("1", "true", "yes"), # noqa E507
+                            transaction_description=fields["description"],
+                            transaction_firm=fields["firm"],
+                            transaction_location=fields["location"],
+                        )
+                    case TransactionType.INCOME:
+                        yield Income(
+                            transaction_category=fields["category"] or default_category,
+                            transaction_amount=abs(amount),
+                            transaction_method=fields["transaction_method"] or default_method, # noqa E507
+                            transaction_date=transaction_date,
+                            transaction_description=fields["description"],
+                        )
+                    case _:
+                        raise ValueError(f"unknown transaction type {transaction_type}") # noqa E507
+            except (AssertionError, ValueError) as error:
+                get_logger().error(message=f"{path}:{line} skipped: {error or 'invalid row'}") # noqa E507
 
 
 class DataLoader:
     def __init__(self) -> None:
-        self._mongo_instance = MongoDBCrud()
\ No newline at end of file
+        # Imported here so that the command line parses its arguments without
+        # loading the database driver.
+        from financialchecker.database.mongodb.database import MongoDBCrud
+
+        self._mongo_instance = MongoDBCrud()
+
+    def import_statement(self,
+                         path: str | Path,
+                         batch_size: int = 1000,
+                         **kwargs) -> list[BatchInsertResult]:
+        """
+        Import a CSV bank statement, writing its transactions in batches.
+
+        Parameters:
+            path (str | Path): The CSV file.
+            batch_size (int, optional): Number of transactions per insert. Defaults
+                to 1000.
+            **kwargs: Parsing options forwarded to `read_statement`.
+
+        Returns:
+            list[BatchInsertResult]: The outcome of every batch.
+
+        Note:
+            Transactions already stored, for instance from an overlapping
+            statement, are skipped, so importing a statement again is harmless.
+        """
+
+        return self._mongo_instance.add_transactions(
+            read_statement(path, **kwargs),
+            batch_size=batch_size,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser("Financial Checker Importer")
+    parser.add_argument("files", nargs="+", help="CSV bank statements")
+    parser.add_argument("-b", "--batch-size", type=int, default=1000)
+    parser.add_argument("-d", "--delimiter", type=str, default=",")
+    parser.add_argument("-df",
+                        "--date-format",
+                        type=str,
+                        help="Dates format (%%Y-%%m-%%d)",
+                        default="%Y-%m-%d")
+    parser.add_argument("-m",
+                        "--method",
+                        type=str,
+                        help="Payment method of rows without one",
+                        default="")
+    parser.add_argument("-c",
+                        "--category",
+                        type=str,
+                        help="Category of rows without one",
+                        default="")
+    parser.add_argument("--column",
+                        action="append",
+                        metavar="FIELD=HEADER",
+                        help=f"CSV header of a field ({', '.join(STATEMENT_COLUMNS)})", # noqa E507
+                        default=[])
+    parser.add_argument("--profile",
+                        nargs="?",
+                        const="-",
+                        metavar="FILE",
+                        help="Record operation metrics and write them to FILE (JSON for .json, Prometheus text otherwise) or to stderr", # noqa E507
+                        default=None)
+
+    args = parser.parse_args()
+    configure_metrics(enabled=args.profile is not None, output=args.profile)
+
+    columns: dict[str, str] = dict(mapping.split("=", 1) for mapping in args.column)
+    loader = DataLoader()
+
+    for path in args.files:
+        results = loader.import_statement(path,
+                                          batch_size=args.batch_size,
+                                          columns=columns,
+                                          date_format=args.date_format,
+                                          delimiter=args.delimiter,
+                                          default_method=args.method,
+                                          default_category=args.category)
+        print(f"{path} -> {sum(len(result.inserted_ids) for result in results)} inserted, " # noqa E507
+              f"{sum(result.duplicates for result in results)} duplicates, "
+              f"{sum(len(result.errors) for result in results)} failed")
+
+
+if __name__ == "__main__":
+    main()
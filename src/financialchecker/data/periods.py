@@ -0,0 +1,25 @@
+from financialchecker.utils.utils import EnhancedStrEnum
+
+
+class Period(EnhancedStrEnum):
+    DAILY: str = "daily"
+    WEEKLY: str = "weekly"
+    MONTHLY: str = "monthly"
+    YEARLY: str = "yearly"
+
+
+# Calendar buckets matching the MongoDB period truncations: weeks start on Monday.
+PERIOD_FREQUENCIES: dict[str, str] = {
+    Period.DAILY: "D",
+    Period.WEEKLY: "W-MON",
+    Period.MONTHLY: "MS",
+    Period.YEARLY: "YS",
+}
+
+# Days a daily rate is multiplied by to express it per period.
+PERIOD_DAYS: dict[str, int] = {
+    Period.DAILY: 1,
+    Period.WEEKLY: 7,
+    Period.MONTHLY: 30,
+    Period.YEARLY: 360,
+}
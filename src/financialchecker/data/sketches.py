@@ -0,0 +1,349 @@
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+from financialchecker.transactions._transactions import TransactionType
+
+DEFAULT_RELATIVE_ACCURACY: float = 0.01
+
+# Amounts are validated to be at least 0.01; anything smaller is counted as zero.
+MIN_INDEXABLE_AMOUNT: float = 1e-9
+
+
+@dataclass
+class Moments:
+    """
+    Data class representing the running count, mean and variance of a stream of
+    amounts (Welford's algorithm), mergeable with Chan's parallel formula.
+
+    Attributes:
+        count (int): Number of amounts.
+        mean (float): Mean of the amounts.
+        m2 (float): Sum of the squared deviations from the mean.
+        minimum (float): Smallest amount.
+        maximum (float): Largest amount.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, values: NDArray) -> None:
+        if not len(values):
+            return
+
+        batch_mean: float = float(values.mean())
+        self.merge(Moments(count=len(values),
+                           mean=batch_mean,
+                           m2=float(np.square(values - batch_mean).sum()),
+                           minimum=float(values.min()),
+                           maximum=float(values.max())))
+
+    def merge(self, other: "Moments") -> None:
+        if not other.count:
+            return
+
+        count: int = self.count + other.count
+        delta: float = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a relative accuracy guarantee (DDSketch).
+
+    Parameters:
+        relative_accuracy (float, optional): Maximum relative error of the returned
+            quantiles. Defaults to 1%.
+
+    Note:
+        Amounts are counted in logarithmic buckets `(gamma^(k-1), gamma^k]` with
+        `gamma = (1 + a) / (1 - a)`, so every amount of a bucket is within `a` of its
+        representative value. Amounts between 0.01 and one million fit in about
+        1200 buckets at 1% accuracy, whatever the number of transactions, and two
+        sketches of the same accuracy merge by adding their bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "_bins", "_zero_count")
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        assert 0 < relative_accuracy < 1
+
+        self.relative_accuracy: float = relative_accuracy
+        self._log_gamma: float = math.log1p(2 * relative_accuracy / (1 - relative_accuracy)) # noqa E507
+        self._bins: Counter[int] = Counter()
+        self._zero_count: int = 0
+
+    @property
+    def count(self) -> int:
+        return self._zero_count + sum(self._bins.values())
+
+    def update(self, values: ArrayLike) -> None:
+        values = np.asarray(values, dtype="float64")
+        indexable: NDArray = values > MIN_INDEXABLE_AMOUNT
+        self._zero_count += int(len(values) - np.count_nonzero(indexable))
+
+        keys, counts = np.unique(np.ceil(np.log(values[indexable]) / self._log_gamma).astype(np.int64), # noqa E507
+                                 return_counts=True)
+        self._bins.update(dict(zip(keys.tolist(), counts.tolist())))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if not math.isclose(self.relative_accuracy, other.relative_accuracy):
+            raise ValueError("Only sketches with the same relative accuracy can be merged") # noqa E507
+
+        self._bins.update(other._bins)
+        self._zero_count += other._zero_count
+
+    def buckets(self) -> tuple[NDArray, NDArray]:
+        """
+        Get the non-empty buckets.
+
+        Returns:
+            tuple[NDArray, NDArray]: The representative values, in increasing
+                order, and the number of amounts of each bucket.
+        """
+
+        keys: NDArray = np.fromiter(sorted(self._bins), dtype=np.int64, count=len(self._bins)) # noqa E507
+        counts: NDArray = np.fromiter((self._bins[key] for key in keys.tolist()), dtype=np.int64, count=len(keys)) # noqa E507
+        values: NDArray = 2 * np.exp(keys * self._log_gamma) / (1 + np.exp(self._log_gamma)) # noqa E507
+
+        if self._zero_count:
+            values = np.concatenate([[0.0], values])
+            counts = np.concatenate([[self._zero_count], counts])
+        return values, counts
+
+    def quantiles(self, quantiles: ArrayLike) -> NDArray:
+        quantiles = np.asarray(quantiles, dtype="float64")
+        if not self.count:
+            return np.full(quantiles.shape, np.nan)
+
+        values, counts = self.buckets()
+        cumulative: NDArray = np.cumsum(counts)
+        ranks: NDArray = np.clip(quantiles, 0, 1) * (cumulative[-1] - 1)
+        return values[np.searchsorted(cumulative, ranks, side="right")]
+
+
+@dataclass
+class AmountSketch:
+    """
+    Data class representing the compact summary of a set of amounts: a quantile
+    sketch and its running moments. Sketches merge across categories and months
+    without revisiting the amounts.
+
+    Attributes:
+        quantile_sketch (QuantileSketch): The logarithmic buckets of the amounts.
+        moments (Moments): The count, mean, variance and extremes of the amounts.
+    """
+
+    quantile_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    moments: Moments = field(default_factory=Moments)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    @property
+    def mean(self) -> float:
+        return self.moments.mean if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        return self.moments.std if self.count else math.nan
+
+    def update(self, values: ArrayLike) -> None:
+        values = np.asarray(values, dtype="float64")
+        self.quantile_sketch.update(values)
+        self.moments.update(values)
+
+    def merge(self, other: "AmountSketch") -> None:
+        self.quantile_sketch.merge(other.quantile_sketch)
+        self.moments.merge(other.moments)
+
+    def quantile(self, quantile: float) -> float:
+        return float(self.quantiles([quantile])[0])
+
+    def quantiles(self, quantiles: ArrayLike) -> NDArray:
+        """
+        Estimate quantiles of the amounts.
+
+        Parameters:
+            quantiles (ArrayLike): Quantiles between 0 and 1.
+
+        Returns:
+            NDArray: The estimates, within the relative accuracy of the sketch and
+                clipped to the exact minimum and maximum. NaN when the sketch is
+                empty.
+        """
+
+        estimates: NDArray = self.quantile_sketch.quantiles(quantiles)
+        if not self.count:
+            return estimates
+        return np.clip(estimates, self.moments.minimum, self.moments.maximum)
+
+    def histogram(self,
+                  bins: int | ArrayLike = 20,
+                  range: tuple[float, float] | None = None) -> tuple[NDArray, NDArray]: # noqa E507
+        """
+        Approximate the histogram of the amounts.
+
+        Parameters:
+            bins (int | ArrayLike, optional): Number of equal-width bins or bin
+                edges, as for `np.histogram`. Defaults to 20.
+            range (tuple[float, float] | None, optional): Lower and upper range of
+                the bins. Defaults to the minimum and maximum amounts.
+
+        Returns:
+            tuple[NDArray, NDArray]: The count of each bin and the bin edges.
+
+        Note:
+            Each sketch bucket is counted in the bin of its representative value, so
+            amounts near a bin edge may be counted in the neighbouring bin.
+        """
+
+        if range is None and self.count:
+            range = (self.moments.minimum, self.moments.maximum)
+
+        values, counts = self.quantile_sketch.buckets()
+        values = np.clip(values, *range) if range is not None else values
+        return np.histogram(values, bins=bins, range=range, weights=counts)
+
+    def summary(self,
+                quantiles: Iterable[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> dict[str, float]: # noqa E507
+        quantiles = list(quantiles)
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.moments.minimum if self.count else math.nan,
+            "max": self.moments.maximum if self.count else math.nan,
+            **{f"p{round(quantile * 100):g}": float(value)
+               for quantile, value in zip(quantiles, self.quantiles(quantiles))},
+        }
+
+
+class DistributionSketches:
+    """
+    Amount sketches of the transactions per type, category and month.
+
+    Parameters:
+        relative_accuracy (float, optional): Relative accuracy of the quantile
+            sketches. Defaults to 1%.
+
+    Note:
+        A percentile or histogram over any combination of types, categories and
+        months merges the matching monthly sketches, so its cost depends on the
+        number of categories and months but not on the number of transactions.
+        Date bounds are therefore rounded to whole months.
+    """
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy: float = relative_accuracy
+        self._sketches: dict[tuple[str, str, str], AmountSketch] = {}
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+    def keys(self) -> list[tuple[str, str, str]]:
+        return sorted(self._sketches)
+
+    def update(self, frames: dict[str, pd.DataFrame]) -> None:
+        """
+        Add transactions to the sketches.
+
+        Parameters:
+            frames (dict[str, pd.DataFrame]): Per transaction type, DataFrames with
+                `category`, `date` and `amount` columns.
+        """
+
+        for transaction_type, frame in frames.items():
+            if not len(frame):
+                continue
+
+            # Sort the amounts by (category, month) once and sketch each contiguous
+            # run, rather than iterating over a pandas groupby.
+            category_codes, categories = pd.factorize(frame["category"])
+            month_codes, months = pd.factorize(frame["date"].to_numpy().astype("datetime64[M]")) # noqa E507
+            groups: NDArray = category_codes.astype(np.int64) * len(months) + month_codes # noqa E507
+            order: NDArray = np.argsort(groups, kind="stable")
+            groups = groups[order]
+            amounts: NDArray = frame["amount"].to_numpy(dtype="float64")[order]
+            starts: NDArray = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+            month_names: list[str] = [str(month) for month in months]
+
+            for start, end in zip(starts.tolist(), np.r_[starts[1:], len(groups)].tolist()): # noqa E507
+                category_code, month_code = divmod(int(groups[start]), len(months))
+                key: tuple[str, str, str] = (str(transaction_type),
+                                             str(categories[category_code]),
+                                             month_names[month_code])
+                sketch: AmountSketch | None = self._sketches.get(key)
+                if sketch is None:
+                    sketch = self._sketches[key] = AmountSketch(QuantileSketch(self.relative_accuracy)) # noqa E507
+                sketch.update(amounts[start:end])
+
+    def merge(self, other: "DistributionSketches") -> None:
+        for key, sketch in other._sketches.items():
+            if key in self._sketches:
+                self._sketches[key].merge(sketch)
+            else:
+                self._sketches[key] = AmountSketch(QuantileSketch(self.relative_accuracy)) # noqa E507
+                self._sketches[key].merge(sketch)
+
+    def query(self,
+              transaction_types: Iterable[TransactionType | str] | None = None,
+              categories: Iterable[str] | None = None,
+              start_date: date | None = None,
+              end_date: date | None = None) -> AmountSketch:
+        """
+        Merge the sketches matching the filters.
+
+        Parameters:
+            transaction_types (Iterable[TransactionType | str] | None, optional):
+                Types to include. Defaults to every type.
+            categories (Iterable[str] | None, optional): Categories to include.
+                Defaults to every category.
+            start_date (date | None, optional): Include the months from the one of
+                this date. Defaults to None.
+            end_date (date | None, optional): Include the months up to the one of
+                this date. Defaults to None.
+
+        Returns:
+            AmountSketch: The merged sketch, empty when nothing matches.
+        """
+
+        types: set[str] | None = None if transaction_types is None else {str(transaction_type) for transaction_type in transaction_types} # noqa E507
+        categories = None if categories is None else set(categories)
+        first_month: str | None = None if start_date is None else pd.Timestamp(start_date).strftime("%Y-%m") # noqa E507
+        last_month: str | None = None if end_date is None else pd.Timestamp(end_date).strftime("%Y-%m") # noqa E507
+
+        merged: AmountSketch = AmountSketch(QuantileSketch(self.relative_accuracy))
+        for (transaction_type, category, month), sketch in self._sketches.items():
+            if (
+                (types is None or transaction_type in types)
+                and (categories is None or category in categories)
+                and (first_month is None or month >= first_month)
+                and (last_month is None or month <= last_month)
+            ):
+                merged.merge(sketch)
+        return merged
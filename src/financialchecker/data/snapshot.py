@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from financialchecker.database.mongodb.database import MongoDBCrud
+from financialchecker.database.mongodb.models import TransactionQuery
+from financialchecker.transactions._transactions import TransactionType
+
+
+@dataclass(frozen=True)
+class TransactionSnapshot:
+    """
+    Immutable set of income and expense transactions loaded once and shared by
+    `DataAggregate`, `Estimator` and the dynamics models.
+
+    Attributes:
+        income (pd.DataFrame): The income transactions, sorted by date.
+        expense (pd.DataFrame): The expense transactions, sorted by date.
+
+    Note:
+        Both DataFrames are sorted by date on construction, so a date window is
+        a contiguous range of rows and `window` returns positional slices sharing
+        memory with the snapshot instead of copies. Consumers must treat the
+        DataFrames as read-only.
+    """
+
+    income: pd.DataFrame
+    expense: pd.DataFrame
+
+    def __post_init__(self) -> None:
+        # `window` binary searches the dates, so a snapshot built directly from
+        # unsorted frames would silently return the wrong rows.
+        object.__setattr__(self, "income", _sort_by_date(self.income))
+        object.__setattr__(self, "expense", _sort_by_date(self.expense))
+
+    @classmethod
+    def from_frames(cls,
+                    income: pd.DataFrame,
+                    expense: pd.DataFrame) -> "TransactionSnapshot":
+        return cls(income=income, expense=expense)
+
+    @classmethod
+    def load(cls,
+             query: TransactionQuery | None = None,
+             mongo_instance: MongoDBCrud | None = None) -> "TransactionSnapshot":
+        frames: dict[str, pd.DataFrame] = (mongo_instance or MongoDBCrud()).get_transaction_frames(query=query) # noqa E507
+
+        return cls.from_frames(income=frames[TransactionType.INCOME],
+                               expense=frames[TransactionType.EXPENSE])
+
+    def frame(self, transaction_type: TransactionType | str) -> pd.DataFrame:
+        match transaction_type:
+            case TransactionType.INCOME:
+                return self.income
+            case TransactionType.EXPENSE:
+                return self.expense
+            case _:
+                raise ValueError(f"Unknown transaction type: {transaction_type}")
+
+    def window(self,
+               start_date: date | None = None,
+               end_date: date | None = None) -> "TransactionSnapshot":
+        if start_date is None and end_date is None:
+            return self
+
+        return TransactionSnapshot(income=_date_slice(self.income, start_date, end_date), # noqa E507
+                                   expense=_date_slice(self.expense, start_date, end_date)) # noqa E507
+
+    def __len__(self) -> int:
+        return len(self.income) + len(self.expense)
+
+
+def _sort_by_date(frame: pd.DataFrame) -> pd.DataFrame:
+    if not len(frame) or frame["date"].is_monotonic_increasing:
+        return frame
+    return frame.sort_values("date", kind="stable", ignore_index=True)
+
+
+def _date_slice(frame: pd.DataFrame,
+                start_date: date | None,
+                end_date: date | None) -> pd.DataFrame:
+    if not len(frame):
+        return frame
+
+    dates: np.ndarray = frame["date"].to_numpy()
+    start: int = 0 if start_date is None else int(np.searchsorted(dates, np.datetime64(start_date, "ns"), side="left")) # noqa E507
+    end: int = len(frame) if end_date is None else int(np.searchsorted(dates, np.datetime64(end_date, "ns"), side="right")) # noqa E507
+
+    return frame.iloc[start:end]
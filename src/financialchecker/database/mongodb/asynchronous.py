@@ -0,0 +1,197 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+from bson import ObjectId
+
+from financialchecker.database.mongodb.database import MongoDBCrud, MongoDBInstance
+from financialchecker.database.mongodb.models import (
+    BatchInsertResult,
+    TransactionPage,
+    TransactionQuery,
+)
+from financialchecker.transactions._transactions import Transaction, TransactionType
+from financialchecker.transactions.batch import TransactionBatch
+from financialchecker.utils.settings import get_mongodb_settings
+
+
+class AsyncMongoDBCrud:
+    """
+    Asyncio counterpart of MongoDBCrud exposing the same operations as coroutines.
+
+    Note:
+        Every operation runs the synchronous driver call on a dedicated thread pool,
+        sized after the MongoDB connection pool, so the event loop never blocks and
+        independent queries awaited together (e.g. with `asyncio.gather`) run
+        concurrently over separate pooled connections.
+    """
+
+    def __init__(
+        self,
+        mongodb_instance: MongoDBInstance | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Initialize the asynchronous CRUD operations.
+
+        Parameters:
+            mongodb_instance (MongoDBInstance | None, optional): Object exposing the
+                `database` to operate on, forwarded to MongoDBCrud. Defaults to the
+                process-wide MongoDBInstance; an in-process stand-in can be given for
+                tests.
+            max_workers (int | None, optional): Maximum number of operations running
+                at the same time. Defaults to the `MAX_POOL_SIZE` setting, capped at
+                32.
+        """
+
+        self._crud: MongoDBCrud = MongoDBCrud(mongodb_instance=mongodb_instance)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers or min(32, get_mongodb_settings().MAX_POOL_SIZE),
+            thread_name_prefix="AsyncMongoDBCrud",
+        )
+
+    async def _run(
+        self,
+        function: Callable,
+        *args,
+        **kwargs,
+    ) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(function, *args, **kwargs),
+        )
+
+    async def get_utilities(self, refresh: bool = False) -> dict[str, list[str]]:
+        return await self._run(self._crud.get_utilities, refresh=refresh)
+
+    async def add_utility(self, utility_type: str, value: str) -> None:
+        await self._run(self._crud.add_utility, utility_type, value)
+
+    async def search_utilities(self,
+                               utility_type: str,
+                               prefix: str = "",
+                               limit: int = 10) -> list[str]:
+        return await self._run(self._crud.search_utilities,
+                               utility_type,
+                               prefix=prefix,
+                               limit=limit)
+
+    async def get_categories(self) -> list[str]:
+        return await self._run(self._crud.get_categories)
+
+    async def get_income_categories(self) -> list[str]:
+        return await self._run(self._crud.get_income_categories)
+
+    async def get_payment_methods(self) -> list[str]:
+        return await self._run(self._crud.get_payment_methods)
+
+    async def get_firms(self) -> list[str]:
+        return await self._run(self._crud.get_firms)
+
+    async def get_locations(self) -> list[str]:
+        return await self._run(self._crud.get_locations)
+
+    async def find_duplicate_transaction(self, transaction: Transaction) -> ObjectId | None: # noqa E507
+        return await self._run(self._crud.find_duplicate_transaction, transaction)
+
+    async def add_transaction(self,
+                              transaction: Transaction,
+                              deduplicate: bool = True) -> ObjectId:
+        return await self._run(self._crud.add_transaction,
+                               transaction,
+                               deduplicate=deduplicate)
+
+    async def add_transactions(self,
+                               transactions: Iterable[Transaction] | TransactionBatch,
+                               batch_size: int = 1000,
+                               deduplicate: bool = True) -> list[BatchInsertResult]:
+        return await self._run(self._crud.add_transactions,
+                               transactions,
+                               batch_size=batch_size,
+                               deduplicate=deduplicate)
+
+    async def get_all_transactions(self,
+                                   transaction_type: str | None = None,
+                                   after_id: str | None = None,
+                                   query: TransactionQuery | None = None) -> list[dict]: # noqa E507
+        return await self._run(self._crud.get_all_transactions,
+                               transaction_type=transaction_type,
+                               after_id=after_id,
+                               query=query)
+
+    async def get_transaction_frames(self,
+                                     transaction_type: str | None = None,
+                                     after_id: str | None = None,
+                                     query: TransactionQuery | None = None,
+                                     batch_size: int = 1000) -> dict[str, pd.DataFrame]: # noqa E507
+        if transaction_type is not None:
+            return await self._run(self._crud.get_transaction_frames,
+                                   transaction_type=transaction_type,
+                                   after_id=after_id,
+                                   query=query,
+                                   batch_size=batch_size)
+
+        # Income and expenses are loaded by two concurrent queries.
+        frames: list[dict[str, pd.DataFrame]] = await asyncio.gather(*(
+            self._run(self._crud.get_transaction_frames,
+                      transaction_type=_type,
+                      after_id=after_id,
+                      query=query,
+                      batch_size=batch_size)
+            for _type in TransactionType.list()
+        ))
+
+        return {_type: _frames[_type] for _type, _frames in zip(TransactionType.list(), frames)} # noqa E507
+
+    async def get_period_totals(self,
+                                transaction_type: str | None = None,
+                                period: str = "daily",
+                                group_by: str | None = None,
+                                query: TransactionQuery | None = None) -> list[dict]:
+        return await self._run(self._crud.get_period_totals,
+                               transaction_type=transaction_type,
+                               period=period,
+                               group_by=group_by,
+                               query=query)
+
+    async def get_transaction_page(self,
+                                   transaction_type: str | None = None,
+                                   query: TransactionQuery | None = None,
+                                   cursor: str | None = None,
+                                   page_size: int = 50,
+                                   descending: bool = True) -> TransactionPage:
+        return await self._run(self._crud.get_transaction_page,
+                               transaction_type=transaction_type,
+                               query=query,
+                               cursor=cursor,
+                               page_size=page_size,
+                               descending=descending)
+
+    async def search_transactions(self,
+                                  text: str,
+                                  transaction_type: str | None = None,
+                                  query: TransactionQuery | None = None,
+                                  limit: int = 50) -> list[dict]:
+        return await self._run(self._crud.search_transactions,
+                               text,
+                               transaction_type=transaction_type,
+                               query=query,
+                               limit=limit)
+
+    async def get_rollups(self,
+                          transaction_type: str | None = None,
+                          query: TransactionQuery | None = None) -> list[dict]:
+        return await self._run(self._crud.get_rollups,
+                               transaction_type=transaction_type,
+                               query=query)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncMongoDBCrud":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,206 @@
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+from bson import decode_all
+from pandas.api.types import union_categoricals
+
+from financialchecker.transactions._transactions import TransactionType
+
+TRANSACTION_COLUMNS: dict[str, tuple[str, ...]] = {
+    TransactionType.EXPENSE: (
+        "id",
+        "type",
+        "amount",
+        "transaction_method",
+        "date",
+        "description",
+        "category",
+        "advance_payment",
+        "firm",
+        "location",
+    ),
+    TransactionType.INCOME: (
+        "id",
+        "type",
+        "amount",
+        "transaction_method",
+        "date",
+        "description",
+        "category",
+    ),
+}
+
+COLUMN_SOURCES: dict[str, tuple[str, Any]] = {
+    "id": ("_id", ""),
+    "amount": ("amount", np.nan),
+    "date": ("date", None),
+    "advance_payment": ("advance_payment", False),
+}
+
+CATEGORICAL_COLUMNS: tuple[str, ...] = (
+    "type",
+    "transaction_method",
+    "category",
+    "firm",
+    "location",
+)
+
+
+class TransactionColumns:
+    """
+    Column-oriented accumulator turning raw BSON batches of transactions into typed
+    pandas DataFrames, one per transaction type.
+
+    Note:
+        Documents are decoded one batch at a time and their fields are pushed into
+        per-column lists straight away, so at most one batch of documents is alive as
+        Python dictionaries while the cursor is drained.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self._columns: dict[str, dict[str, list]] = {
+            transaction_type: {column: [] for column in columns}
+            for transaction_type, columns in TRANSACTION_COLUMNS.items()
+        }
+        self._appenders: dict[str, list[tuple[Callable, str, Any]]] = {
+            transaction_type: [
+                (values.append, *COLUMN_SOURCES.get(column, (column, "")))
+                for column, values in columns.items()
+            ]
+            for transaction_type, columns in self._columns.items()
+        }
+
+    def extend_raw_batch(
+        self,
+        batch: bytes,
+    ) -> None:
+        """
+        Decode a raw BSON batch and append its documents to the columns.
+
+        Parameters:
+            batch (bytes): A batch as returned by `find_raw_batches`.
+        """
+
+        for document in decode_all(batch):
+            self.append(document)
+
+    def append(
+        self,
+        document: dict,
+    ) -> None:
+        """
+        Append a single decoded document to the columns of its transaction type.
+
+        Parameters:
+            document (dict): The transaction document. Documents of unknown type are
+                ignored.
+        """
+
+        appenders: list[tuple[Callable, str, Any]] | None = self._appenders.get(
+            document.get("type", "")
+        )
+
+        if appenders is None:
+            return
+
+        for append_value, key, default in appenders:
+            append_value(document.get(key, default))
+
+    def __len__(
+        self,
+    ) -> int:
+        return sum(len(columns["id"]) for columns in self._columns.values())
+
+    def to_frames(
+        self,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Build one typed DataFrame per transaction type.
+
+        Returns:
+            dict[str, pd.DataFrame]: DataFrames keyed by transaction type, with
+                `datetime64` dates, `float64` amounts and categorical string columns.
+                Types without documents map to an empty DataFrame.
+        """
+
+        return {
+            transaction_type: self._to_frame(columns)
+            for transaction_type, columns in self._columns.items()
+        }
+
+    @staticmethod
+    def _to_frame(
+        columns: dict[str, list],
+    ) -> pd.DataFrame:
+        if not len(columns["id"]):
+            return pd.DataFrame()
+
+        data: dict[str, np.ndarray | pd.Categorical] = {}
+        for column, values in columns.items():
+            if column in CATEGORICAL_COLUMNS:
+                data[column] = pd.Categorical(values)
+            elif column == "amount":
+                data[column] = np.asarray(values, dtype="float64")
+            elif column == "date":
+                data[column] = to_datetime64(values)
+            elif column == "advance_payment":
+                data[column] = np.asarray(values, dtype="bool")
+            elif column == "id":
+                data[column] = np.asarray([str(value) for value in values],
+                                          dtype="object")
+            else:
+                data[column] = np.asarray(values, dtype="object")
+
+        return pd.DataFrame(data, copy=False)
+
+
+def to_datetime64(
+    values: list,
+) -> np.ndarray:
+    """
+    Convert stored transaction dates into a `datetime64[ns]` array.
+
+    Parameters:
+        values (list): Native BSON dates or, for documents written before the date
+            migration, ISO formatted (`%Y-%m-%d`) strings. Both may be mixed.
+
+    Returns:
+        np.ndarray: The converted dates; missing values become NaT.
+    """
+
+    return np.asarray(values, dtype="datetime64[D]").astype("datetime64[ns]")
+
+
+def concat_frames(
+    frames: list[pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Concatenate transaction DataFrames preserving the categorical columns.
+
+    Parameters:
+        frames (list[pd.DataFrame]): The DataFrames to concatenate, in order.
+
+    Returns:
+        pd.DataFrame: The concatenated DataFrame, whose categorical columns use the
+            union of the categories of the inputs.
+    """
+
+    frames = [frame for frame in frames if len(frame)]
+
+    if not len(frames):
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    result: pd.DataFrame = pd.concat(frames, ignore_index=True)
+    for column in CATEGORICAL_COLUMNS:
+        if all(column in frame for frame in frames):
+            result[column] = union_categoricals(
+                [frame[column] for frame in frames],
+                ignore_order=True,
+            )
+
+    return result
@@ -1,19 +1,70 @@
-import certifi
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable
+
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, MongoClient
 from pymongo.database import Collection, Database
+from pymongo.errors import (
+    BulkWriteError,
+    DuplicateKeyError,
+    OperationFailure,
+    PyMongoError,
+)
 
+from financialchecker.database.mongodb.fingerprints import (
+    DUPLICATE_KEY_ERROR,
+    transaction_fingerprint,
+)
+from financialchecker.database.mongodb.indexes import ensure_indexes
+from financialchecker.database.mongodb.metadata import (
+    get_rollups_complete,
+    get_transactions_generation,
+    set_rollups_complete,
+)
+from financialchecker.database.mongodb.models import (
+    BatchInsertResult,
+    PageCursor,
+    TransactionPage,
+    TransactionQuery,
+)
+from financialchecker.database.mongodb.monitoring import (
+    CommandMetricsListener,
+    HealthListener,
+    PoolStatisticsListener,
+)
+from financialchecker.database.mongodb.pipelines import (
+    UTILITY_TYPES,
+    period_totals_pipeline,
+    utilities_pipeline,
+)
+from financialchecker.database.mongodb.rollups import rollup_updates, rollups_match
 from financialchecker.log.log import Logger
 from financialchecker.transactions._transactions import Transaction, TransactionType
+from financialchecker.transactions.batch import TransactionBatch
+from financialchecker.utils.cache import TimedCache
+from financialchecker.utils.exceptions import MongoDBConnectionError
+from financialchecker.utils.metrics import configure_metrics, instrumented
+from financialchecker.utils.prefix_index import PrefixIndex
 from financialchecker.utils.settings import (
     get_categories,
     get_mongodb_collection,
     get_mongodb_settings,
     get_mongodb_url,
     get_payment_methods,
+    get_utility_cache_ttl,
 )
+from financialchecker.utils.utils import batched
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
-logger = Logger(module_name="MongoDBDatabase", package_name="mongodb", database=False)
+@lru_cache
+def get_logger() -> Logger:
+    # Created on first use: the logger opens its log file.
+    return Logger(module_name="MongoDBDatabase", package_name="mongodb", database=False) # noqa E507
 
 
 class DatabaseInstanceSingleton(type):
@@ -38,9 +89,13 @@ class DatabaseInstanceSingleton(type):
 
         Returns:
             The database connection instance.
+
+        Note:
+            The instance is created once per process; its health is verified by the
+            instance itself when the database is used, not on every call.
         """
 
-        if not cls._instance or not cls._instance.is_connected():
+        if cls._instance is None:
             cls._instance = super(
                 type(
                     cls,
@@ -57,49 +112,115 @@ class DatabaseInstanceSingleton(type):
 class MongoDBInstance(metaclass=DatabaseInstanceSingleton):
     """
     Singleton class for managing a connection to a MongoDB database.
-    """
 
-    client: MongoClient = None
-    database: Database = None
+    Note:
+        The client is created on the first access to `database`, with the pool,
+        timeout and read preference options of the `MongoDB` settings. The connection
+        health is then verified at most once every `HEALTH_CHECK_INTERVAL` seconds, or
+        on the next access after the driver reported a failed heartbeat.
+    """
 
     def __init__(
         self,
     ) -> None:
         """
-        Initialize the MongoDBInstance.
+        Initialize the MongoDBInstance without opening any connection.
+        """
+
+        self.client: MongoClient | None = None
+        self._database: Database | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._pool_listener: PoolStatisticsListener = PoolStatisticsListener()
+        self._health_listener: HealthListener = HealthListener()
+        self._last_health_check: float = 0.0
+
+    @property
+    def database(
+        self,
+    ) -> Database:
+        """
+        Get the MongoDB database, connecting or reconnecting when needed.
+
+        Returns:
+            Database: The configured MongoDB database.
 
         Raises:
-            MongoConnectionError: If unable to establish a connection with the MongoDB
-            Instance.
+            MongoDBConnectionError: If unable to establish a connection with the
+            MongoDB Instance.
         """
 
-        try:
-            if get_mongodb_settings().TLS:
-                self.client = MongoClient(
-                    get_mongodb_url(
-                        True if "srv" in get_mongodb_settings().PROTOCOL else False
-                    ),
-                    tlsCAFile=certifi.where(),
-                )
-            else:
-                self.client = MongoClient(
-                    get_mongodb_url(
-                        True if "srv" in get_mongodb_settings().PROTOCOL else False
-                    ),
-                )
+        if (
+            self._database is not None
+            and self._health_listener.healthy is not False
+            and time.monotonic() - self._last_health_check
+            < get_mongodb_settings().HEALTH_CHECK_INTERVAL
+        ):
+            return self._database
+
+        with self._lock:
+            if self._database is None:
+                self._connect()
+            elif not self.is_connected():
+                get_logger().warn(message="MongoDB health check failed, reconnecting")
+                self.client.close()
+                self._connect()
+
+        return self._database
+
+    def _connect(
+        self,
+    ) -> None:
+        mongodb_settings = get_mongodb_settings()
+        options: dict = {
+            "maxPoolSize": mongodb_settings.MAX_POOL_SIZE,
+            "minPoolSize": mongodb_settings.MIN_POOL_SIZE,
+            "maxIdleTimeMS": mongodb_settings.MAX_IDLE_TIME_MS,
+            "connectTimeoutMS": mongodb_settings.CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": mongodb_settings.SERVER_SELECTION_TIMEOUT_MS,
+            "socketTimeoutMS": mongodb_settings.SOCKET_TIMEOUT_MS,
+            "readPreference": mongodb_settings.READ_PREFERENCE,
+            "event_listeners": [
+                self._pool_listener,
+                self._health_listener,
+                CommandMetricsListener(),
+            ],
+        }
+        configure_metrics()
+
+        if mongodb_settings.TLS:
+            import certifi
+
+            options["tlsCAFile"] = certifi.where()
 
-            self.client.admin.command(
-                "ping",
+        try:
+            self.client = MongoClient(
+                get_mongodb_url(
+                    True if "srv" in mongodb_settings.PROTOCOL else False
+                ),
+                **options,
             )
-            self.database = self.client[get_mongodb_settings().DATABASE]
+            database: Database = self.client[mongodb_settings.DATABASE]
+            try:
+                ensure_indexes(database)
+            except OperationFailure as error:
+                # The server answered but refused an index (missing privilege, a
+                # conflicting existing index, a secondary): queries still work,
+                # only slower, so the connection is kept.
+                get_logger().warn(
+                    message=f"Unable to create the MongoDB indexes: {error}"
+                )
         except Exception as error:
-            logger.error(
+            self._database = None
+            get_logger().error(
                 message=(
                     "Unable to establish with the MongoDB Instance. Error occurred:"
                     f" {error}"
                 )
             )
-            return
+            raise MongoDBConnectionError(str(error)) from error
+
+        self._database = database
+        self._last_health_check = time.monotonic()
 
     def is_connected(
         self,
@@ -109,183 +230,388 @@ class MongoDBInstance(metaclass=DatabaseInstanceSingleton):
 
         Returns:
             bool: True if connected, False otherwise.
+
+        Note:
+            A driver heartbeat received within the health check interval answers
+            without any round trip; otherwise the server is pinged.
         """
 
-        try:
-            if not isinstance(
-                self.client,
-                MongoClient,
-            ):
-                return False
-
-            self.client.admin.command(
-                "ping",
-            )
-        except Exception:
+        if not isinstance(
+            self.client,
+            MongoClient,
+        ):
             return False
 
-        return True
+        now: float = time.monotonic()
+        connected: bool | None = None
+
+        if (
+            self._health_listener.healthy is not None
+            and now - self._health_listener.last_heartbeat
+            < get_mongodb_settings().HEALTH_CHECK_INTERVAL
+        ):
+            connected = self._health_listener.healthy
+
+        if not connected:
+            try:
+                self.client.admin.command(
+                    "ping",
+                )
+                connected = True
+            except Exception:
+                connected = False
+
+        self._last_health_check = now
+        return connected
+
+    def pool_statistics(
+        self,
+    ) -> dict[str, int]:
+        """
+        Get the connection pool statistics.
+
+        Returns:
+            dict[str, int]: Counters of created, closed, checked out and checked in
+                connections, failed check outs and pool clears, together with the
+                open connections, the connections in use and the maximum pool size.
+        """
+
+        statistics: dict[str, int] = self._pool_listener.statistics()
+        statistics["max_pool_size"] = get_mongodb_settings().MAX_POOL_SIZE
+        return statistics
 
     def close_database_connection(
         self,
     ) -> None:
         """
-        Close the connection to the MongoDB database.
+        Close the connection to the MongoDB database; the next access to `database`
+        connects again.
         """
 
-        self.client.close()
+        with self._lock:
+            if self.client is not None:
+                self.client.close()
+            self._database = None
 
 
 class MongoDBCrud:
-    def __init__(self) -> None:
-        self.mongodb_instance = MongoDBInstance()
+    _utilities_cache: TimedCache | None = None
 
-    def get_categories(self) -> list[str]:
-        utilities_collection: Collection = self.mongodb_instance.database[
-            get_mongodb_collection().Utility
-        ]
+    def __init__(self, mongodb_instance: MongoDBInstance | None = None) -> None:
+        """
+        Initialize the CRUD operations on the transactions and utilities.
 
-        result: list[dict] = list(
-            utilities_collection.aggregate([
-                {
-                    '$match': {
-                        'type': 'Category'
-                    }
-                },
-                {
-                    '$sort': {
-                        'value': 1
-                    }
-                }
-            ])
+        Parameters:
+            mongodb_instance (MongoDBInstance | None, optional): Object exposing the
+                `database` to operate on. Defaults to the process-wide
+                MongoDBInstance; any object with a `database` attribute, such as an
+                in-process stand-in, can be given instead.
+        """
+
+        self.mongodb_instance = (
+            mongodb_instance if mongodb_instance is not None else MongoDBInstance()
         )
 
-        if len(result):
-            return [_dict.get("value", "") for _dict in result]
-        else:
-            get_categories()
+    @classmethod
+    def _get_utilities_cache(cls) -> TimedCache:
+        if cls._utilities_cache is None:
+            cls._utilities_cache = TimedCache(ttl=get_utility_cache_ttl())
+        return cls._utilities_cache
 
-    def get_income_categories(self,) -> list[str]:
-        utilities_collection: Collection = self.mongodb_instance.database[
-            get_mongodb_collection().Utility
-        ]
+    @instrumented("MongoDBCrud.get_utilities")
+    def get_utilities(self, refresh: bool = False) -> dict[str, list[str]]:
+        # The cache is shared by the whole process, so it holds tuples and every
+        # caller gets its own lists.
+        utilities: dict[str, tuple[str, ...]] | None = None
 
-        result: list[dict] = list(
-            utilities_collection.aggregate([
-                {
-                    '$match': {
-                        'type': 'IncomeCategory'
-                    }
-                },
-                {
-                    '$sort': {
-                        'value': 1
-                    }
-                }
-            ])
-        )
+        if not refresh:
+            utilities = self._get_utilities_cache().get("utilities")
 
-        if len(result):
-            return [_dict.get("value", "") for _dict in result]
-        else:
-            get_categories()
+        if utilities is None:
+            utilities_collection: Collection = self.mongodb_instance.database[
+                get_mongodb_collection().Utility
+            ]
+
+            result: list[dict] = list(
+                utilities_collection.aggregate(utilities_pipeline())
+            )
+            facets: dict[str, list[dict]] = result[0] if len(result) else {}
+
+            utilities = {
+                utility_type: tuple(
+                    _dict.get("value", "") for _dict in facets.get(utility_type, [])
+                )
+                for utility_type in UTILITY_TYPES
+            }
+            self._get_utilities_cache().set("utilities", utilities)
+
+        return {utility_type: list(values) for utility_type, values in utilities.items()} # noqa E507
+
+    @instrumented("MongoDBCrud.add_utility", documents=lambda _: 1)
+    def add_utility(self, utility_type: str, value: str) -> None:
+        assert utility_type in UTILITY_TYPES
 
-    def get_payment_methods(self) -> list[str]:
         utilities_collection: Collection = self.mongodb_instance.database[
             get_mongodb_collection().Utility
         ]
-
-        result: list[dict] = list(
-            utilities_collection.aggregate([
-                {
-                    '$match': {
-                        'type': 'PaymentMethod'
-                    }
-                },
-                {
-                    '$sort': {
-                        'value': 1
-                    }
+        utilities_collection.update_one(
+            {
+                'type': utility_type,
+                'value': value
+            },
+            {
+                '$setOnInsert': {
+                    'type': utility_type,
+                    'value': value
                 }
-            ])
+            },
+            upsert=True,
         )
+        self._get_utilities_cache().invalidate("utilities")
 
-        if len(result):
-            return [_dict.get("value", "") for _dict in result]
-        else:
-            return get_payment_methods()
+        prefix_indexes: dict[str, PrefixIndex] | None = self._get_utilities_cache().get( # noqa E507
+            "prefix_indexes"
+        )
+        if prefix_indexes is not None:
+            prefix_indexes[utility_type].add(value)
+
+    @instrumented("MongoDBCrud.search_utilities", documents=len)
+    def search_utilities(self,
+                         utility_type: str,
+                         prefix: str = "",
+                         limit: int = 10) -> list[str]:
+        """
+        Find the utility values with a word starting with a prefix, for type-ahead
+        inputs.
 
-    def get_firms(self) -> list[str]:
-        utilities_collection: Collection = self.mongodb_instance.database[
-            get_mongodb_collection().Utility
-        ]
+        Parameters:
+            utility_type (str): One of `UTILITY_TYPES`.
+            prefix (str, optional): The typed text, compared case-insensitively.
+                Defaults to "", matching every value.
+            limit (int, optional): Maximum number of values returned. Defaults to
+                10.
 
-        result: list[dict] = list(
-            utilities_collection.aggregate([
-                {
-                    '$match': {
-                        'type': 'Firm'
-                    }
-                },
-                {
-                    '$sort': {
-                        'value': 1
-                    }
-                }
-            ])
+        Returns:
+            list[str]: The matching values.
+
+        Note:
+            Lookups are served by in-memory prefix indexes built from the utilities
+            and shared by every MongoDBCrud of the process. Values added through
+            `add_utility` are indexed immediately; the indexes are rebuilt from the
+            database when the utilities cache expires, picking up values added by
+            other processes.
+        """
+
+        assert utility_type in UTILITY_TYPES
+
+        prefix_indexes: dict[str, PrefixIndex] | None = self._get_utilities_cache().get( # noqa E507
+            "prefix_indexes"
         )
+        if prefix_indexes is None:
+            prefix_indexes = {
+                _utility_type: PrefixIndex(values)
+                for _utility_type, values in self.get_utilities(refresh=True).items()
+            }
+            self._get_utilities_cache().set("prefix_indexes", prefix_indexes)
 
-        if len(result):
-            return [_dict.get("value", "") for _dict in result]
-        else:
-            return [""]
+        return prefix_indexes[utility_type].search(prefix, limit=limit)
+
+    def get_categories(self) -> list[str]:
+        return self.get_utilities()["Category"] or list(get_categories())
+
+    def get_income_categories(self,) -> list[str]:
+        return self.get_utilities()["IncomeCategory"] or list(get_categories())
+
+    def get_payment_methods(self) -> list[str]:
+        return self.get_utilities()["PaymentMethod"] or list(get_payment_methods())
+
+    def get_firms(self) -> list[str]:
+        return self.get_utilities()["Firm"] or [""]
 
     def get_locations(self) -> list[str]:
-        utilities_collection: Collection = self.mongodb_instance.database[
-            get_mongodb_collection().Utility
-        ]
+        return self.get_utilities()["Location"] or [""]
 
-        result: list[dict] = list(
-            utilities_collection.aggregate([
-                {
-                    '$match': {
-                        'type': 'Location'
-                    }
-                },
-                {
-                    '$sort': {
-                        'value': 1
-                    }
-                }
-            ])
-        )
+    @instrumented("MongoDBCrud.find_duplicate_transaction")
+    def find_duplicate_transaction(self, transaction: Transaction) -> ObjectId | None:
+        """
+        Find a stored transaction identical to a transaction.
 
-        if len(result):
-            return [_dict.get("value", "") for _dict in result]
-        else:
-            return [""]
+        Parameters:
+            transaction (Transaction): The transaction.
+
+        Returns:
+            ObjectId | None: The identifier of the stored transaction with the same
+                fingerprint, None if there is none.
+        """
+
+        return self._stored_fingerprint(transaction_fingerprint(dict(transaction)))
+
+    @instrumented("MongoDBCrud.add_transaction", documents=lambda _: 1)
+    def add_transaction(self,
+                        transaction: Transaction,
+                        deduplicate: bool = True) -> ObjectId:
+        """
+        Store a transaction.
+
+        Parameters:
+            transaction (Transaction): The transaction.
+            deduplicate (bool, optional): Store the transaction fingerprint, so that
+                an identical transaction is never stored twice. Defaults to True.
+
+        Returns:
+            ObjectId: The identifier of the stored transaction, or of the identical
+                transaction already stored.
+
+        Note:
+            The stored fingerprints are looked up before inserting, as in
+            `add_transactions`, so duplicates are skipped even where the unique
+            fingerprint index could not be created; the index still rejects an
+            identical transaction written concurrently.
+        """
 
-    def add_transaction(self, transaction: Transaction) -> ObjectId:
         transactions_collection = self.mongodb_instance.database[
             get_mongodb_collection().Transaction
         ]
 
-        result = transactions_collection.insert_one(
-            dict(transaction)
-        )
+        document: dict = dict(transaction)
+        if deduplicate:
+            document["fingerprint"] = transaction_fingerprint(document)
+            existing: ObjectId | None = self._stored_fingerprint(document["fingerprint"]) # noqa E507
+            if existing is not None:
+                get_logger().info(
+                    message=f"Transaction already stored as {existing}, skipped"
+                )
+                return existing
+
+        try:
+            result = transactions_collection.insert_one(document)
+        except DuplicateKeyError:
+            if "fingerprint" not in document:
+                raise
+            existing: ObjectId | None = self._stored_fingerprint(document["fingerprint"]) # noqa E507
+            if existing is None:
+                raise
+            get_logger().info(
+                message=f"Transaction already stored as {existing}, skipped"
+            )
+            return existing
+
+        self._update_rollups([document])
+
         return result.inserted_id
 
-    def get_all_transactions(self, transaction_type: str | None = None) -> list[dict]: # noqa E507
+    @instrumented("MongoDBCrud.add_transactions",
+                  documents=lambda results: sum(len(result.inserted_ids) for result in results)) # noqa E507
+    def add_transactions(self,
+                         transactions: Iterable[Transaction] | TransactionBatch,
+                         batch_size: int = 1000,
+                         deduplicate: bool = True) -> list[BatchInsertResult]:
+        """
+        Store transactions in batches.
+
+        Parameters:
+            transactions (Iterable[Transaction] | TransactionBatch): The
+                transactions.
+            batch_size (int, optional): Number of transactions per insert. Defaults
+                to 1000.
+            deduplicate (bool, optional): Skip the transactions identical to a
+                stored one or to an earlier one of the same call, and store the
+                fingerprints of the others. Defaults to True.
+
+        Returns:
+            list[BatchInsertResult]: The outcome of every batch.
+
+        Note:
+            Each batch costs one `$in` query on the fingerprint index to find the
+            transactions already stored, and a set lookup per transaction, so
+            importing the same statement again inserts nothing. Duplicates rejected
+            by the unique index, when two imports race, are counted as duplicates
+            rather than errors.
+        """
+
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+        results: list[BatchInsertResult] = []
+
+        if isinstance(transactions, TransactionBatch):
+            batches: Iterable[list[dict]] = (
+                transactions[start:start + batch_size].to_documents()
+                for start in range(0, len(transactions), batch_size)
+            )
+        else:
+            batches: Iterable[list[dict]] = (
+                [dict(transaction) for transaction in batch]
+                for batch in batched(transactions, batch_size)
+            )
+
+        for index, documents in enumerate(batches):
+            duplicates: int = 0
+            if deduplicate:
+                received: int = len(documents)
+                documents = self._new_documents(documents)
+                duplicates = received - len(documents)
+                if not len(documents):
+                    results.append(BatchInsertResult(batch=index, duplicates=duplicates)) # noqa E507
+                    continue
+
+            try:
+                result = transactions_collection.insert_many(documents, ordered=False)
+                results.append(
+                    BatchInsertResult(batch=index,
+                                      inserted_ids=result.inserted_ids,
+                                      duplicates=duplicates)
+                )
+                self._update_rollups(documents)
+            except BulkWriteError as error:
+                errors: list[dict] = error.details.get("writeErrors", [])
+                failed: set[int] = {_error["index"] for _error in errors}
+                inserted: list[dict] = [
+                    document
+                    for position, document in enumerate(documents)
+                    if position not in failed
+                ]
+                # Identical transactions written concurrently by another import.
+                raced: int = sum(map(self._is_duplicate_fingerprint, errors))
+                errors = [
+                    _error for _error in errors
+                    if not self._is_duplicate_fingerprint(_error)
+                ]
+                results.append(
+                    BatchInsertResult(
+                        batch=index,
+                        inserted_ids=[document["_id"] for document in inserted],
+                        errors=errors,
+                        duplicates=duplicates + raced,
+                    )
+                )
+                self._update_rollups(inserted)
+                if len(errors):
+                    get_logger().error(
+                        message=(
+                            f"Batch {index}: {len(errors)} of {len(documents)}"
+                            " transactions could not be inserted"
+                        )
+                    )
+
+        return results
+
+    @instrumented("MongoDBCrud.get_all_transactions", documents=len)
+    def get_all_transactions(self,
+                             transaction_type: str | None = None,
+                             after_id: str | None = None,
+                             query: TransactionQuery | None = None) -> list[dict]:
         transactions_collection = self.mongodb_instance.database[
             get_mongodb_collection().Transaction
         ]
         request: list[dict] = []
+        match: dict = self._transactions_match(transaction_type=transaction_type,
+                                               after_id=after_id,
+                                               query=query)
 
-        if transaction_type is not None and TransactionType.has(transaction_type):
+        if match:
             request.append({
-                '$match' : {
-                    'type': transaction_type
-                }
+                '$match': match
             })
 
         request.append(
@@ -308,3 +634,344 @@ class MongoDBCrud:
         result: list[dict] = list(transactions_collection.aggregate(request))
 
         return result
+
+    @instrumented("MongoDBCrud.get_transaction_frames",
+                  documents=lambda frames: sum(len(frame) for frame in frames.values())) # noqa E507
+    def get_transaction_frames(self,
+                               transaction_type: str | None = None,
+                               after_id: str | None = None,
+                               query: TransactionQuery | None = None,
+                               batch_size: int = 1000) -> dict[str, "pd.DataFrame"]:
+        # pandas is only needed, and therefore only imported, by this method.
+        from financialchecker.database.mongodb.columnar import TransactionColumns
+
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+        columns: TransactionColumns = TransactionColumns()
+
+        for batch in transactions_collection.find_raw_batches(
+            self._transactions_match(transaction_type=transaction_type,
+                                     after_id=after_id,
+                                     query=query),
+            batch_size=batch_size,
+        ):
+            columns.extend_raw_batch(batch)
+
+        return columns.to_frames()
+
+    @instrumented("MongoDBCrud.get_transaction_page",
+                  documents=lambda page: len(page.transactions))
+    def get_transaction_page(self,
+                             transaction_type: str | None = None,
+                             query: TransactionQuery | None = None,
+                             cursor: str | None = None,
+                             page_size: int = 50,
+                             descending: bool = True) -> TransactionPage:
+        """
+        Read one page of transactions sorted by date.
+
+        Parameters:
+            transaction_type (str | None, optional): Type of the transactions.
+                Defaults to every type.
+            query (TransactionQuery | None, optional): Filters applied by the
+                database. Defaults to None.
+            cursor (str | None, optional): The `next_cursor` of the previous page.
+                Defaults to None, reading the first page.
+            page_size (int, optional): Maximum number of transactions per page.
+                Defaults to 50.
+            descending (bool, optional): Newest transactions first. Defaults to
+                True.
+
+        Returns:
+            TransactionPage: The transactions and the cursor of the following page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+
+        Note:
+            Pages are selected by the (date, _id) of the last transaction read
+            rather than by skipping the previous pages, so every page costs one
+            walk of `page_size` entries of the `date_id` index, however deep it is.
+            Transactions still holding a string date, from before the date
+            migration, are never paged.
+        """
+
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+        direction: int = DESCENDING if descending else ASCENDING
+        match: dict = self._transactions_match(transaction_type=transaction_type,
+                                               query=query)
+        conditions: list[dict] = [match] if match else []
+        conditions.append({"date": {"$type": "date"}})
+
+        if cursor is not None:
+            position: PageCursor = PageCursor.decode(cursor)
+            position_id: ObjectId = ObjectId(position.id)
+            operator: str = "$lt" if descending else "$gt"
+            conditions.append({
+                "$or": [
+                    {"date": {operator: position.date}},
+                    {"date": position.date, "_id": {operator: position_id}},
+                ]
+            })
+
+        # One extra document tells whether another page follows.
+        documents: list[dict] = list(
+            transactions_collection.find({"$and": conditions})
+            .sort([("date", direction), ("_id", direction)])
+            .limit(page_size + 1)
+        )
+
+        next_cursor: str | None = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            next_cursor = PageCursor(date=documents[-1]["date"],
+                                     id=str(documents[-1]["_id"])).encode()
+
+        for document in documents:
+            document["id"] = str(document.pop("_id"))
+
+        return TransactionPage(transactions=documents, next_cursor=next_cursor)
+
+    @instrumented("MongoDBCrud.search_transactions", documents=len)
+    def search_transactions(self,
+                            text: str,
+                            transaction_type: str | None = None,
+                            query: TransactionQuery | None = None,
+                            limit: int = 50) -> list[dict]:
+        """
+        Search the descriptions, firms and locations of the transactions.
+
+        Parameters:
+            text (str): The searched words; quoted phrases and negated `-words`
+                follow the MongoDB `$text` syntax.
+            transaction_type (str | None, optional): Type of the transactions.
+                Defaults to every type.
+            query (TransactionQuery | None, optional): Additional filters. Defaults
+                to None.
+            limit (int, optional): Maximum number of transactions returned.
+                Defaults to 50.
+
+        Returns:
+            list[dict]: The matching transactions with their `id` and relevance
+                `score`, most relevant first.
+
+        Note:
+            Words are matched whole and without stemming, through the
+            `description_firm_location_text` index, in which firms and locations
+            weigh twice as much as descriptions.
+        """
+
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+        match: dict = self._transactions_match(transaction_type=transaction_type,
+                                               query=query)
+        match["$text"] = {"$search": text}
+
+        documents: list[dict] = list(
+            transactions_collection.find(match, {"score": {"$meta": "textScore"}})
+            .sort([("score", {"$meta": "textScore"})])
+            .limit(limit)
+        )
+
+        for document in documents:
+            document["id"] = str(document.pop("_id"))
+
+        return documents
+
+    @instrumented("MongoDBCrud.get_period_totals", documents=len)
+    def get_period_totals(self,
+                          transaction_type: str | None = None,
+                          period: str = "daily",
+                          group_by: str | None = None,
+                          query: TransactionQuery | None = None) -> list[dict]:
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+
+        result: list[dict] = list(
+            transactions_collection.aggregate(
+                period_totals_pipeline(
+                    match=self._transactions_match(transaction_type=transaction_type,
+                                                   query=query),
+                    period=period,
+                    group_by=group_by,
+                )
+            )
+        )
+
+        return result
+
+    def get_transactions_generation(self) -> int:
+        """
+        Get the number of times stored transactions were changed in place.
+
+        Returns:
+            int: The generation advanced by the migrations rewriting transactions.
+        """
+
+        return get_transactions_generation(self.mongodb_instance.database)
+
+    def count_transactions(self, until_id: str | None = None) -> int:
+        """
+        Count the stored transactions.
+
+        Parameters:
+            until_id (str | None, optional): Only count the transactions whose
+                identifier is lower than or equal to this one. Defaults to None.
+
+        Returns:
+            int: The number of transactions.
+        """
+
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+
+        return transactions_collection.count_documents(
+            {} if until_id is None else {"_id": {"$lte": ObjectId(until_id)}}
+        )
+
+    def rollups_complete(self) -> bool:
+        """
+        Check whether the daily rollups account for every stored transaction.
+
+        Returns:
+            bool: True when the rollups can answer period totals.
+
+        Note:
+            Rollups are only maintained for transactions written since they were
+            introduced, so on an existing database they stay partial until the
+            rollups migration is run. The recorded state is read when there is one;
+            otherwise the transactions counted by the rollups are compared once
+            with the stored transactions, and a match is recorded.
+        """
+
+        database: Database = self.mongodb_instance.database
+        complete: bool | None = get_rollups_complete(database)
+        if complete is not None:
+            return complete
+
+        collections = get_mongodb_collection()
+        rolled_up: int = sum(
+            total["count"]
+            for total in database[collections.Rollup].aggregate(
+                [{"$group": {"_id": None, "count": {"$sum": "$count"}}}]
+            )
+        )
+        if rolled_up != database[collections.Transaction].count_documents({}):
+            return False
+
+        set_rollups_complete(database, True)
+        return True
+
+    @instrumented("MongoDBCrud.get_rollups", documents=len)
+    def get_rollups(self,
+                    transaction_type: str | None = None,
+                    query: TransactionQuery | None = None) -> list[dict]:
+        """
+        Read the daily rollups of the transactions.
+
+        Parameters:
+            transaction_type (str | None, optional): Type of the transactions.
+                Defaults to every type.
+            query (TransactionQuery | None, optional): Date, category and payment
+                method filters. Defaults to None.
+
+        Returns:
+            list[dict]: One document per day, type, category and payment method with
+                the fields `day`, `type`, `category`, `transaction_method`, `amount`
+                and `count`, sorted by day.
+
+        Raises:
+            ValueError: If the query filters on firms or locations.
+        """
+
+        rollups_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Rollup
+        ]
+
+        return list(
+            rollups_collection.find(rollups_match(transaction_type=transaction_type,
+                                                  query=query),
+                                    {"_id": 0}).sort("day", 1)
+        )
+
+    def _stored_fingerprint(self, fingerprint: str) -> ObjectId | None:
+        # Identifier of the stored transaction with a fingerprint, if any.
+        existing: dict | None = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ].find_one({"fingerprint": fingerprint}, {"_id": 1})
+        return None if existing is None else existing["_id"]
+
+    def _new_documents(self, documents: list[dict]) -> list[dict]:
+        # Fingerprint the documents, then keep the first of each fingerprint that is
+        # not stored yet; one indexed `$in` query covers the whole batch.
+        transactions_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Transaction
+        ]
+        for document in documents:
+            document["fingerprint"] = transaction_fingerprint(document)
+
+        seen: set[str] = {
+            document["fingerprint"]
+            for document in transactions_collection.find(
+                {"fingerprint": {"$in": [document["fingerprint"] for document in documents]}}, # noqa E507
+                {"_id": 0, "fingerprint": 1},
+            )
+        }
+        new_documents: list[dict] = []
+        for document in documents:
+            if document["fingerprint"] not in seen:
+                seen.add(document["fingerprint"])
+                new_documents.append(document)
+
+        return new_documents
+
+    @staticmethod
+    def _is_duplicate_fingerprint(error: dict) -> bool:
+        return error.get("code") == DUPLICATE_KEY_ERROR and "fingerprint" in str(
+            error.get("keyPattern") or error.get("errmsg", "")
+        )
+
+    def _update_rollups(self, documents: list[dict]) -> None:
+        # The rollups are maintained after the transactions are stored; a failure
+        # leaves them behind the transactions until the rollups migration is run.
+        if not len(documents):
+            return
+
+        rollups_collection = self.mongodb_instance.database[
+            get_mongodb_collection().Rollup
+        ]
+        try:
+            rollups_collection.bulk_write(rollup_updates(documents), ordered=False)
+        except PyMongoError as error:
+            get_logger().error(
+                message=(
+                    f"Unable to update the rollups of {len(documents)} transactions,"
+                    f" rebuild them with the rollups migration: {error}"
+                )
+            )
+            try:
+                set_rollups_complete(self.mongodb_instance.database, False)
+            except PyMongoError:
+                pass
+
+    @staticmethod
+    def _transactions_match(transaction_type: str | None = None,
+                            after_id: str | None = None,
+                            query: TransactionQuery | None = None) -> dict:
+        match: dict = query.to_match() if query is not None else {}
+
+        if transaction_type is not None and TransactionType.has(transaction_type):
+            match['type'] = transaction_type
+
+        if after_id is not None:
+            match['_id'] = {
+                '$gt': ObjectId(after_id)
+            }
+
+        return match
@@ -0,0 +1,58 @@
+import hashlib
+
+from financialchecker.database.mongodb.rollups import rollup_day
+
+FINGERPRINT_FIELDS: tuple[str, ...] = (
+    "type",
+    "date",
+    "amount",
+    "transaction_method",
+    "firm",
+    "description",
+)
+
+# MongoDB error code of a unique index violation.
+DUPLICATE_KEY_ERROR: int = 11000
+
+
+def normalize_text(
+    text: str | None,
+) -> str:
+    """
+    Normalize a free-text field for comparison: case-folded, with runs of
+    whitespace collapsed into single spaces and no leading or trailing spaces.
+    """
+
+    return " ".join((text or "").casefold().split())
+
+
+def transaction_fingerprint(
+    document: dict,
+) -> str:
+    """
+    Compute the canonical fingerprint of a transaction.
+
+    Parameters:
+        document (dict): The transaction document.
+
+    Returns:
+        str: The SHA-1 hex digest of the type, day, amount in cents, payment method,
+            normalized firm and normalized description of the transaction.
+
+    Note:
+        The same transaction read from two overlapping statements gets the same
+        fingerprint, however its description is capitalised or spaced. Fields that
+        statements rarely carry, such as the category or the location, are left out
+        so that they can be edited without changing the fingerprint.
+    """
+
+    canonical: str = "\x1f".join((
+        str(document.get("type", "")),
+        rollup_day(document["date"]).date().isoformat(),
+        str(round(document["amount"] * 100)),
+        str(document.get("transaction_method", "")),
+        normalize_text(document.get("firm")),
+        normalize_text(document.get("description")),
+    ))
+
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,92 @@
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.database import Database
+
+from financialchecker.utils.settings import get_mongodb_collection
+
+TRANSACTION_INDEXES: list[IndexModel] = [
+    IndexModel(
+        [("type", ASCENDING), ("date", ASCENDING)],
+        name="type_date",
+    ),
+    IndexModel(
+        [("type", ASCENDING), ("category", ASCENDING), ("date", ASCENDING)],
+        name="type_category_date",
+    ),
+    IndexModel(
+        [("type", ASCENDING), ("transaction_method", ASCENDING), ("date", ASCENDING)],
+        name="type_transaction_method_date",
+    ),
+    IndexModel(
+        [("date", ASCENDING)],
+        name="date",
+    ),
+    # Keyset pagination sorts on (date, _id), optionally within one type.
+    IndexModel(
+        [("date", ASCENDING), ("_id", ASCENDING)],
+        name="date_id",
+    ),
+    IndexModel(
+        [("type", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)],
+        name="type_date_id",
+    ),
+    # Transactions written before fingerprinting are left out of the unique index.
+    IndexModel(
+        [("fingerprint", ASCENDING)],
+        name="fingerprint",
+        unique=True,
+        partialFilterExpression={"fingerprint": {"$exists": True}},
+    ),
+    # Backs `search_transactions`; a collection can only have one text index.
+    IndexModel(
+        [("description", TEXT), ("firm", TEXT), ("location", TEXT)],
+        name="description_firm_location_text",
+        weights={"description": 1, "firm": 2, "location": 2},
+        default_language="none",
+    ),
+]
+
+UTILITY_INDEXES: list[IndexModel] = [
+    IndexModel(
+        [("type", ASCENDING), ("value", ASCENDING)],
+        name="type_value",
+    ),
+]
+
+
+ROLLUP_INDEXES: list[IndexModel] = [
+    IndexModel(
+        [("day", ASCENDING), ("type", ASCENDING), ("category", ASCENDING),
+         ("transaction_method", ASCENDING)],
+        name="day_type_category_transaction_method",
+        unique=True,
+    ),
+]
+
+
+def ensure_indexes(
+    database: Database,
+) -> None:
+    """
+    Create the indexes backing the transaction, utility and rollup queries.
+
+    Parameters:
+        database (Database): The MongoDB database holding the collections.
+
+    Raises:
+        OperationFailure: If the server refuses an index, e.g. for lack of
+            privileges or because a conflicting index already exists.
+
+    Note:
+        Index creation is idempotent, so this function is safe to call at every
+        start-up; existing indexes with the same specification are left untouched.
+    """
+
+    database[get_mongodb_collection().Transaction].create_indexes(
+        TRANSACTION_INDEXES,
+    )
+    database[get_mongodb_collection().Utility].create_indexes(
+        UTILITY_INDEXES,
+    )
+    database[get_mongodb_collection().Rollup].create_indexes(
+        ROLLUP_INDEXES,
+    )
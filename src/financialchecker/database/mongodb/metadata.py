@@ -0,0 +1,90 @@
+from pymongo.database import Database
+
+from financialchecker.utils.settings import get_mongodb_collection
+
+# Identifier of the metadata document describing the transaction collection.
+TRANSACTIONS_STATE: str = "transactions"
+# Identifier of the metadata document describing the daily rollups.
+ROLLUPS_STATE: str = "rollups"
+
+
+def get_transactions_generation(
+    database: Database,
+) -> int:
+    """
+    Get the generation of the stored transactions.
+
+    Parameters:
+        database (Database): The MongoDB database holding the collections.
+
+    Returns:
+        int: The number of times stored transactions were changed in place, 0 if
+            they never were.
+    """
+
+    state: dict | None = database[get_mongodb_collection().Metadata].find_one(
+        {"_id": TRANSACTIONS_STATE}, {"generation": 1}
+    )
+    return 0 if state is None else state.get("generation", 0)
+
+
+def bump_transactions_generation(
+    database: Database,
+) -> None:
+    """
+    Record that stored transactions were changed in place.
+
+    Parameters:
+        database (Database): The MongoDB database holding the collections.
+
+    Note:
+        Copies of the collection, such as the local transaction cache, only fetch
+        the transactions added after their last synchronisation; they compare the
+        generation they were built at with the current one to know when to start
+        over. Every operation rewriting stored transactions must call this.
+    """
+
+    database[get_mongodb_collection().Metadata].update_one(
+        {"_id": TRANSACTIONS_STATE},
+        {"$inc": {"generation": 1}},
+        upsert=True,
+    )
+
+
+def get_rollups_complete(
+    database: Database,
+) -> bool | None:
+    """
+    Get whether the daily rollups account for every stored transaction.
+
+    Parameters:
+        database (Database): The MongoDB database holding the collections.
+
+    Returns:
+        bool | None: The recorded state, None when it was never recorded.
+    """
+
+    state: dict | None = database[get_mongodb_collection().Metadata].find_one(
+        {"_id": ROLLUPS_STATE}, {"complete": 1}
+    )
+    return None if state is None else state.get("complete")
+
+
+def set_rollups_complete(
+    database: Database,
+    complete: bool,
+) -> None:
+    """
+    Record whether the daily rollups account for every stored transaction.
+
+    Parameters:
+        database (Database): The MongoDB database holding the collections.
+        complete (bool): True once the rollups are rebuilt or found to match the
+            transactions, False when an update of the rollups failed.
+    """
+
+    database[get_mongodb_collection().Metadata].update_one(
+        {"_id": ROLLUPS_STATE},
+        {"$set": {"complete": complete}},
+        upsert=True,
+    )
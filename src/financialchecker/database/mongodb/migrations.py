@@ -0,0 +1,359 @@
+import argparse
+from datetime import datetime
+from functools import lru_cache
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from financialchecker.database.mongodb.database import MongoDBInstance
+from financialchecker.database.mongodb.fingerprints import (
+    DUPLICATE_KEY_ERROR,
+    FINGERPRINT_FIELDS,
+    transaction_fingerprint,
+)
+from financialchecker.database.mongodb.indexes import ROLLUP_INDEXES
+from financialchecker.database.mongodb.metadata import (
+    bump_transactions_generation,
+    set_rollups_complete,
+)
+from financialchecker.database.mongodb.rollups import ROLLUP_FIELDS, rollup_updates
+from financialchecker.log.log import Logger
+from financialchecker.utils.settings import get_mongodb_collection
+
+
+@lru_cache
+def get_logger() -> Logger:
+    # Created on first use: the logger opens its log file.
+    return Logger(module_name="MongoDBMigrations", package_name="mongodb", database=False) # noqa E507
+
+
+def migrate_transaction_dates(
+    database: Database,
+    batch_size: int = 1000,
+    resume_after: str | None = None,
+) -> int:
+    """
+    Convert the "%Y-%m-%d" string dates of the stored transactions into native BSON
+    dates.
+
+    Parameters:
+        database (Database): The MongoDB database holding the transactions.
+        batch_size (int, optional): Number of documents converted per bulk write.
+            Defaults to 1000.
+        resume_after (str | None, optional): Identifier of the last document
+            converted by a previous, interrupted run. Defaults to None.
+
+    Returns:
+        int: The number of converted transactions.
+
+    Note:
+        Documents are processed in `_id` order and only documents still holding a
+        string date are selected, so the migration can be stopped and restarted at
+        any time; the identifier of the last converted document is logged after each
+        batch. Each update is conditioned on the original string value, so writes
+        racing with the migration are never overwritten. Converted batches advance
+        the transactions generation, so local caches are rebuilt.
+    """
+
+    transactions_collection = database[get_mongodb_collection().Transaction]
+    last_id: ObjectId | None = ObjectId(resume_after) if resume_after else None
+    migrated: int = 0
+
+    while True:
+        query: dict = {"date": {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+
+        batch: list[dict] = list(
+            transactions_collection.find(query, {"date": 1})
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+
+        if not len(batch):
+            break
+
+        operations: list[UpdateOne] = []
+        for document in batch:
+            try:
+                converted: datetime = datetime.strptime(document["date"], "%Y-%m-%d")
+            except ValueError:
+                get_logger().error(
+                    message=(
+                        f"Unable to convert the date of transaction {document['_id']}:"
+                        f" {document['date']}"
+                    )
+                )
+                continue
+
+            operations.append(
+                UpdateOne(
+                    {"_id": document["_id"], "date": document["date"]},
+                    {"$set": {"date": converted}},
+                )
+            )
+
+        if len(operations):
+            modified: int = transactions_collection.bulk_write(
+                operations,
+                ordered=False,
+            ).modified_count
+            if modified:
+                bump_transactions_generation(database)
+            migrated += modified
+
+        last_id = batch[-1]["_id"]
+        get_logger().info(
+            message=(
+                f"Converted {migrated} transaction dates, last identifier: {last_id}"
+            )
+        )
+
+    return migrated
+
+
+def rebuild_rollups(
+    database: Database,
+    batch_size: int = 10000,
+    resume_after: str | None = None,
+) -> int:
+    """
+    Regenerate the daily rollups from the stored transactions.
+
+    Parameters:
+        database (Database): The MongoDB database holding the transactions.
+        batch_size (int, optional): Number of transactions read per batch; each
+            batch is summed in memory and written with one bulk upsert. Defaults to
+            10000.
+        resume_after (str | None, optional): Identifier of the last transaction
+            rolled up by a previous, interrupted run. Defaults to None.
+
+    Returns:
+        int: The number of transactions rolled up.
+
+    Note:
+        The rollups are built in a separate collection, which replaces the current
+        one once every transaction is processed, so readers never see partial
+        totals. An interrupted run keeps its collection and is resumed from the
+        identifier logged after each batch. Transactions added while the rollups
+        are rebuilt may be counted twice or not at all, so run it while nothing is
+        written. The rollups are then recorded as complete, so period totals are
+        read from them again.
+    """
+
+    collections = get_mongodb_collection()
+    transactions_collection = database[collections.Transaction]
+    rebuild_collection = database[f"{collections.Rollup}.rebuild"]
+    last_id: ObjectId | None = ObjectId(resume_after) if resume_after else None
+    rolled_up: int = 0
+
+    if last_id is None:
+        rebuild_collection.drop()
+    rebuild_collection.create_indexes(ROLLUP_INDEXES)
+
+    while True:
+        query: dict = {} if last_id is None else {"_id": {"$gt": last_id}}
+
+        batch: list[dict] = list(
+            transactions_collection.find(
+                query,
+                {"date": 1, "amount": 1, **{field: 1 for field in ROLLUP_FIELDS}},
+            )
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+
+        if not len(batch):
+            break
+
+        rebuild_collection.bulk_write(rollup_updates(batch), ordered=False)
+
+        rolled_up += len(batch)
+        last_id = batch[-1]["_id"]
+        get_logger().info(
+            message=(
+                f"Rolled up {rolled_up} transactions, last identifier: {last_id}"
+            )
+        )
+
+    if rolled_up or last_id is not None:
+        rebuild_collection.rename(collections.Rollup, dropTarget=True)
+    else:
+        database[collections.Rollup].delete_many({})
+        rebuild_collection.drop()
+    set_rollups_complete(database, True)
+
+    return rolled_up
+
+
+def backfill_fingerprints(
+    database: Database,
+    batch_size: int = 1000,
+    resume_after: str | None = None,
+) -> tuple[int, int]:
+    """
+    Store the fingerprint of the transactions written before fingerprinting.
+
+    Parameters:
+        database (Database): The MongoDB database holding the transactions.
+        batch_size (int, optional): Number of documents updated per bulk write.
+            Defaults to 1000.
+        resume_after (str | None, optional): Identifier of the last document
+            processed by a previous, interrupted run. Defaults to None.
+
+    Returns:
+        tuple[int, int]: The number of fingerprinted transactions and the number
+            of duplicates left without a fingerprint.
+
+    Note:
+        Transactions are processed in `_id` order, so the oldest of a group of
+        identical transactions gets the fingerprint. The unique index rejects it for
+        the others, and for transactions identical to one added since
+        fingerprinting; they are counted and left untouched so that they can be
+        reviewed with the analytics `duplicates` command. Only documents without a
+        fingerprint are selected, so the migration can be stopped and restarted at
+        any time. Updated batches advance the transactions generation, so local
+        caches are rebuilt.
+    """
+
+    transactions_collection = database[get_mongodb_collection().Transaction]
+    last_id: ObjectId | None = ObjectId(resume_after) if resume_after else None
+    fingerprinted: int = 0
+    duplicates: int = 0
+
+    while True:
+        query: dict = {"fingerprint": {"$exists": False}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+
+        batch: list[dict] = list(
+            transactions_collection.find(query, {field: 1 for field in FINGERPRINT_FIELDS}) # noqa E507
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+
+        if not len(batch):
+            break
+
+        operations: list[UpdateOne] = [
+            UpdateOne(
+                {"_id": document["_id"], "fingerprint": {"$exists": False}},
+                {"$set": {"fingerprint": transaction_fingerprint(document)}},
+            )
+            for document in batch
+        ]
+
+        # Ordered writes make the first transaction of a group keep the fingerprint.
+        failure: BulkWriteError | None = None
+        errors: list[dict] = []
+        try:
+            modified: int = transactions_collection.bulk_write(
+                operations,
+                ordered=True,
+            ).modified_count
+        except BulkWriteError as error:
+            failure = error
+            modified: int = error.details.get("nModified", 0)
+            errors = error.details.get("writeErrors", [])
+
+        fingerprinted += modified
+        if modified:
+            bump_transactions_generation(database)
+
+        if len(errors):
+            if any(_error.get("code") != DUPLICATE_KEY_ERROR for _error in errors):
+                raise failure
+            duplicates += len(errors)
+            # An ordered write stops at the first error: resume after it.
+            failed: int = errors[0]["index"]
+            last_id = batch[failed]["_id"]
+            continue
+
+        last_id = batch[-1]["_id"]
+        get_logger().info(
+            message=(
+                f"Fingerprinted {fingerprinted} transactions, {duplicates} duplicates,"
+                f" last identifier: {last_id}"
+            )
+        )
+
+    return fingerprinted, duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser("Financial Checker Migrations")
+
+    subparsers = parser.add_subparsers(dest="command", help="Available migrations")
+
+    dates_parser = subparsers.add_parser(
+        name="dates",
+        help="Convert string transaction dates into native BSON dates",
+    )
+    dates_parser.add_argument("-b", "--batch-size", type=int, default=1000)
+    dates_parser.add_argument(
+        "-r",
+        "--resume-after",
+        type=str,
+        help="Identifier of the last transaction converted by a previous run",
+        default=None,
+    )
+
+    rollups_parser = subparsers.add_parser(
+        name="rollups",
+        help="Rebuild the daily transaction rollups from the transactions",
+    )
+    rollups_parser.add_argument("-b", "--batch-size", type=int, default=10000)
+    rollups_parser.add_argument(
+        "-r",
+        "--resume-after",
+        type=str,
+        help="Identifier of the last transaction rolled up by a previous run",
+        default=None,
+    )
+
+    fingerprints_parser = subparsers.add_parser(
+        name="fingerprints",
+        help="Store the duplicate-detection fingerprint of older transactions",
+    )
+    fingerprints_parser.add_argument("-b", "--batch-size", type=int, default=1000)
+    fingerprints_parser.add_argument(
+        "-r",
+        "--resume-after",
+        type=str,
+        help="Identifier of the last transaction processed by a previous run",
+        default=None,
+    )
+
+    args = parser.parse_args()
+
+    match args.command:
+        case "dates":
+            migrated = migrate_transaction_dates(
+                database=MongoDBInstance().database,
+                batch_size=args.batch_size,
+                resume_after=args.resume_after,
+            )
+            print(f"Converted transactions -> {migrated}")
+        case "rollups":
+            rolled_up = rebuild_rollups(
+                database=MongoDBInstance().database,
+                batch_size=args.batch_size,
+                resume_after=args.resume_after,
+            )
+            print(f"Rolled up transactions -> {rolled_up}")
+        case "fingerprints":
+            fingerprinted, duplicates = backfill_fingerprints(
+                database=MongoDBInstance().database,
+                batch_size=args.batch_size,
+                resume_after=args.resume_after,
+            )
+            print(f"Fingerprinted transactions -> {fingerprinted}")
+            print(f"Duplicates left without fingerprint -> {duplicates}")
+        case _:
+            parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
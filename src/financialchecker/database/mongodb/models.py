@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING
 
 from financialchecker.log.models import LogType
 
+if TYPE_CHECKING:
+    from bson import ObjectId
+
 
 @dataclass
 class Log:
@@ -13,9 +18,151 @@ class Log:
         ModuleName (str): Name of the module related to the log entry.
         Level (LogType): Log level indicating the severity of the log entry.
         Message (str): Log message providing information or details.
+        Timestamp (datetime): UTC time at which the entry was logged.
     """
 
     PackageName: str
     ModuleName: str
     Level: LogType
     Message: str
+    Timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass(frozen=True)
+class TransactionQuery:
+    """
+    Data class representing the filters applied to a transactions query.
+
+    Attributes:
+        start_date (date | None): Earliest transaction date included, if any.
+        end_date (date | None): Latest transaction date included, if any.
+        categories (tuple[str, ...]): Categories to include; empty means all.
+        transaction_methods (tuple[str, ...]): Payment methods to include; empty
+            means all.
+        firms (tuple[str, ...]): Firms to include; empty means all.
+        locations (tuple[str, ...]): Locations to include; empty means all.
+    """
+
+    start_date: date | None = None
+    end_date: date | None = None
+    categories: tuple[str, ...] = ()
+    transaction_methods: tuple[str, ...] = ()
+    firms: tuple[str, ...] = ()
+    locations: tuple[str, ...] = ()
+
+    def to_match(
+        self,
+    ) -> dict:
+        """
+        Compile the filters into the body of a `$match` stage.
+
+        Returns:
+            dict: The match conditions; an empty dictionary matches every
+                transaction.
+        """
+
+        match: dict = {}
+
+        date_range: dict = {}
+        legacy_date_range: dict = {}
+        if self.start_date is not None:
+            date_range["$gte"] = datetime.combine(self.start_date, time.min)
+            legacy_date_range["$gte"] = self.start_date.strftime("%Y-%m-%d")
+        if self.end_date is not None:
+            date_range["$lt"] = datetime.combine(self.end_date + timedelta(days=1),
+                                                 time.min)
+            legacy_date_range["$lte"] = self.end_date.strftime("%Y-%m-%d")
+        if date_range:
+            # Documents written before the date migration store "%Y-%m-%d" strings,
+            # which BSON never compares with dates, so both forms are matched.
+            match["$or"] = [
+                {"date": date_range},
+                {"date": legacy_date_range},
+            ]
+
+        for key, values in (
+            ("category", self.categories),
+            ("transaction_method", self.transaction_methods),
+            ("firm", self.firms),
+            ("location", self.locations),
+        ):
+            if len(values):
+                match[key] = {"$in": list(values)}
+
+        return match
+
+
+@dataclass
+class BatchInsertResult:
+    """
+    Data class representing the outcome of one batch of a bulk insert.
+
+    Attributes:
+        batch (int): Position of the batch within the bulk insert, starting at 0.
+        inserted_ids (list[ObjectId]): Identifiers of the inserted documents.
+        errors (list[dict]): Write errors reported by MongoDB for the batch; each
+            error carries the `index` of the failed document within the batch.
+        duplicates (int): Transactions of the batch skipped because an identical
+            transaction is already stored or appears earlier in the batch.
+    """
+
+    batch: int
+    inserted_ids: list["ObjectId"] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    duplicates: int = 0
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Data class representing the position of the last transaction of a page in the
+    (date, _id) order.
+
+    Attributes:
+        date (datetime): Date of the last transaction of the page.
+        id (str): Identifier of the last transaction of the page.
+    """
+
+    date: datetime
+    id: str
+
+    def encode(
+        self,
+    ) -> str:
+        return f"{self.date.isoformat()}_{self.id}"
+
+    @classmethod
+    def decode(
+        cls,
+        cursor: str,
+    ) -> "PageCursor":
+        """
+        Parse a cursor produced by `encode`.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+
+        try:
+            transaction_date, transaction_id = cursor.rsplit("_", 1)
+            if len(transaction_id) != 24:
+                raise ValueError
+            int(transaction_id, 16)
+            return cls(date=datetime.fromisoformat(transaction_date), id=transaction_id)
+        except ValueError:
+            raise ValueError(f"Invalid page cursor: {cursor}") from None
+
+
+@dataclass
+class TransactionPage:
+    """
+    Data class representing one page of transactions.
+
+    Attributes:
+        transactions (list[dict]): The transactions of the page, with their `id`.
+        next_cursor (str | None): Cursor of the following page, None on the last
+            page.
+    """
+
+    transactions: list[dict] = field(default_factory=list)
+    next_cursor: str | None = None
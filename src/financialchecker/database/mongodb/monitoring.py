@@ -0,0 +1,139 @@
+import threading
+import time
+
+import bson
+from pymongo import monitoring
+
+from financialchecker.utils.metrics import metrics
+
+
+class PoolStatisticsListener(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener keeping running counters of the pool activity.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: dict[str, int] = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checked_out": 0,
+            "checked_in": 0,
+            "check_out_failures": 0,
+            "pools_cleared": 0,
+        }
+
+    def _increment(
+        self,
+        counter: str,
+    ) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def statistics(
+        self,
+    ) -> dict[str, int]:
+        """
+        Get a snapshot of the pool counters.
+
+        Returns:
+            dict[str, int]: The counters, plus the currently open connections and the
+                connections currently checked out by operations.
+        """
+
+        with self._lock:
+            counters: dict[str, int] = dict(self._counters)
+
+        counters["open_connections"] = (
+            counters["connections_created"] - counters["connections_closed"]
+        )
+        counters["in_use"] = counters["checked_out"] - counters["checked_in"]
+        return counters
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        self._increment("pools_cleared")
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self._increment("connections_created")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._increment("connections_closed")
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        self._increment("check_out_failures")
+
+    def connection_checked_out(self, event) -> None:
+        self._increment("checked_out")
+
+    def connection_checked_in(self, event) -> None:
+        self._increment("checked_in")
+
+
+class HealthListener(monitoring.ServerHeartbeatListener):
+    """
+    Server heartbeat listener recording the outcome of the driver's own background
+    heartbeats, so the connection health is known without issuing extra commands.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.healthy: bool | None = None
+        self.last_heartbeat: float = 0.0
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        self.healthy = True
+        self.last_heartbeat = time.monotonic()
+
+    def failed(self, event) -> None:
+        self.healthy = False
+        self.last_heartbeat = time.monotonic()
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Command listener recording the latency and reply size of every database
+    command while metrics are enabled.
+
+    Note:
+        Commands are recorded as `mongodb.<command>` operations, and the reply bytes
+        are also charged to the instrumented operation that issued the command,
+        since command events are published on the calling thread. Measuring a reply
+        re-encodes it, which is only done while metrics are enabled.
+    """
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        if not metrics.enabled:
+            return
+
+        operation: str = f"mongodb.{event.command_name}"
+        nbytes: int = len(bson.encode(event.reply))
+        metrics.record(operation, event.duration_micros / 1e6)
+        metrics.add_bytes(nbytes, operation=operation)
+        metrics.add_bytes(nbytes)
+
+    def failed(self, event) -> None:
+        if metrics.enabled:
+            metrics.record(f"mongodb.{event.command_name}",
+                           event.duration_micros / 1e6,
+                           error=True)
@@ -0,0 +1,130 @@
+PERIOD_TRUNCATIONS: dict[str, dict] = {
+    "daily": {
+        "$dateFromParts": {
+            "year": {"$year": "$_date"},
+            "month": {"$month": "$_date"},
+            "day": {"$dayOfMonth": "$_date"},
+        }
+    },
+    "weekly": {
+        "$dateFromParts": {
+            "isoWeekYear": {"$isoWeekYear": "$_date"},
+            "isoWeek": {"$isoWeek": "$_date"},
+        }
+    },
+    "monthly": {
+        "$dateFromParts": {
+            "year": {"$year": "$_date"},
+            "month": {"$month": "$_date"},
+        }
+    },
+    "yearly": {
+        "$dateFromParts": {
+            "year": {"$year": "$_date"},
+        }
+    },
+}
+
+UTILITY_TYPES: tuple[str, ...] = (
+    "Category",
+    "IncomeCategory",
+    "PaymentMethod",
+    "Firm",
+    "Location",
+)
+
+GROUPING_FIELDS: tuple[str, ...] = (
+    "category",
+    "transaction_method",
+    "firm",
+    "location",
+)
+
+
+def period_totals_pipeline(
+    match: dict,
+    period: str,
+    group_by: str | None = None,
+) -> list[dict]:
+    """
+    Build the aggregation pipeline summing transactions by period.
+
+    Parameters:
+        match (dict): Body of the `$match` stage selecting the transactions.
+        period (str): One of "daily", "weekly", "monthly" or "yearly". Weekly buckets
+            start on the ISO week Monday.
+        group_by (str | None, optional): Additional field to split each period by,
+            one of `GROUPING_FIELDS`. Defaults to None.
+
+    Returns:
+        list[dict]: The pipeline, producing one document per bucket with the fields
+            `period` (start of the bucket), `amount`, `count` and, if requested, the
+            `group_by` field, sorted by period.
+
+    Raises:
+        ValueError: If the period or the grouping field is not supported.
+    """
+
+    if period not in PERIOD_TRUNCATIONS:
+        raise ValueError(f"Unsupported period: {period}")
+    if group_by is not None and group_by not in GROUPING_FIELDS:
+        raise ValueError(f"Unsupported grouping field: {group_by}")
+
+    key: dict = {"period": PERIOD_TRUNCATIONS[period]}
+    projection: dict = {"_id": 0, "period": "$_id.period", "amount": 1, "count": 1}
+
+    if group_by is not None:
+        key[group_by] = f"${group_by}"
+        projection[group_by] = f"$_id.{group_by}"
+
+    pipeline: list[dict] = []
+
+    if match:
+        pipeline.append({"$match": match})
+
+    pipeline.extend(
+        [
+            {"$addFields": {"_date": {"$toDate": "$date"}}},
+            {
+                "$group": {
+                    "_id": key,
+                    "amount": {"$sum": "$amount"},
+                    "count": {"$sum": 1},
+                }
+            },
+            {"$sort": {"_id.period": 1}},
+            {"$project": projection},
+        ]
+    )
+
+    return pipeline
+
+
+def utilities_pipeline(
+    utility_types: tuple[str, ...] = UTILITY_TYPES,
+) -> list[dict]:
+    """
+    Build the aggregation pipeline reading every utility list in one round trip.
+
+    Parameters:
+        utility_types (tuple[str, ...], optional): The utility types to read.
+            Defaults to `UTILITY_TYPES`.
+
+    Returns:
+        list[dict]: The pipeline, producing a single document with one field per
+            utility type holding its `{"value": ...}` documents sorted by value.
+    """
+
+    return [
+        {"$match": {"type": {"$in": list(utility_types)}}},
+        {
+            "$facet": {
+                utility_type: [
+                    {"$match": {"type": utility_type}},
+                    {"$sort": {"value": 1}},
+                    {"$project": {"_id": 0, "value": 1}},
+                ]
+                for utility_type in utility_types
+            }
+        },
+    ]
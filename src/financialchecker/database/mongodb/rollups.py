@@ -0,0 +1,121 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from pymongo import UpdateOne
+
+from financialchecker.database.mongodb.models import TransactionQuery
+from financialchecker.transactions._transactions import TransactionType
+
+ROLLUP_FIELDS: tuple[str, ...] = (
+    "type",
+    "category",
+    "transaction_method",
+)
+
+
+def rollup_day(
+    value: datetime | date | str,
+) -> datetime:
+    """
+    Truncate a transaction date to the day it belongs to.
+
+    Parameters:
+        value (datetime | date | str): The stored date, as a BSON date or as a
+            "%Y-%m-%d" string written before the date migration.
+
+    Returns:
+        datetime: Midnight of the transaction day.
+    """
+
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d")
+    if isinstance(value, datetime):
+        return datetime.combine(value.date(), time.min)
+    return datetime.combine(value, time.min)
+
+
+def rollup_updates(
+    documents: Iterable[dict],
+) -> list[UpdateOne]:
+    """
+    Build the upserts adding transactions to the daily rollups.
+
+    Parameters:
+        documents (Iterable[dict]): The transaction documents.
+
+    Returns:
+        list[UpdateOne]: One `$inc` upsert per (day, type, category, payment method)
+            present in the documents, incrementing its `amount` and `count`.
+
+    Note:
+        Documents are summed in memory first, so a batch of transactions costs one
+        update per distinct rollup rather than one per transaction.
+    """
+
+    totals: dict[tuple, list] = {}
+
+    for document in documents:
+        key: tuple = (rollup_day(document["date"]),
+                      *(document.get(field, "") for field in ROLLUP_FIELDS))
+        total: list | None = totals.get(key)
+        if total is None:
+            totals[key] = [document["amount"], 1]
+        else:
+            total[0] += document["amount"]
+            total[1] += 1
+
+    return [
+        UpdateOne(
+            {"day": key[0], **dict(zip(ROLLUP_FIELDS, key[1:]))},
+            {"$inc": {"amount": amount, "count": count}},
+            upsert=True,
+        )
+        for key, (amount, count) in totals.items()
+    ]
+
+
+def rollups_match(
+    transaction_type: str | None = None,
+    query: TransactionQuery | None = None,
+) -> dict:
+    """
+    Compile transaction filters into the body of a `$match` stage on the rollups.
+
+    Parameters:
+        transaction_type (str | None, optional): Type of the transactions. Defaults
+            to every type.
+        query (TransactionQuery | None, optional): The date, category and payment
+            method filters. Defaults to None.
+
+    Returns:
+        dict: The match conditions.
+
+    Raises:
+        ValueError: If the query filters on firms or locations, which the rollups do
+            not keep.
+    """
+
+    match: dict = {}
+
+    if transaction_type is not None and TransactionType.has(transaction_type):
+        match["type"] = transaction_type
+
+    if query is None:
+        return match
+
+    if query.firms or query.locations:
+        raise ValueError("Rollups cannot be filtered by firm or location")
+
+    day_range: dict = {}
+    if query.start_date is not None:
+        day_range["$gte"] = rollup_day(query.start_date)
+    if query.end_date is not None:
+        day_range["$lt"] = rollup_day(query.end_date) + timedelta(days=1)
+    if day_range:
+        match["day"] = day_range
+    if query.categories:
+        match["category"] = {"$in": list(query.categories)}
+    if query.transaction_methods:
+        match["transaction_method"] = {"$in": list(query.transaction_methods)}
+
+    return match
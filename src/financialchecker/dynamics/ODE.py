@@ -1,18 +1,261 @@
+from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy.integrate import solve_ivp
+
 from financialchecker.data.estimates import Estimator, Period
+from financialchecker.data.periods import PERIOD_DAYS
+from financialchecker.data.snapshot import TransactionSnapshot
+from financialchecker.dynamics.stochastic import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_PERCENTILES,
+    ForecastBands,
+    simulate_balance_paths,
+)
+from financialchecker.transactions._transactions import TransactionType
+
+CLOSED_FORM: str = "closed_form"
+
+
+@dataclass(frozen=True)
+class BalanceForecast:
+    """
+    Balance trajectories of a batch of scenarios.
+
+    Attributes:
+        times (NDArray): The forecast times, in periods from the start, shape (steps,).
+        balances (NDArray): The balance of every scenario at every time, shape
+            (scenarios, steps).
+    """
+
+    times: NDArray
+    balances: NDArray
+
+    def final_balances(self) -> NDArray:
+        return self.balances[:, -1]
+
+    def depletion_times(self) -> NDArray:
+        """
+        Get the first forecast time at which each scenario's balance is negative.
+
+        Returns:
+            NDArray: One time per scenario, NaN when the balance never goes negative.
+        """
+
+        negative: NDArray = self.balances < 0
+        first: NDArray = negative.argmax(axis=1)
+        return np.where(negative.any(axis=1), self.times[first], np.nan)
+
+
+def closed_form_balance(times: ArrayLike,
+                        initial_balance: ArrayLike,
+                        net_flow: ArrayLike,
+                        interest_rate: ArrayLike = 0.0) -> NDArray:
+    """
+    Evaluate the solution of dB/dt = r * B + c for a batch of scenarios.
+
+    Parameters:
+        times (ArrayLike): The times to evaluate, shape (steps,).
+        initial_balance (ArrayLike): B(0) per scenario.
+        net_flow (ArrayLike): c, income minus expense per period, per scenario.
+        interest_rate (ArrayLike, optional): r per period, per scenario. Defaults to
+            0.0.
+
+    Returns:
+        NDArray: The balances, shape (scenarios, steps).
+
+    Note:
+        B(t) = B0 * exp(r t) + c * expm1(r t) / r, which tends to B0 + c t as r tends
+        to 0; `expm1` keeps small rates accurate. Scenario parameters are broadcast
+        together, so the whole batch is a handful of array operations.
+    """
+
+    times = np.asarray(times, dtype="float64")[np.newaxis, :]
+    initial_balance, net_flow, interest_rate = (
+        parameter[:, np.newaxis]
+        for parameter in _scenarios(initial_balance, net_flow, interest_rate)
+    )
+
+    rate_times: NDArray = interest_rate * times
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth: NDArray = np.where(interest_rate == 0.0,
+                                   times,
+                                   np.expm1(rate_times) / interest_rate)
+
+    return initial_balance * np.exp(rate_times) + net_flow * growth
+
+
+def solve_balance(times: ArrayLike,
+                  initial_balance: ArrayLike,
+                  net_flow: ArrayLike,
+                  interest_rate: ArrayLike = 0.0,
+                  method: str = "RK45",
+                  **solver_options) -> NDArray:
+    """
+    Integrate dB/dt = r * B + c numerically for a batch of scenarios.
+
+    Parameters:
+        times (ArrayLike): The increasing times to evaluate, shape (steps,).
+        initial_balance (ArrayLike): B(0) per scenario.
+        net_flow (ArrayLike): c, income minus expense per period, per scenario.
+        interest_rate (ArrayLike, optional): r per period, per scenario. Defaults to
+            0.0.
+        method (str, optional): The `scipy.integrate.solve_ivp` method. Defaults to
+            "RK45".
+        **solver_options: Further `solve_ivp` options, e.g. `rtol`.
+
+    Returns:
+        NDArray: The balances, shape (scenarios, steps).
+
+    Note:
+        All scenarios are integrated as one system with one state per scenario, so
+        a single solver call covers the batch.
+    """
+
+    times = np.asarray(times, dtype="float64")
+    initial_balance, net_flow, interest_rate = _scenarios(initial_balance,
+                                                          net_flow,
+                                                          interest_rate)
+
+    solution = solve_ivp(lambda _, balance: interest_rate * balance + net_flow,
+                         t_span=(times[0], times[-1]),
+                         y0=initial_balance,
+                         method=method,
+                         t_eval=times,
+                         **solver_options)
+
+    if not solution.success:
+        raise RuntimeError(f"Balance integration failed: {solution.message}")
+
+    return solution.y
+
+
+def _scenarios(*parameters: ArrayLike) -> list[NDArray]:
+    return [
+        np.atleast_1d(parameter).astype("float64", copy=False)
+        for parameter in np.broadcast_arrays(*parameters)
+    ]
 
 
 class PartialDifferentialEquationsMethods:
     def __init__(self,
                  start_date: date | None = None,
                  end_date: date | None = None,
-                 period: Period | str = Period.DAILY) -> None:
+                 period: Period | str = Period.DAILY,
+                 snapshot: TransactionSnapshot | None = None) -> None:
         self._estimator: Estimator = Estimator(start_date=start_date,
-                                               end_date=end_date)
+                                               end_date=end_date,
+                                               snapshot=snapshot)
 
-        self._start_date: date = self._estimator.get_start_date()
-        self._end_date: date = self._estimator.get_end_date()
+        self._start_date: date = self._estimator.get_start_date_expense()
+        self._end_date: date = self._estimator.get_end_date_expense()
 
         self._income_coefficient: float = self._estimator.income_rate_of_change(period=period) # noqa E507
         self._expense_coefficient: float = self._estimator.expense_rate_of_change(period=period) # noqa E507
+
+        # Mean income and expense per period, days without transactions included, so
+        # that both forecast flows measure the same quantity.
+        mean_flows = self._estimator.daily_flows().mean() * PERIOD_DAYS[period]
+        self._mean_income: float = float(mean_flows[TransactionType.INCOME])
+        self._mean_expense: float = float(mean_flows[TransactionType.EXPENSE])
+
+    def forecast(self,
+                 initial_balance: ArrayLike,
+                 horizon: float,
+                 steps: int | None = None,
+                 income: ArrayLike | None = None,
+                 expense: ArrayLike | None = None,
+                 interest_rate: ArrayLike = 0.0,
+                 method: str = CLOSED_FORM,
+                 **solver_options) -> BalanceForecast:
+        """
+        Forecast the balance dB/dt = r * B + I - E over a horizon, for one or many
+        scenarios at once.
+
+        Parameters:
+            initial_balance (ArrayLike): The starting balance, per scenario.
+            horizon (float): The forecast length, in periods.
+            steps (int | None, optional): Number of intervals the horizon is split
+                into. Defaults to one per period.
+            income (ArrayLike | None, optional): Income per period, per scenario.
+                Defaults to the mean income per period over the estimation window.
+            expense (ArrayLike | None, optional): Expense per period, per scenario.
+                Defaults to the mean expense per period over the estimation window.
+            interest_rate (ArrayLike, optional): Growth rate of the balance per
+                period, per scenario. Defaults to 0.0.
+            method (str, optional): "closed_form" for the exact solution, or a
+                `solve_ivp` method name to integrate numerically. Defaults to
+                "closed_form".
+            **solver_options: Further `solve_ivp` options.
+
+        Returns:
+            BalanceForecast: The forecast times and the balance of every scenario.
+        """
+
+        assert horizon > 0
+        steps = steps or max(int(np.ceil(horizon)), 1)
+        times: NDArray = np.linspace(0.0, horizon, steps + 1)
+
+        net_flow: NDArray = (
+            np.asarray(self._mean_income if income is None else income, dtype="float64") # noqa E507
+            - np.asarray(self._mean_expense if expense is None else expense, dtype="float64") # noqa E507
+        )
+
+        if method == CLOSED_FORM:
+            balances: NDArray = closed_form_balance(times,
+                                                    initial_balance,
+                                                    net_flow,
+                                                    interest_rate)
+        else:
+            balances: NDArray = solve_balance(times,
+                                              initial_balance,
+                                              net_flow,
+                                              interest_rate,
+                                              method=method,
+                                              **solver_options)
+
+        return BalanceForecast(times=times, balances=balances)
+
+    def simulate(self,
+                 initial_balance: ArrayLike,
+                 horizon: int,
+                 paths: int = 10_000,
+                 percentiles: ArrayLike = DEFAULT_PERCENTILES,
+                 seed: int | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 workers: int | None = None) -> ForecastBands:
+        """
+        Forecast the balance stochastically, by bootstrapping the daily income and
+        expense totals observed over the estimation window.
+
+        Parameters:
+            initial_balance (ArrayLike): The starting balance, scalar or per path.
+            horizon (int): Number of days to simulate.
+            paths (int, optional): Number of simulated paths. Defaults to 10,000.
+            percentiles (ArrayLike, optional): Percentiles of the returned bands.
+            seed (int | None, optional): Seed making the simulation reproducible.
+            chunk_size (int, optional): Number of paths simulated by one task.
+            memory_budget (int, optional): Approximate bytes the simulated balances
+                may occupy at once.
+            workers (int | None, optional): Number of worker processes.
+
+        Returns:
+            ForecastBands: The percentile bands and depletion probability per day.
+        """
+
+        flows = self._estimator.daily_flows()
+        return simulate_balance_paths(
+            daily_net_flows=(flows[TransactionType.INCOME] - flows[TransactionType.EXPENSE]).to_numpy(), # noqa E507
+            initial_balance=initial_balance,
+            horizon=horizon,
+            paths=paths,
+            percentiles=percentiles,
+            seed=seed,
+            chunk_size=chunk_size,
+            memory_budget=memory_budget,
+            workers=workers,
+        )
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+DEFAULT_PERCENTILES: tuple[float, ...] = (5.0, 25.0, 50.0, 75.0, 95.0)
+DEFAULT_CHUNK_SIZE: int = 10_000
+DEFAULT_MEMORY_BUDGET: int = 256 * 2**20
+
+
+@dataclass(frozen=True)
+class ForecastBands:
+    """
+    Percentile bands of simulated balance paths.
+
+    Attributes:
+        times (NDArray): The simulated days, from 1 to the horizon.
+        percentiles (NDArray): The percentiles of the bands, shape (bands,).
+        bands (NDArray): The balance at every percentile and day, shape
+            (bands, days).
+        depletion_probability (NDArray): The share of paths whose balance has been
+            negative at least once by each day, shape (days,).
+        final_balances (NDArray): The balance of every path at the horizon, shape
+            (paths,).
+    """
+
+    times: NDArray
+    percentiles: NDArray
+    bands: NDArray
+    depletion_probability: NDArray
+    final_balances: NDArray
+
+    def band(self, percentile: float) -> NDArray:
+        return self.bands[np.flatnonzero(self.percentiles == percentile)[0]]
+
+
+def simulate_balance_paths(daily_net_flows: ArrayLike,
+                           initial_balance: ArrayLike,
+                           horizon: int,
+                           paths: int,
+                           percentiles: ArrayLike = DEFAULT_PERCENTILES,
+                           seed: int | None = None,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                           workers: int | None = None) -> ForecastBands:
+    """
+    Simulate balance paths by bootstrapping observed daily net cash flows.
+
+    Parameters:
+        daily_net_flows (ArrayLike): Observed income minus expense of every calendar
+            day, days without transactions included as zero.
+        initial_balance (ArrayLike): The starting balance, scalar or per path.
+        horizon (int): Number of days to simulate.
+        paths (int): Number of paths.
+        percentiles (ArrayLike, optional): Percentiles of the returned bands.
+            Defaults to `DEFAULT_PERCENTILES`.
+        seed (int | None, optional): Seed making the simulation reproducible.
+            Defaults to None.
+        chunk_size (int, optional): Number of paths simulated by one task. Defaults
+            to `DEFAULT_CHUNK_SIZE`.
+        memory_budget (int, optional): Approximate number of bytes the balances of
+            all paths may occupy at once. Defaults to 256 MiB.
+        workers (int | None, optional): Number of worker processes. Defaults to the
+            CPU count when there is more than one chunk; 1 simulates in-process.
+
+    Returns:
+        ForecastBands: The percentile bands and depletion probability per day.
+
+    Note:
+        The horizon is simulated in blocks of days sized so that the balances of
+        every path over one block fit in `memory_budget`; only the last balance of
+        each path is carried to the next block, so memory does not grow with the
+        horizon. Within a block, chunks of paths are simulated in parallel. Every
+        chunk draws each day from its own stream spawned from the seed, so results
+        depend neither on the number of workers nor, up to rounding, on
+        `memory_budget` (but do on `chunk_size`).
+    """
+
+    daily_net_flows = np.asarray(daily_net_flows, dtype="float64")
+    percentiles = np.asarray(percentiles, dtype="float64")
+    assert daily_net_flows.ndim == 1 and len(daily_net_flows)
+    assert horizon > 0 and paths > 0 and chunk_size > 0
+
+    entropy: int = np.random.SeedSequence(seed).entropy
+    balances: NDArray = np.broadcast_to(np.asarray(initial_balance, dtype="float64"), (paths,)).copy() # noqa E507
+    depleted: NDArray = balances < 0
+    chunks: list[slice] = [slice(start, min(start + chunk_size, paths))
+                           for start in range(0, paths, chunk_size)]
+    block_days: int = int(min(horizon, max(1, memory_budget // (8 * paths))))
+
+    bands: NDArray = np.empty((len(percentiles), horizon))
+    depletion_probability: NDArray = np.empty(horizon)
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(chunks) > 1 else 1
+    executor: Executor | None = ProcessPoolExecutor(max_workers=min(workers, len(chunks))) if workers > 1 else None # noqa E507
+
+    try:
+        for start in range(0, horizon, block_days):
+            days: int = min(block_days, horizon - start)
+            arguments: list[tuple] = [
+                (daily_net_flows, balances[chunk], entropy, index, start, days)
+                for index, chunk in enumerate(chunks)
+            ]
+
+            if executor is None:
+                results = (_simulate_chunk(*argument) for argument in arguments)
+            else:
+                results = executor.map(_simulate_chunk, *zip(*arguments))
+
+            block_balances: NDArray = np.empty((paths, days))
+            for chunk, result in zip(chunks, results):
+                block_balances[chunk] = result
+
+            negative: NDArray = np.logical_or.accumulate(block_balances < 0, axis=1)
+            negative |= depleted[:, np.newaxis]
+            depletion_probability[start:start + days] = negative.mean(axis=0)
+            bands[:, start:start + days] = np.percentile(block_balances, percentiles, axis=0) # noqa E507
+
+            balances = block_balances[:, -1].copy()
+            depleted = negative[:, -1].copy()
+            del block_balances, negative
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return ForecastBands(times=np.arange(1, horizon + 1),
+                         percentiles=percentiles,
+                         bands=bands,
+                         depletion_probability=depletion_probability,
+                         final_balances=balances)
+
+
+def _simulate_chunk(daily_net_flows: NDArray,
+                    balances: NDArray,
+                    entropy: int,
+                    chunk: int,
+                    start: int,
+                    days: int) -> NDArray:
+    # Flows are drawn day by day, from streams keyed on the absolute day, so the
+    # split of the horizon into blocks does not change them.
+    flows: NDArray = np.empty((days, len(balances)))
+    for day in range(days):
+        generator: np.random.Generator = np.random.default_rng(
+            np.random.SeedSequence(entropy, spawn_key=(chunk, start + day))
+        )
+        flows[day] = daily_net_flows[generator.integers(len(daily_net_flows), size=len(balances))] # noqa E507
+    np.cumsum(flows, axis=0, out=flows)
+    flows += balances
+    return flows.T
@@ -1,11 +1,7 @@
 import logging
-from dataclasses import asdict
 
-from beartype import beartype
 from financialchecker.database.mongodb.models import Log
-
 from financialchecker.log.models import LogType
-from financialchecker.utils.settings import get_mongodb_collection
 
 
 class Logger:
@@ -42,6 +38,8 @@ class Logger:
             to the console.
             mongo_manager: The MongoDB manager instance if database information is
             provided; otherwise, None.
+            sink (MongoDBLogSink | None): The buffered sink writing the log entries
+            to MongoDB if a MongoDB manager is available; otherwise, None.
 
         Note:
             This method initializes a custom logger instance for logging messages. It
@@ -103,6 +101,7 @@ class Logger:
         )
 
         self.mongo_manager = None
+        self.sink = None
 
         if not kwargs.get(
             "database",
@@ -111,9 +110,11 @@ class Logger:
             if isinstance(kwargs.get("database"), bool):
                 return
 
-            from inkosi.database.mongodb.database import MongoDBInstance
+            from financialchecker.database.mongodb.database import MongoDBInstance
+            from financialchecker.log.sink import get_log_sink
 
             self.mongo_manager = MongoDBInstance()
+            self.sink = get_log_sink(mongo_manager=self.mongo_manager)
 
     def critical(
         self,
@@ -232,7 +233,6 @@ class Logger:
             message=message,
         )
 
-    @beartype
     def __register_to_log__(
         self,
         log_type: LogType,
@@ -247,18 +247,20 @@ class Logger:
 
         Returns:
             None
+
+        Note:
+            The entry is only enqueued; the sink writes it to MongoDB from a
+            background thread.
         """
 
-        if not self.mongo_manager:
+        if self.sink is None:
             return
 
-        self.mongo_manager.database[get_mongodb_collection().Log].insert_one(
-            asdict(
-                Log(
-                    PackageName=self.package_name,
-                    ModuleName=self.module_name,
-                    Level=log_type,
-                    Message=message,
-                )
+        self.sink.put(
+            Log(
+                PackageName=self.package_name,
+                ModuleName=self.module_name,
+                Level=log_type,
+                Message=message,
             )
         )
\ No newline at end of file
@@ -18,3 +18,16 @@ class LogType(EnhancedStrEnum):
     ERROR: str = "ERROR"
     INFO: str = "INFORMATION"
     WARN: str = "WARNING"
+
+
+class LogSinkPolicy(EnhancedStrEnum):
+    """
+    Enumeration class representing what a log sink does when its queue is full.
+
+    Attributes:
+        DROP (str): Discard the new log entry.
+        BLOCK (str): Wait until the queue has room for the new log entry.
+    """
+
+    DROP: str = "drop"
+    BLOCK: str = "block"
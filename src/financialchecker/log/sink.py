@@ -0,0 +1,192 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict
+
+from financialchecker.database.mongodb.models import Log
+from financialchecker.log.models import LogSinkPolicy
+from financialchecker.utils.settings import (
+    get_log_sink_settings,
+    get_mongodb_collection,
+)
+
+_STOP = object()
+
+
+class MongoDBLogSink:
+    """
+    Buffered sink writing log entries to the MongoDB Log collection from a
+    background thread.
+
+    Note:
+        Log entries are appended to a bounded in-memory queue and written with
+        `insert_many` once `batch_size` entries are waiting or `flush_interval`
+        seconds have passed, so logging never waits for the database. When the queue
+        is full, new entries are either dropped (and counted) or the caller waits,
+        depending on the policy. Pending entries are written when the sink is closed,
+        which also happens at interpreter shutdown.
+    """
+
+    def __init__(
+        self,
+        mongo_manager,
+        queue_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        policy: LogSinkPolicy | str | None = None,
+    ) -> None:
+        """
+        Initialize the sink and start its background thread.
+
+        Parameters:
+            mongo_manager: The MongoDB manager exposing the `database` to write to.
+            queue_size (int | None, optional): Maximum number of pending entries.
+                Defaults to the `LogSink.QUEUE_SIZE` setting.
+            batch_size (int | None, optional): Number of pending entries triggering a
+                write. Defaults to the `LogSink.BATCH_SIZE` setting.
+            flush_interval (float | None, optional): Maximum seconds an entry waits
+                before being written. Defaults to the `LogSink.FLUSH_INTERVAL`
+                setting.
+            policy (LogSinkPolicy | str | None, optional): Behaviour when the queue
+                is full. Defaults to the `LogSink.POLICY` setting.
+        """
+
+        settings = get_log_sink_settings()
+
+        self.mongo_manager = mongo_manager
+        self.batch_size: int = batch_size or settings.BATCH_SIZE
+        self.flush_interval: float = flush_interval or settings.FLUSH_INTERVAL
+        self.policy: LogSinkPolicy = LogSinkPolicy(policy or settings.POLICY)
+        self.dropped: int = 0
+
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=queue_size or settings.QUEUE_SIZE,
+        )
+        self._closed: bool = False
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name="MongoDBLogSink",
+            daemon=True,
+        )
+        self._thread.start()
+
+        atexit.register(self.close)
+
+    def put(
+        self,
+        log: Log,
+    ) -> None:
+        """
+        Enqueue a log entry.
+
+        Parameters:
+            log (Log): The log entry.
+        """
+
+        if self._closed:
+            return
+
+        if self.policy == LogSinkPolicy.BLOCK:
+            self._queue.put(log)
+            return
+
+        try:
+            self._queue.put_nowait(log)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(
+        self,
+    ) -> None:
+        """
+        Wait until every enqueued log entry has been written.
+        """
+
+        self._queue.join()
+
+    def close(
+        self,
+    ) -> None:
+        """
+        Write the pending log entries and stop the background thread.
+        """
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(
+        self,
+    ) -> None:
+        stopping: bool = False
+
+        while not stopping:
+            batch: list[Log] = []
+            deadline: float = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0.0),
+                    )
+                except queue.Empty:
+                    break
+
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if len(batch):
+                self._write(batch)
+
+    def _write(
+        self,
+        batch: list[Log],
+    ) -> None:
+        try:
+            self.mongo_manager.database[get_mongodb_collection().Log].insert_many(
+                [asdict(log) for log in batch],
+                ordered=False,
+            )
+        except Exception as error:
+            # Reported through the standard logging module only, to avoid feeding
+            # the failure back into this sink.
+            logging.getLogger(__name__).error(
+                f"Unable to write {len(batch)} log entries to MongoDB: {error}"
+            )
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+_sink: MongoDBLogSink | None = None
+_sink_lock: threading.Lock = threading.Lock()
+
+
+def get_log_sink(
+    mongo_manager,
+) -> MongoDBLogSink:
+    """
+    Get the process-wide log sink, creating it on first use.
+
+    Parameters:
+        mongo_manager: The MongoDB manager used if the sink has to be created.
+
+    Returns:
+        MongoDBLogSink: The shared log sink.
+    """
+
+    global _sink
+
+    with _sink_lock:
+        if _sink is None:
+            _sink = MongoDBLogSink(mongo_manager=mongo_manager)
+
+    return _sink
@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
 
 from financialchecker.utils.utils import EnhancedStrEnum
 
@@ -9,6 +9,8 @@ class TransactionType(EnhancedStrEnum):
 
 
 class Transaction:
+    __slots__ = ("_type", "_amount", "_transaction_method", "_date", "_description")
+
     def __init__(self,
                  transaction_type: TransactionType | str,
                  transaction_amount: float | int,
@@ -28,6 +30,13 @@ class Transaction:
         self._date: date = transaction_date
         self._description: str = transaction_description
 
+    @classmethod
+    def _unchecked(cls, **attributes) -> "Transaction":
+        transaction = cls.__new__(cls)
+        for name, value in attributes.items():
+            setattr(transaction, name, value)
+        return transaction
+
     def get_type(self) -> str:
         return self._type
 
@@ -58,12 +67,12 @@ class Transaction:
     def set_description(self, description) -> None:
         self._description = description
 
-    def __dict__(self) -> dict[str, str | float | bool]:
+    def __dict__(self) -> dict[str, str | float | bool | datetime]:
         return {
             "type": self._type,
             "amount": self._amount,
             "transaction_method": self._transaction_method,
-            "date": datetime.strftime(self._date, "%Y-%m-%d"),
+            "date": datetime.combine(self._date, time.min),
             "description": self._description
         }
 
@@ -0,0 +1,233 @@
+from datetime import date
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from financialchecker.transactions._transactions import Transaction, TransactionType
+from financialchecker.transactions.expense import Expense
+from financialchecker.transactions.income import Income
+
+STRING_COLUMNS: tuple[str, ...] = (
+    "type",
+    "transaction_method",
+    "description",
+    "category",
+    "firm",
+    "location",
+)
+
+
+class StringColumn:
+    """
+    Dictionary encoded string column: every row stores an integer code into the
+    array of the distinct values, so repeated strings are kept only once.
+    """
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: NDArray[np.int32], values: NDArray[np.object_]) -> None:
+        self.codes: NDArray[np.int32] = codes
+        self.values: NDArray[np.object_] = values
+
+    @classmethod
+    def encode(cls, strings: Sequence[str]) -> "StringColumn":
+        values, codes = np.unique(np.asarray(strings, dtype=np.object_),
+                                  return_inverse=True)
+        return cls(codes.astype(np.int32).reshape(-1), values)
+
+    def decode(self) -> NDArray[np.object_]:
+        return self.values[self.codes]
+
+    def isin(self, strings: Iterable[str]) -> NDArray[np.bool_]:
+        return np.isin(self.values, list(strings))[self.codes]
+
+    def __getitem__(self, key: slice | NDArray) -> "StringColumn":
+        return StringColumn(self.codes[key], self.values)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class TransactionBatch:
+    """
+    Struct-of-arrays container of transactions: amounts and dates are NumPy columns
+    and the string fields are dictionary encoded, so a batch is built, validated,
+    filtered and serialised column by column instead of object by object. Iterating
+    a batch still yields `Expense` and `Income` objects.
+    """
+
+    __slots__ = ("_amounts", "_dates", "_advance_payments", "_strings")
+
+    def __init__(self,
+                 amounts: NDArray[np.float64],
+                 dates: NDArray[np.datetime64],
+                 advance_payments: NDArray[np.bool_],
+                 strings: dict[str, StringColumn]) -> None:
+        assert set(strings) == set(STRING_COLUMNS)
+        assert all(len(column) == len(amounts) for column in (dates, advance_payments, *strings.values())) # noqa E507
+
+        self._amounts: NDArray[np.float64] = amounts
+        self._dates: NDArray[np.datetime64] = dates
+        self._advance_payments: NDArray[np.bool_] = advance_payments
+        self._strings: dict[str, StringColumn] = strings
+
+    @classmethod
+    def from_columns(cls,
+                     types: Sequence[str],
+                     amounts: Sequence[float],
+                     transaction_methods: Sequence[str],
+                     dates: Sequence[date | str],
+                     descriptions: Sequence[str] | None = None,
+                     categories: Sequence[str] | None = None,
+                     advance_payments: Sequence[bool] | None = None,
+                     firms: Sequence[str] | None = None,
+                     locations: Sequence[str] | None = None,
+                     validate: bool = True) -> "TransactionBatch":
+        size: int = len(types)
+        strings: dict[str, StringColumn] = {
+            column: StringColumn.encode(values if values is not None else [""] * size)
+            for column, values in zip(STRING_COLUMNS, (types, transaction_methods, descriptions, categories, firms, locations)) # noqa E507
+        }
+        batch = cls(
+            amounts=np.asarray(amounts, dtype=np.float64),
+            dates=np.asarray(dates, dtype="datetime64[D]"),
+            advance_payments=np.asarray(advance_payments if advance_payments is not None else np.zeros(size), dtype=np.bool_), # noqa E507
+            strings=strings,
+        )
+
+        if validate:
+            batch.validate()
+        return batch
+
+    @classmethod
+    def from_transactions(cls,
+                          transactions: Iterable[Transaction]) -> "TransactionBatch":
+        columns: dict[str, list] = {
+            "types": [],
+            "amounts": [],
+            "transaction_methods": [],
+            "dates": [],
+            "descriptions": [],
+            "categories": [],
+            "advance_payments": [],
+            "firms": [],
+            "locations": [],
+        }
+
+        for transaction in transactions:
+            columns["types"].append(transaction._type)
+            columns["amounts"].append(transaction._amount)
+            columns["transaction_methods"].append(transaction._transaction_method)
+            columns["dates"].append(transaction._date)
+            columns["descriptions"].append(transaction._description)
+            columns["categories"].append(getattr(transaction, "_category", ""))
+            columns["advance_payments"].append(getattr(transaction, "_advance_payment", False)) # noqa E507
+            columns["firms"].append(getattr(transaction, "_firm", ""))
+            columns["locations"].append(getattr(transaction, "_location", ""))
+
+        return cls.from_columns(**columns, validate=False)
+
+    @property
+    def amounts(self) -> NDArray[np.float64]:
+        return self._amounts
+
+    @property
+    def dates(self) -> NDArray[np.datetime64]:
+        return self._dates
+
+    @property
+    def advance_payments(self) -> NDArray[np.bool_]:
+        return self._advance_payments
+
+    def strings(self, column: str) -> StringColumn:
+        return self._strings[column]
+
+    def invalid(self) -> NDArray[np.bool_]:
+        mask: NDArray[np.bool_] = ~self._strings["type"].isin(TransactionType.list())
+        mask |= ~(self._amounts >= 0.01)
+        mask |= np.isnat(self._dates)
+        return mask
+
+    def validate(self) -> None:
+        invalid: NDArray[np.intp] = np.flatnonzero(self.invalid())
+
+        if len(invalid):
+            raise ValueError(f"{len(invalid)} invalid transactions, first at position {invalid[0]}") # noqa E507
+
+    def filter(self, mask: NDArray[np.bool_]) -> "TransactionBatch":
+        return self[np.asarray(mask, dtype=np.bool_)]
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def __getitem__(self, key: int | slice | NDArray) -> "Transaction | TransactionBatch": # noqa E507
+        if isinstance(key, int | np.integer):
+            if not -len(self) <= key < len(self):
+                raise IndexError("TransactionBatch index out of range")
+            return next(iter(self[key:key + 1 or None]))
+
+        return TransactionBatch(
+            amounts=self._amounts[key],
+            dates=self._dates[key],
+            advance_payments=self._advance_payments[key],
+            strings={column: values[key] for column, values in self._strings.items()}, # noqa E507
+        )
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for (transaction_type, amount, transaction_method, transaction_date,
+             description, category, advance_payment, firm, location) in zip(*self._rows(as_datetime=False)): # noqa E507
+            if transaction_type == TransactionType.EXPENSE:
+                yield Expense._unchecked(_type=transaction_type,
+                                         _amount=amount,
+                                         _transaction_method=transaction_method,
+                                         _date=transaction_date,
+                                         _description=description,
+                                         _category=category,
+                                         _advance_payment=advance_payment,
+                                         _firm=firm,
+                                         _location=location)
+            else:
+                yield Income._unchecked(_type=transaction_type,
+                                        _amount=amount,
+                                        _transaction_method=transaction_method,
+                                        _date=transaction_date,
+                                        _description=description,
+                                        _category=category)
+
+    def to_documents(self) -> list[dict]:
+        documents: list[dict] = []
+
+        for (transaction_type, amount, transaction_method, transaction_date,
+             description, category, advance_payment, firm, location) in zip(*self._rows(as_datetime=True)): # noqa E507
+            document: dict = {
+                "type": transaction_type,
+                "amount": amount,
+                "transaction_method": transaction_method,
+                "date": transaction_date,
+                "description": description,
+                "category": category,
+            }
+            if transaction_type == TransactionType.EXPENSE:
+                document["advance_payment"] = advance_payment
+                document["firm"] = firm
+                document["location"] = location
+            documents.append(document)
+
+        return documents
+
+    def _rows(self, as_datetime: bool) -> tuple[list, ...]:
+        # datetime64[D] converts to `date` objects, finer units to `datetime` ones.
+        dates: NDArray = self._dates.astype("datetime64[us]") if as_datetime else self._dates # noqa E507
+
+        return (
+            self._strings["type"].decode().tolist(),
+            self._amounts.tolist(),
+            self._strings["transaction_method"].decode().tolist(),
+            dates.tolist(),
+            self._strings["description"].decode().tolist(),
+            self._strings["category"].decode().tolist(),
+            self._advance_payments.tolist(),
+            self._strings["firm"].decode().tolist(),
+            self._strings["location"].decode().tolist(),
+        )
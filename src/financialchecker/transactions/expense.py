@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime
 
 from financialchecker.transactions._transactions import Transaction, TransactionType
 
 
 class Expense(Transaction):
+    __slots__ = ("_category", "_advance_payment", "_firm", "_location")
+
     def __init__(self,
                  transaction_category: str,
                  transaction_amount: float | int,
@@ -23,7 +25,7 @@ class Expense(Transaction):
         self._firm: str = transaction_firm
         self._location: str = transaction_location
 
-    def __dict__(self,) -> dict[str, str | float | bool]:
+    def __dict__(self,) -> dict[str, str | float | bool | datetime]:
         _tmp = super().__dict__()
         _tmp["category"] = self._category
         _tmp["advance_payment"] = self._advance_payment
@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime
 
 from financialchecker.transactions._transactions import Transaction, TransactionType
 
 
 class Income(Transaction):
+    __slots__ = ("_category",)
+
     def __init__(self,
                  transaction_category: str,
                  transaction_amount: float | int,
@@ -17,7 +19,7 @@ class Income(Transaction):
                          transaction_description=transaction_description)
         self._category: str = transaction_category
 
-    def __dict__(self,) -> dict[str, str | float | bool]:
+    def __dict__(self,) -> dict[str, str | float | bool | datetime]:
         _tmp = super().__dict__()
         _tmp["category"] = self._category
 
@@ -0,0 +1,88 @@
+import threading
+import time
+from typing import Any, Hashable
+
+
+class TimedCache:
+    """
+    Thread-safe in-process cache whose entries expire after a time-to-live.
+
+    Note:
+        Entries are shared by every user of the same instance in the process, which
+        makes it suitable for values that are identical across Streamlit sessions.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+            ttl (float): Number of seconds an entry stays valid.
+        """
+
+        self._ttl: float = ttl
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        default: Any = None,
+    ) -> Any:
+        """
+        Get a cached value.
+
+        Parameters:
+            key (Hashable): The entry key.
+            default (Any, optional): Value returned when the entry is missing or
+                expired. Defaults to None.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+
+        with self._lock:
+            entry: tuple[float, Any] | None = self._entries.get(key)
+
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+    ) -> None:
+        """
+        Store a value, replacing any previous entry for the key.
+
+        Parameters:
+            key (Hashable): The entry key.
+            value (Any): The value to cache.
+        """
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def invalidate(
+        self,
+        key: Hashable | None = None,
+    ) -> None:
+        """
+        Drop a single entry, or every entry when no key is given.
+
+        Parameters:
+            key (Hashable | None, optional): The entry key. Defaults to None.
+        """
+
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
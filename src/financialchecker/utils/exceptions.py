@@ -1,2 +1,2 @@
-class MongoDBConnectionError:
+class MongoDBConnectionError(Exception):
     "Unable to properly connect to the MongoDB Server Instance"
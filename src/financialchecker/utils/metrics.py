@@ -0,0 +1,314 @@
+import atexit
+import functools
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, # noqa E507
+)
+
+
+class OperationMetrics:
+    """
+    Latency histogram and counters of one operation.
+    """
+
+    __slots__ = ("buckets", "count", "errors", "seconds", "documents", "bytes")
+
+    def __init__(
+        self,
+    ) -> None:
+        # One counter per bucket upper bound, plus one for +Inf; not cumulative.
+        self.buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count: int = 0
+        self.errors: int = 0
+        self.seconds: float = 0.0
+        self.documents: int = 0
+        self.bytes: int = 0
+
+    def cumulative_buckets(
+        self,
+    ) -> list[tuple[str, int]]:
+        bounds: list[str] = [repr(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        totals: list[int] = []
+        total: int = 0
+        for count in self.buckets:
+            total += count
+            totals.append(total)
+        return list(zip(bounds, totals))
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of the operation metrics.
+
+    Note:
+        Recording is disabled by default. While disabled, instrumented functions
+        only check the `enabled` attribute before calling through, so the
+        instrumentation can stay on hot paths.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.enabled: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._operations: dict[str, OperationMetrics] = {}
+        self._local: threading.local = threading.local()
+
+    def record(
+        self,
+        operation: str,
+        seconds: float,
+        documents: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        Record one call of an operation.
+
+        Parameters:
+            operation (str): The operation name.
+            seconds (float): The call duration.
+            documents (int, optional): Number of documents read or written.
+                Defaults to 0.
+            error (bool, optional): Whether the call raised. Defaults to False.
+        """
+
+        with self._lock:
+            entry: OperationMetrics = self._operation(operation)
+            entry.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            entry.count += 1
+            entry.errors += error
+            entry.seconds += seconds
+            entry.documents += documents
+
+    def add_bytes(
+        self,
+        nbytes: int,
+        operation: str | None = None,
+    ) -> None:
+        """
+        Count bytes received from the database.
+
+        Parameters:
+            nbytes (int): The number of bytes.
+            operation (str | None, optional): The operation to charge. Defaults to
+                the innermost instrumented operation running on this thread.
+        """
+
+        operation = operation or self.current_operation()
+        if operation is None:
+            return
+
+        with self._lock:
+            self._operation(operation).bytes += nbytes
+
+    def current_operation(
+        self,
+    ) -> str | None:
+        stack: list[str] | None = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def reset(
+        self,
+    ) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def to_dict(
+        self,
+    ) -> dict[str, dict]:
+        """
+        Get a snapshot of the metrics.
+
+        Returns:
+            dict[str, dict]: Per operation, the call and error counts, total and
+                mean seconds, documents, bytes and cumulative latency buckets.
+        """
+
+        with self._lock:
+            return {
+                operation: {
+                    "count": entry.count,
+                    "errors": entry.errors,
+                    "seconds": entry.seconds,
+                    "mean_seconds": entry.seconds / entry.count if entry.count else 0.0, # noqa E507
+                    "documents": entry.documents,
+                    "bytes": entry.bytes,
+                    "buckets": dict(entry.cumulative_buckets()),
+                }
+                for operation, entry in sorted(self._operations.items())
+            }
+
+    def to_prometheus(
+        self,
+    ) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, ready to be written to a textfile collector file.
+        """
+
+        snapshot: dict[str, dict] = self.to_dict()
+        lines: list[str] = [
+            "# HELP financialchecker_operation_seconds Latency of the instrumented operations.", # noqa E507
+            "# TYPE financialchecker_operation_seconds histogram",
+        ]
+        for operation, entry in snapshot.items():
+            label: str = f'operation="{operation}"'
+            for bound, count in entry["buckets"].items():
+                lines.append(f'financialchecker_operation_seconds_bucket{{{label},le="{bound}"}} {count}') # noqa E507
+            lines.append(f"financialchecker_operation_seconds_sum{{{label}}} {entry['seconds']}") # noqa E507
+            lines.append(f"financialchecker_operation_seconds_count{{{label}}} {entry['count']}") # noqa E507
+
+        for name, key, description in (
+            ("errors", "errors", "Calls that raised an exception."),
+            ("documents", "documents", "Documents read or written."),
+            ("bytes", "bytes", "Bytes received from the database."),
+        ):
+            lines.append(f"# HELP financialchecker_operation_{name}_total {description}") # noqa E507
+            lines.append(f"# TYPE financialchecker_operation_{name}_total counter")
+            for operation, entry in snapshot.items():
+                lines.append(f'financialchecker_operation_{name}_total{{operation="{operation}"}} {entry[key]}') # noqa E507
+
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self,
+        path: str | Path,
+    ) -> None:
+        """
+        Write the metrics to a file, as JSON when its suffix is `.json` and in the
+        Prometheus text format otherwise.
+
+        Parameters:
+            path (str | Path): The output file; "-" prints the JSON to stderr.
+        """
+
+        if str(path) == "-":
+            print(json.dumps(self.to_dict(), indent=2), file=sys.stderr)
+            return
+
+        path = Path(path)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_dict(), indent=2))
+        else:
+            path.write_text(self.to_prometheus())
+
+    def _operation(
+        self,
+        operation: str,
+    ) -> OperationMetrics:
+        entry: OperationMetrics | None = self._operations.get(operation)
+        if entry is None:
+            entry = self._operations[operation] = OperationMetrics()
+        return entry
+
+    def _push(
+        self,
+        operation: str,
+    ) -> None:
+        stack: list[str] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(operation)
+
+    def _pop(
+        self,
+    ) -> None:
+        self._local.stack.pop()
+
+
+metrics: MetricsRegistry = MetricsRegistry()
+
+_configured: bool = False
+_outputs: set[str] = set()
+
+
+def instrumented(
+    operation: str | None = None,
+    documents: Callable[[Any], int] | None = None,
+) -> Callable[[F], F]:
+    """
+    Decorate a function so its calls are recorded while metrics are enabled.
+
+    Parameters:
+        operation (str | None, optional): The operation name. Defaults to the
+            function's qualified name.
+        documents (Callable[[Any], int] | None, optional): Function computing the
+            number of documents from the return value. Defaults to None.
+
+    Returns:
+        Callable[[F], F]: The decorator.
+    """
+
+    def decorator(function: F) -> F:
+        name: str = operation or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+
+            metrics._push(name)
+            start: float = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                metrics.record(name, time.perf_counter() - start, error=True)
+                raise
+            finally:
+                metrics._pop()
+
+            metrics.record(name,
+                           time.perf_counter() - start,
+                           documents=documents(result) if documents else 0)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def configure_metrics(
+    enabled: bool | None = None,
+    output: str | None = None,
+) -> MetricsRegistry:
+    """
+    Enable the metrics from the arguments or the `Metrics` settings, once.
+
+    Parameters:
+        enabled (bool | None, optional): Force the metrics on. Defaults to the
+            `Metrics.ENABLED` setting.
+        output (str | None, optional): File the metrics are written to at exit.
+            "-" prints them to stderr. Defaults to the `Metrics.OUTPUT` setting.
+
+    Returns:
+        MetricsRegistry: The process-wide registry.
+    """
+
+    global _configured
+
+    if _configured and not (enabled or output):
+        return metrics
+    _configured = True
+
+    from financialchecker.utils.settings import get_metrics_settings
+
+    settings = get_metrics_settings()
+    if enabled or settings.ENABLED:
+        metrics.enabled = True
+        output = output or settings.OUTPUT
+        if output and output not in _outputs:
+            _outputs.add(output)
+            atexit.register(metrics.write, output)
+
+    return metrics
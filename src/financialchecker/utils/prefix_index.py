@@ -0,0 +1,105 @@
+import threading
+from bisect import bisect_left
+from typing import Iterable
+
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix index over a set of strings, for type-ahead lookups.
+
+    Note:
+        Every value is indexed under its whole text and under the start of each of
+        its words, so "mar" finds both "Marks & Spencer" and "Super Market". The
+        keys are kept in one sorted list: a lookup is a binary search followed by a
+        walk over the matching keys, which takes microseconds for hundreds of
+        thousands of values. Additions replace the list rather than modifying it,
+        so lookups running on other threads never need a lock.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[str] = (),
+    ) -> None:
+        """
+        Initialize the index.
+
+        Parameters:
+            values (Iterable[str], optional): The values to index. Defaults to none.
+        """
+
+        self._lock: threading.Lock = threading.Lock()
+        self._values: set[str] = set(values)
+        self._entries: list[tuple[str, str]] = sorted(
+            (key, value) for value in self._values for key in _keys(value)
+        )
+
+    def __len__(
+        self,
+    ) -> int:
+        return len(self._values)
+
+    def __contains__(
+        self,
+        value: str,
+    ) -> bool:
+        return value in self._values
+
+    def add(
+        self,
+        value: str,
+    ) -> None:
+        """
+        Index a new value; values already indexed are ignored.
+
+        Parameters:
+            value (str): The value to index.
+        """
+
+        with self._lock:
+            if value in self._values:
+                return
+
+            entries: list[tuple[str, str]] = list(self._entries)
+            for key in _keys(value):
+                entries.insert(bisect_left(entries, (key, value)), (key, value))
+            self._entries = entries
+            self._values.add(value)
+
+    def search(
+        self,
+        prefix: str,
+        limit: int = 10,
+    ) -> list[str]:
+        """
+        Find the values with a word starting with a prefix.
+
+        Parameters:
+            prefix (str): The typed text, compared case-insensitively; an empty
+                prefix matches every value.
+            limit (int, optional): Maximum number of values returned. Defaults to
+                10.
+
+        Returns:
+            list[str]: The matching values, ordered by the matching key.
+        """
+
+        entries: list[tuple[str, str]] = self._entries
+        key: str = prefix.strip().casefold()
+        results: dict[str, None] = {}
+
+        for position in range(bisect_left(entries, (key,)), len(entries)):
+            entry_key, value = entries[position]
+            if len(results) >= limit or not entry_key.startswith(key):
+                break
+            results[value] = None
+
+        return list(results)
+
+
+def _keys(
+    value: str,
+) -> set[str]:
+    # The whole value, then the suffixes starting at each following word.
+    folded: str = value.strip().casefold()
+    words: list[str] = folded.split()
+    return {folded} | {" ".join(words[index:]) for index in range(1, len(words))}
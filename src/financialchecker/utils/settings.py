@@ -1,21 +1,34 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 
-from omegaconf import OmegaConf
-from pydantic_settings import BaseSettings, SettingsConfigDict
+# OmegaConf and pydantic-settings are imported when the settings are first read, so
+# importing this module (e.g. for a CLI `--help`) stays cheap.
 
 
-class EnvSettings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_prefix="FINANCIALCHECKER_",
-        case_sensitive=False,
-    )
+@lru_cache
+def _env_settings_class() -> type:
+    from pydantic_settings import BaseSettings, SettingsConfigDict
 
-    ACCOUNT: int
-    PASSWORD: str
-    SERVER: str
+    class EnvSettings(BaseSettings):
+        model_config = SettingsConfigDict(
+            env_file=".env",
+            env_prefix="FINANCIALCHECKER_",
+            case_sensitive=False,
+        )
+
+        ACCOUNT: int
+        PASSWORD: str
+        SERVER: str
+
+    return EnvSettings
+
+
+def __getattr__(name: str):
+    if name == "EnvSettings":
+        return _env_settings_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
@@ -23,6 +36,8 @@ class MongoDBCollections:
     Log: str
     Transaction: str
     Utility: str
+    Rollup: str = "TransactionRollup"
+    Metadata: str = "FinancialCheckerMetadata"
 
 
 @dataclass
@@ -45,6 +60,20 @@ class MongoDB:
         COLLECTIONS (MongoDBCollections): An instance of the MongoDBCollections class,
             representing the collections within the MongoDB database.
 
+        MAX_POOL_SIZE (int): Maximum number of connections kept in the pool.
+        MIN_POOL_SIZE (int): Minimum number of connections kept in the pool.
+        MAX_IDLE_TIME_MS (int | None): Milliseconds an idle connection is kept
+            before being closed; None keeps it indefinitely.
+        CONNECT_TIMEOUT_MS (int): Milliseconds allowed to open a connection.
+        SERVER_SELECTION_TIMEOUT_MS (int): Milliseconds allowed to find a suitable
+            server before an operation fails.
+        SOCKET_TIMEOUT_MS (int | None): Milliseconds allowed for a send or receive
+            on a socket; None waits indefinitely.
+        READ_PREFERENCE (str): Read preference mode (e.g., "primary",
+            "secondaryPreferred").
+        HEALTH_CHECK_INTERVAL (float): Seconds after which the connection state is
+            verified again with a ping.
+
     Note:
         This class is designed to hold the configuration details required for connecting
         to a MongoDB database. It includes information such as the protocol, username,
@@ -62,6 +91,65 @@ class MongoDB:
 
     COLLECTIONS: MongoDBCollections
 
+    MAX_POOL_SIZE: int = 100
+    MIN_POOL_SIZE: int = 0
+    MAX_IDLE_TIME_MS: int | None = None
+    CONNECT_TIMEOUT_MS: int = 20000
+    SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    SOCKET_TIMEOUT_MS: int | None = None
+    READ_PREFERENCE: str = "primary"
+    HEALTH_CHECK_INTERVAL: float = 30.0
+
+
+@dataclass
+class LogSinkSettings:
+    """
+    Data class representing the configuration of the buffered MongoDB log sink.
+
+    Attributes:
+        QUEUE_SIZE (int): Maximum number of log entries waiting to be written.
+        BATCH_SIZE (int): Number of log entries that triggers a write.
+        FLUSH_INTERVAL (float): Maximum number of seconds a log entry waits before
+            being written.
+        POLICY (str): What to do when the queue is full, "drop" or "block".
+    """
+
+    QUEUE_SIZE: int = 10000
+    BATCH_SIZE: int = 500
+    FLUSH_INTERVAL: float = 2.0
+    POLICY: str = "drop"
+
+
+@dataclass
+class LocalCacheSettings:
+    """
+    Data class representing the configuration of the local transaction cache.
+
+    Attributes:
+        ENABLED (bool): Whether the analytics load transactions from the local cache.
+        DIRECTORY (str): Directory the cache files are stored in.
+        MAX_SEGMENTS (int): Number of cache segments above which they are merged.
+    """
+
+    ENABLED: bool = True
+    DIRECTORY: str = "~/.cache/financialchecker"
+    MAX_SEGMENTS: int = 8
+
+
+@dataclass
+class MetricsSettings:
+    """
+    Data class representing the configuration of the operation metrics.
+
+    Attributes:
+        ENABLED (bool): Whether database and analytics operations are measured.
+        OUTPUT (str | None): File the metrics are written to at exit, as JSON for a
+            `.json` file and in the Prometheus text format otherwise.
+    """
+
+    ENABLED: bool = False
+    OUTPUT: str | None = None
+
 
 @dataclass
 class Settings:
@@ -70,25 +158,35 @@ class Settings:
     PaymentMethods: list[str]
     Categories: list[str]
 
+    UtilityCacheTTL: int = 300
+    LogSink: LogSinkSettings = field(default_factory=LogSinkSettings)
+    LocalCache: LocalCacheSettings = field(default_factory=LocalCacheSettings)
+    Metrics: MetricsSettings = field(default_factory=MetricsSettings)
+
 
 @lru_cache
-def get_environmental_settings() -> EnvSettings:
-    return EnvSettings()
+def get_environmental_settings():
+    return _env_settings_class()()
 
 
 @lru_cache
 def get_settings() -> Settings:
+    from omegaconf import OmegaConf
 
+    # FINANCIALCHECKER_CONFIG points to another configuration file, e.g. the one of
+    # the benchmarks.
     settings_import = OmegaConf.load(
-        Path(__file__)
+        os.environ.get("FINANCIALCHECKER_CONFIG")
+        or Path(__file__)
         .absolute()
         .parent.parent.parent.parent.joinpath(
             "config.yaml",
         ),
     )
 
-    return OmegaConf.structured(
-        Settings(**settings_import),
+    return OmegaConf.merge(
+        OmegaConf.structured(Settings),
+        settings_import,
     )
 
 
@@ -162,3 +260,51 @@ def get_categories() -> list[str]:
 @lru_cache
 def get_payment_methods() -> list[str]:
     return get_settings().PaymentMethods
+
+
+@lru_cache
+def get_utility_cache_ttl() -> int:
+    """
+    Get the number of seconds the utility lists read from MongoDB stay cached.
+
+    Returns:
+        int: The time-to-live of the utility cache.
+    """
+
+    return get_settings().UtilityCacheTTL
+
+
+@lru_cache
+def get_log_sink_settings() -> LogSinkSettings:
+    """
+    Get the configuration of the buffered MongoDB log sink.
+
+    Returns:
+        LogSinkSettings: The log sink settings.
+    """
+
+    return get_settings().LogSink
+
+
+@lru_cache
+def get_local_cache_settings() -> LocalCacheSettings:
+    """
+    Get the configuration of the local transaction cache.
+
+    Returns:
+        LocalCacheSettings: The local cache settings.
+    """
+
+    return get_settings().LocalCache
+
+
+@lru_cache
+def get_metrics_settings() -> MetricsSettings:
+    """
+    Get the configuration of the operation metrics.
+
+    Returns:
+        MetricsSettings: The metrics settings.
+    """
+
+    return get_settings().Metrics
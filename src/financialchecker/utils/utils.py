@@ -1,4 +1,8 @@
 from enum import StrEnum
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
 
 
 class EnhancedStrEnum(StrEnum):
@@ -37,3 +41,25 @@ class EnhancedStrEnum(StrEnum):
         """
 
         return list(cls.__members__.values())
+
+
+def batched(
+    iterable: Iterable[T],
+    size: int,
+) -> Iterator[list[T]]:
+    """
+    Split an iterable into consecutive lists of at most `size` elements.
+
+    Parameters:
+        iterable (Iterable[T]): The elements to split; consumed lazily.
+        size (int): The maximum number of elements per batch.
+
+    Returns:
+        Iterator[list[T]]: The batches, in order.
+    """
+
+    assert size > 0
+    iterator: Iterator[T] = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
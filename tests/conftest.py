@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+import bson
+import pytest
+
+# The tests never connect to a server: the settings only name the collections.
+os.environ.setdefault("FINANCIALCHECKER_CONFIG",
+                      str(Path(__file__).absolute().parent.joinpath("config.yaml")))
+
+
+class MongomockInstance:
+    """
+    Stand-in for `MongoDBInstance` exposing a mongomock database.
+    """
+
+    def __init__(self, database) -> None:
+        self.database = RawBatchDatabase(database)
+
+
+class RawBatchDatabase:
+    """
+    Wrapper adding `find_raw_batches`, which mongomock does not implement, to the
+    collections of a mongomock database.
+    """
+
+    def __init__(self, database) -> None:
+        self._database = database
+
+    def __getitem__(self, name: str) -> "RawBatchCollection":
+        return RawBatchCollection(self._database[name])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._database, name)
+
+
+class RawBatchCollection:
+    def __init__(self, collection) -> None:
+        self._collection = collection
+
+    def find_raw_batches(self, filter: dict | None = None, batch_size: int = 1000, **kwargs) -> Iterator[bytes]: # noqa E507
+        cursor = self._collection.find(filter, **kwargs)
+
+        while documents := [document for _, document in zip(range(batch_size), cursor)]: # noqa E507
+            yield b"".join(bson.encode(document) for document in documents)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def log_directory(tmp_path_factory) -> Iterator[Path]:
+    # The loggers write their file in the working directory.
+    directory: Path = tmp_path_factory.mktemp("logs")
+    working_directory: str = os.getcwd()
+    os.chdir(directory)
+    yield directory
+    os.chdir(working_directory)
+
+
+@pytest.fixture
+def database():
+    mongomock = pytest.importorskip("mongomock")
+
+    return mongomock.MongoClient()["FinancialChecker"]
+
+
+@pytest.fixture
+def crud(database):
+    from financialchecker.database.mongodb.database import MongoDBCrud
+
+    return MongoDBCrud(mongodb_instance=MongomockInstance(database))
@@ -0,0 +1,66 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from financialchecker.transactions.batch import TransactionBatch
+from financialchecker.transactions.expense import Expense
+from financialchecker.transactions.income import Income
+
+
+@pytest.fixture
+def batch() -> TransactionBatch:
+    return TransactionBatch.from_columns(
+        types=["EXPENSE", "INCOME", "EXPENSE", "EXPENSE"],
+        amounts=[10.0, 1500.0, 2.5, 40.0],
+        transaction_methods=["Card", "Transfer", "Cash", "Card"],
+        dates=["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"],
+        categories=["Food", "Salary", "Food", "Transport"],
+        firms=["Market", "", "Bakery", "Rail"],
+    )
+
+
+def test_integer_index_yields_transactions(batch):
+    assert isinstance(batch[0], Expense)
+    assert isinstance(batch[1], Income)
+    assert batch[1]._amount == 1500.0
+    assert batch[-1]._firm == "Rail"
+    assert batch[np.int64(2)]._date == date(2024, 1, 3)
+
+
+@pytest.mark.parametrize("index", [4, -5, 100])
+def test_integer_index_out_of_range(batch, index):
+    with pytest.raises(IndexError):
+        batch[index]
+
+
+def test_slice_keeps_columns_aligned(batch):
+    tail: TransactionBatch = batch[1:3]
+
+    assert isinstance(tail, TransactionBatch)
+    assert len(tail) == 2
+    assert tail.amounts.tolist() == [1500.0, 2.5]
+    assert tail.strings("category").decode().tolist() == ["Salary", "Food"]
+    assert [document["type"] for document in tail.to_documents()] == ["INCOME", "EXPENSE"] # noqa E507
+
+
+def test_filter_and_empty_slice(batch):
+    food: TransactionBatch = batch.filter(batch.strings("category").isin(["Food"]))
+
+    assert food.amounts.tolist() == [10.0, 2.5]
+    assert len(batch[4:]) == 0
+    assert list(batch[4:]) == []
+
+
+def test_iteration_round_trips_through_from_transactions(batch):
+    rebuilt: TransactionBatch = TransactionBatch.from_transactions(batch)
+
+    assert rebuilt.to_documents() == batch.to_documents()
+
+
+def test_validate_reports_first_invalid_row():
+    with pytest.raises(ValueError, match="first at position 1"):
+        TransactionBatch.from_columns(types=["EXPENSE", "EXPENSE"],
+                                      amounts=[1.0, 0.0],
+                                      transaction_methods=["Card", "Card"],
+                                      dates=["2024-01-01", "2024-01-02"])
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from financialchecker.data.aggregate import DataAggregate
+from financialchecker.data.cache import TransactionCache
+from financialchecker.database.mongodb.migrations import migrate_transaction_dates
+from financialchecker.transactions._transactions import TransactionType
+from financialchecker.transactions.expense import Expense
+from financialchecker.utils.settings import get_mongodb_collection
+
+
+def frames(amounts: list[float], first_day: int = 1) -> dict[str, pd.DataFrame]:
+    expense: pd.DataFrame = pd.DataFrame({
+        "id": [f"{day:024x}" for day in range(first_day, first_day + len(amounts))],
+        "date": pd.date_range(f"2024-01-{first_day:02d}", periods=len(amounts)),
+        "amount": amounts,
+        "category": pd.Categorical(["Food"] * len(amounts)),
+        "description": ["bread"] * len(amounts),
+    })
+    return {TransactionType.EXPENSE: expense,
+            TransactionType.INCOME: expense.iloc[:0]}
+
+
+def expenses(crud, days: range) -> None:
+    for day in days:
+        crud.add_transaction(Expense("Food", float(day), "Cash", date(2024, 3, day)))
+
+
+@pytest.fixture
+def cache(tmp_path) -> TransactionCache:
+    return TransactionCache(directory=tmp_path, max_segments=2)
+
+
+def test_round_trip(cache):
+    written: dict[str, pd.DataFrame] = frames([1.0, 2.0, 3.0])
+    cache.append(written, written[TransactionType.EXPENSE]["id"].max(), generation=4)
+    loaded, last_id = cache.load()
+
+    assert last_id == f"{3:024x}"
+    assert cache.state() == {"last_id": last_id, "rows": 3, "generation": 4}
+    pd.testing.assert_frame_equal(loaded[TransactionType.EXPENSE],
+                                  written[TransactionType.EXPENSE],
+                                  check_categorical=False)
+    assert loaded[TransactionType.INCOME].empty
+
+
+def test_incremental_append_and_compaction(cache):
+    for first_day in (1, 3, 5):
+        cache.append(frames([float(first_day)] * 2, first_day), f"{first_day + 1:024x}") # noqa E507
+    loaded, last_id = cache.load()
+
+    # The third segment went over `max_segments`, so the three were merged.
+    assert len([path for path in cache.path.iterdir() if path.is_dir()]) == 1
+    assert last_id == f"{6:024x}"
+    assert cache.state()["rows"] == 6
+    assert loaded[TransactionType.EXPENSE]["amount"].tolist() == [1.0, 1.0, 3.0, 3.0, 5.0, 5.0] # noqa E507
+
+
+def test_missing_or_unknown_cache_is_ignored(cache):
+    assert cache.load() is None
+
+    cache.append(frames([1.0]), f"{1:024x}")
+    manifest = cache.path.joinpath("manifest.json")
+    manifest.write_text(manifest.read_text().replace('"schema_version": 2', '"schema_version": 1')) # noqa E507
+
+    assert cache.load() is None
+    assert cache.state() is None
+
+
+def test_aggregate_reads_new_transactions_through_cache(crud, cache):
+    expenses(crud, range(1, 4))
+    aggregate: DataAggregate = DataAggregate(cache=cache, mongo_instance=crud)
+
+    expenses(crud, range(4, 6))
+
+    assert aggregate.refresh() == 2
+    assert cache.state()["rows"] == 5
+    assert len(DataAggregate(cache=cache, mongo_instance=crud).get_expense_dataframe()) == 5 # noqa E507
+
+
+def test_aggregate_rebuilds_cache_after_delete(crud, cache, database):
+    expenses(crud, range(1, 4))
+    aggregate: DataAggregate = DataAggregate(cache=cache, mongo_instance=crud)
+
+    collection = database[get_mongodb_collection().Transaction]
+    collection.delete_one({"amount": 1.0})
+
+    assert aggregate.refresh() == 2
+    assert aggregate.get_expense_dataframe()["amount"].tolist() == [2.0, 3.0]
+    assert cache.state()["rows"] == 2
+
+
+def test_aggregate_rebuilds_cache_after_migration(crud, cache, database):
+    expenses(crud, range(1, 4))
+    aggregate: DataAggregate = DataAggregate(cache=cache, mongo_instance=crud)
+
+    collection = database[get_mongodb_collection().Transaction]
+    collection.update_many({}, {"$set": {"date": "2024-03-01"}})
+    migrate_transaction_dates(database)
+
+    assert aggregate.refresh() == 3
+    assert (aggregate.get_expense_dataframe()["date"] == pd.Timestamp("2024-03-01")).all() # noqa E507
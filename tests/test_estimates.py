@@ -0,0 +1,73 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from financialchecker.data.estimates import Estimator
+from financialchecker.transactions._transactions import TransactionType
+
+EXPENSES: list[dict] = [
+    {"date": datetime(2024, 1, 1), "category": "Food", "transaction_method": "Card", "amount": 10.0}, # noqa E507
+    {"date": datetime(2024, 1, 1), "category": "Rent", "transaction_method": "Transfer", "amount": 500.0}, # noqa E507
+    {"date": datetime(2024, 1, 2), "category": "Food", "transaction_method": "Cash", "amount": 20.0}, # noqa E507
+    {"date": datetime(2024, 1, 7), "category": "Food", "transaction_method": "Card", "amount": 30.0}, # noqa E507
+]
+
+
+class FakeCrud:
+    """
+    Stand-in for `MongoDBCrud` answering the period totals the way the aggregation
+    pipeline shapes them: the split field is named after the grouping dimension.
+    """
+
+    def get_transaction_frames(self, transaction_type, query=None):
+        return {transaction_type: pd.DataFrame(columns=["date", "amount"])}
+
+    def get_period_totals(self,
+                          transaction_type=None,
+                          period="daily",
+                          group_by=None,
+                          query=None):
+        keys: list[str] = ["date"] + ([group_by] if group_by else [])
+        totals: pd.DataFrame = (pd.DataFrame(EXPENSES)
+                                .groupby(keys, as_index=False)["amount"]
+                                .agg(amount="sum", count="count")
+                                .rename(columns={"date": "period"}))
+        return totals.to_dict("records")
+
+
+@pytest.fixture
+def estimator() -> Estimator:
+    return Estimator(start_date=date(2024, 1, 1),
+                     end_date=date(2024, 1, 7),
+                     server_side=True,
+                     mongo_instance=FakeCrud())
+
+
+def test_server_side_rate_table_splits_by_dimension(estimator):
+    table: pd.DataFrame = estimator.rate_table(periods=["weekly"])
+    expenses: pd.DataFrame = table[table["type"] == str(TransactionType.EXPENSE)]
+    rates: dict[str, dict[str, float]] = {
+        dimension: group.set_index("value")["rate"].to_dict()
+        for dimension, group in expenses.groupby("dimension")
+    }
+
+    assert rates["all"] == pytest.approx({"": 560.0})
+    assert rates["category"] == pytest.approx({"Food": 60.0, "Rent": 500.0})
+    assert rates["transaction_method"] == pytest.approx({"Card": 40.0,
+                                                         "Cash": 20.0,
+                                                         "Transfer": 500.0})
+
+
+def test_rate_table_weights_partial_edge_periods():
+    # Jan 2-8 covers six days of the week of Jan 1 and one of the week of Jan 8.
+    estimator: Estimator = Estimator(start_date=date(2024, 1, 2),
+                                     end_date=date(2024, 1, 8),
+                                     server_side=True,
+                                     mongo_instance=FakeCrud())
+    table: pd.DataFrame = estimator.rate_table(group_by=())
+    rates: dict[str, float] = table[table["type"] == str(TransactionType.EXPENSE)].set_index("period")["rate"].to_dict() # noqa E507
+
+    assert rates["daily"] == pytest.approx(50.0 / 7)
+    assert rates["weekly"] == pytest.approx(50.0)
+    assert rates["monthly"] == pytest.approx(50.0 * 31 / 7)
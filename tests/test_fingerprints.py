@@ -0,0 +1,88 @@
+from datetime import date, datetime
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from financialchecker.database.mongodb.fingerprints import transaction_fingerprint
+from financialchecker.transactions.expense import Expense
+from financialchecker.utils.settings import get_mongodb_collection
+
+
+def expense(description: str = "Weekly shop", amount: float = 42.1, category: str = "Food") -> Expense: # noqa E507
+    return Expense(category,
+                   amount,
+                   "Card",
+                   date(2024, 3, 1),
+                   transaction_description=description,
+                   transaction_firm="Market")
+
+
+@pytest.fixture
+def transactions(database):
+    collection = database[get_mongodb_collection().Transaction]
+    # mongomock ignores partial filters; a sparse index also leaves the documents
+    # without a fingerprint out.
+    collection.create_index("fingerprint", unique=True, sparse=True)
+    return collection
+
+
+def test_fingerprint_ignores_case_spacing_and_edited_fields():
+    document: dict = dict(expense())
+
+    assert transaction_fingerprint(document) == transaction_fingerprint(dict(expense("  weekly   SHOP", category="Groceries"))) # noqa E507
+    assert transaction_fingerprint(document) == transaction_fingerprint({**document, "date": datetime(2024, 3, 1, 18), "amount": 42.1000001}) # noqa E507
+    assert transaction_fingerprint(document) != transaction_fingerprint(dict(expense(amount=42.11))) # noqa E507
+    assert transaction_fingerprint(document) != transaction_fingerprint(dict(expense("Monthly shop"))) # noqa E507
+
+
+def test_single_insert_returns_stored_duplicate(crud, transactions):
+    stored = crud.add_transaction(expense())
+
+    assert crud.add_transaction(expense("WEEKLY shop")) == stored
+    assert crud.find_duplicate_transaction(expense()) == stored
+    assert crud.find_duplicate_transaction(expense(amount=1.0)) is None
+    assert transactions.count_documents({}) == 1
+
+
+def test_single_insert_without_deduplication(crud, transactions):
+    stored = crud.add_transaction(expense())
+
+    assert crud.add_transaction(expense(), deduplicate=False) != stored
+    assert transactions.count_documents({}) == 2
+    assert transactions.count_documents({"fingerprint": {"$exists": True}}) == 1
+
+
+def test_single_insert_lookup_works_without_index(crud, database):
+    stored = crud.add_transaction(expense())
+
+    assert crud.add_transaction(expense()) == stored
+    assert database[get_mongodb_collection().Transaction].count_documents({}) == 1
+
+
+def test_single_insert_returns_concurrently_stored_duplicate(crud, transactions, monkeypatch): # noqa E507
+    # Another writer stores the transaction between the lookup and the insert.
+    stored = transactions.insert_one({**dict(expense()), "fingerprint": transaction_fingerprint(dict(expense()))}).inserted_id # noqa E507
+    lookups = iter([None, stored])
+    monkeypatch.setattr(crud, "_stored_fingerprint", lambda fingerprint: next(lookups))
+
+    assert crud.add_transaction(expense()) == stored
+    assert transactions.count_documents({}) == 1
+
+
+def test_single_insert_reraises_other_duplicate_keys(crud, transactions):
+    transactions.create_index("description", unique=True)
+    crud.add_transaction(expense(), deduplicate=False)
+
+    with pytest.raises(DuplicateKeyError):
+        crud.add_transaction(expense(amount=1.0), deduplicate=False)
+
+
+def test_bulk_insert_skips_stored_and_repeated_transactions(crud, transactions):
+    crud.add_transaction(expense())
+
+    results = crud.add_transactions([expense(), expense(amount=1.0), expense(" weekly shop ", amount=1.0), expense(amount=2.0)], # noqa E507
+                                    batch_size=2)
+
+    assert [(len(result.inserted_ids), result.duplicates) for result in results] == [(1, 1), (1, 1)] # noqa E507
+    assert sorted(transactions.distinct("amount")) == [1.0, 2.0, 42.1]
+    assert crud.add_transactions([expense(amount=2.0)])[0].duplicates == 1
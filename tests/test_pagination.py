@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from financialchecker.database.mongodb.models import PageCursor, TransactionQuery
+from financialchecker.transactions.batch import TransactionBatch
+from financialchecker.utils.settings import get_mongodb_collection
+
+
+@pytest.fixture
+def stored(crud) -> list[float]:
+    # Three transactions a day, so pages end in the middle of a day.
+    amounts: list[float] = [float(amount) for amount in range(1, 16)]
+    crud.add_transactions(TransactionBatch.from_columns(
+        types=["EXPENSE"] * len(amounts),
+        amounts=amounts,
+        transaction_methods=["Card"] * len(amounts),
+        dates=[f"2024-01-{1 + index // 3:02d}" for index in range(len(amounts))],
+        categories=["Food", "Rent", "Transport"] * 5,
+    ))
+    return amounts
+
+
+def pages(crud, **kwargs) -> list[list[float]]:
+    amounts: list[list[float]] = []
+    cursor: str | None = None
+
+    while True:
+        page = crud.get_transaction_page(cursor=cursor, page_size=4, **kwargs)
+        amounts.append([transaction["amount"] for transaction in page.transactions])
+        if page.next_cursor is None:
+            return amounts
+        cursor = page.next_cursor
+
+
+def test_cursor_round_trip():
+    cursor: PageCursor = PageCursor(date=datetime(2024, 1, 2, 10, 30),
+                                    id="65a1b2c3d4e5f60718293a4b")
+
+    assert PageCursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "2024-01-02", "2024-01-02_65a1", "2024-01-02_zz" + "0" * 22, "day_65a1b2c3d4e5f60718293a4b"]) # noqa E507
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        PageCursor.decode(cursor)
+
+
+def test_ascending_pages_cover_every_transaction_once(crud, stored):
+    assert pages(crud, descending=False) == [stored[0:4], stored[4:8], stored[8:12], stored[12:15]] # noqa E507
+
+
+def test_descending_pages_follow_date_then_id(crud, stored):
+    # Transactions of the same day are ordered by identifier, newest first.
+    assert sum(pages(crud), []) == stored[::-1]
+
+
+def test_pages_apply_query_and_skip_string_dates(crud, stored, database):
+    database[get_mongodb_collection().Transaction].insert_one(
+        {"type": "EXPENSE", "amount": 99.0, "category": "Food", "date": "2024-01-01"}
+    )
+
+    food: list[list[float]] = pages(crud, descending=False, query=TransactionQuery(categories=("Food",))) # noqa E507
+
+    assert food == [[1.0, 4.0, 7.0, 10.0], [13.0]]
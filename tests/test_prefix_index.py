@@ -0,0 +1,44 @@
+import pytest
+
+from financialchecker.utils.prefix_index import PrefixIndex
+
+
+@pytest.fixture
+def index() -> PrefixIndex:
+    return PrefixIndex(["Marks & Spencer", "Super Market", "Bakery", "Bank Transfer", "market"]) # noqa E507
+
+
+def test_matches_start_of_any_word_case_insensitively(index):
+    # Ordered by the matching key, "market" before "marks & spencer".
+    assert index.search("MAR") == ["Super Market", "market", "Marks & Spencer"]
+    assert index.search("  spen") == ["Marks & Spencer"]
+    assert index.search("ban") == ["Bank Transfer"]
+    assert index.search("arket") == []
+
+
+def test_matches_across_words(index):
+    assert index.search("super m") == ["Super Market"]
+    assert index.search("super b") == []
+
+
+def test_empty_prefix_and_limit(index):
+    assert len(index.search("")) == len(index) == 5
+    assert index.search("ba") == ["Bakery", "Bank Transfer"]
+    assert index.search("ba", limit=1) == ["Bakery"]
+
+
+def test_add_keeps_index_sorted_and_ignores_known_values(index):
+    index.add("Marzipan Shop")
+    index.add("Bakery")
+
+    assert len(index) == 6
+    assert "Marzipan Shop" in index
+    assert index.search("mar") == ["Super Market", "market", "Marks & Spencer", "Marzipan Shop"] # noqa E507
+    assert index.search("sho") == ["Marzipan Shop"]
+
+
+def test_search_utilities_uses_stored_values(crud):
+    for firm in ("Super Market", "Marks & Spencer", "Rail"):
+        crud.add_utility("Firm", firm)
+
+    assert crud.search_utilities("Firm", "mar") == ["Super Market", "Marks & Spencer"]
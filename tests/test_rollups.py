@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from financialchecker.data.aggregate import DataAggregate
+from financialchecker.database.mongodb.metadata import get_rollups_complete
+from financialchecker.database.mongodb.migrations import rebuild_rollups
+from financialchecker.database.mongodb.rollups import rollup_updates
+from financialchecker.transactions.batch import TransactionBatch
+from financialchecker.utils.settings import get_mongodb_collection
+
+
+@pytest.fixture
+def batch() -> TransactionBatch:
+    return TransactionBatch.from_columns(
+        types=["EXPENSE", "EXPENSE", "EXPENSE", "INCOME", "EXPENSE"],
+        amounts=[10.0, 5.0, 20.0, 1500.0, 7.5],
+        transaction_methods=["Card", "Card", "Cash", "Transfer", "Card"],
+        dates=["2024-01-01", "2024-01-01", "2024-01-01", "2024-01-31", "2024-02-02"],
+        descriptions=["bread", "milk", "lunch", "salary", "bread"],
+        categories=["Food", "Food", "Food", "Salary", "Food"],
+    )
+
+
+def test_rollup_updates_sum_per_day_and_key():
+    updates = rollup_updates([
+        {"date": datetime(2024, 1, 1, 9), "type": "EXPENSE", "category": "Food", "transaction_method": "Card", "amount": 10.0}, # noqa E507
+        {"date": "2024-01-01", "type": "EXPENSE", "category": "Food", "transaction_method": "Card", "amount": 5.0}, # noqa E507
+        {"date": date(2024, 1, 2), "type": "EXPENSE", "category": "Food", "transaction_method": "Card", "amount": 1.0}, # noqa E507
+    ])
+
+    assert [(update._filter["day"], update._doc["$inc"]) for update in updates] == [
+        (datetime(2024, 1, 1), {"amount": 15.0, "count": 2}),
+        (datetime(2024, 1, 2), {"amount": 1.0, "count": 1}),
+    ]
+
+
+def test_inserts_upsert_rollups(crud, batch):
+    crud.add_transactions(batch[:2])
+    crud.add_transactions(batch[2:])
+
+    rollups: list[dict] = crud.get_rollups()
+
+    assert [(rollup["day"], rollup["type"], rollup["transaction_method"], rollup["amount"], rollup["count"]) # noqa E507
+            for rollup in rollups] == [
+        (datetime(2024, 1, 1), "EXPENSE", "Card", 15.0, 2),
+        (datetime(2024, 1, 1), "EXPENSE", "Cash", 20.0, 1),
+        (datetime(2024, 1, 31), "INCOME", "Transfer", 1500.0, 1),
+        (datetime(2024, 2, 2), "EXPENSE", "Card", 7.5, 1),
+    ]
+    assert crud.rollups_complete()
+
+
+def test_rebuild_matches_maintained_rollups(crud, batch, database):
+    crud.add_transactions(batch)
+    maintained: list[dict] = crud.get_rollups()
+
+    database[get_mongodb_collection().Rollup].delete_many({"transaction_method": "Cash"}) # noqa E507
+
+    assert rebuild_rollups(database, batch_size=2) == len(batch)
+    assert sorted(crud.get_rollups(), key=repr) == sorted(maintained, key=repr)
+    assert get_rollups_complete(database) is True
+
+
+def test_period_totals_fall_back_until_rollups_rebuilt(crud, batch, database):
+    # Transactions stored before the rollups existed are not rolled up.
+    database[get_mongodb_collection().Transaction].insert_many(batch[:3].to_documents()) # noqa E507
+    crud.add_transactions(batch[3:])
+
+    assert not crud.rollups_complete()
+    totals: pd.DataFrame = DataAggregate(mongo_instance=crud, preload=False).get_period_totals() # noqa E507
+    assert totals[totals["type"] == "EXPENSE"]["amount"].tolist() == [35.0, 7.5]
+
+    rebuild_rollups(database)
+
+    assert crud.rollups_complete()
+    assert DataAggregate(mongo_instance=crud, preload=False).get_period_totals().equals(totals) # noqa E507
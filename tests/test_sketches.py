@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financialchecker.data.sketches import (
+    AmountSketch,
+    DistributionSketches,
+    QuantileSketch,
+)
+from financialchecker.transactions._transactions import TransactionType
+
+QUANTILES: list[float] = [0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+@pytest.fixture
+def amounts() -> np.ndarray:
+    generator: np.random.Generator = np.random.default_rng(7)
+    return np.round(generator.lognormal(mean=3.0, sigma=1.5, size=20_000), 2).clip(0.01) # noqa E507
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+def test_quantiles_within_relative_accuracy(amounts, relative_accuracy):
+    sketch: QuantileSketch = QuantileSketch(relative_accuracy)
+    sketch.update(amounts)
+
+    exact: np.ndarray = np.quantile(amounts, QUANTILES, method="lower")
+    np.testing.assert_allclose(sketch.quantiles(QUANTILES), exact, rtol=relative_accuracy) # noqa E507
+
+
+def test_merge_matches_single_sketch(amounts):
+    whole: AmountSketch = AmountSketch()
+    whole.update(amounts)
+    merged: AmountSketch = AmountSketch()
+    for part in np.array_split(amounts, 7):
+        sketch: AmountSketch = AmountSketch()
+        sketch.update(part)
+        merged.merge(sketch)
+
+    np.testing.assert_array_equal(merged.quantiles(QUANTILES), whole.quantiles(QUANTILES)) # noqa E507
+    assert merged.count == len(amounts)
+    assert merged.mean == pytest.approx(amounts.mean())
+    assert merged.std == pytest.approx(amounts.std(ddof=1))
+    assert merged.summary()["min"] == amounts.min()
+    assert merged.summary()["max"] == amounts.max()
+    assert amounts.min() <= merged.quantile(0.0) <= merged.quantile(1.0) <= amounts.max() # noqa E507
+
+
+def test_merge_rejects_other_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_empty_sketch():
+    sketch: AmountSketch = AmountSketch()
+
+    assert sketch.count == 0
+    assert np.isnan(sketch.quantile(0.5))
+    assert np.isnan(sketch.summary()["mean"])
+
+
+def test_distribution_sketches_query_by_category_and_month():
+    expense: pd.DataFrame = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-05", "2024-01-20", "2024-02-03", "2024-02-10"]), # noqa E507
+        "category": ["Food", "Rent", "Food", "Food"],
+        "amount": [10.0, 500.0, 20.0, 40.0],
+    })
+    sketches: DistributionSketches = DistributionSketches()
+    sketches.update({TransactionType.EXPENSE: expense,
+                     TransactionType.INCOME: expense.iloc[:0]})
+
+    assert sketches.keys() == [("EXPENSE", "Food", "2024-01"),
+                               ("EXPENSE", "Food", "2024-02"),
+                               ("EXPENSE", "Rent", "2024-01")]
+    assert sketches.query(categories=["Food"]).count == 3
+    assert sketches.query(start_date=pd.Timestamp("2024-02-28")).mean == pytest.approx(30.0) # noqa E507
+    assert sketches.query(transaction_types=[TransactionType.INCOME]).count == 0